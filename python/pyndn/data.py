@@ -40,7 +40,7 @@ class Data(object):
             self._name = ChangeCounter(Name(value.getName()))
             self._metaInfo = ChangeCounter(MetaInfo(value.getMetaInfo()))
             self._signature = ChangeCounter(value.getSignature().clone())
-            self._content = value._content
+            self._content = value.getContent()
             self._defaultWireEncoding = value.getDefaultWireEncoding()
             self._defaultFullName = Name(value._defaultFullName)
             self._defaultWireEncodingFormat = value._defaultWireEncodingFormat
@@ -57,6 +57,11 @@ class Data(object):
         self._getDefaultWireEncodingChangeCount = 0
         self._changeCount = 0
         self._lpPacket = None
+        # If not None, wireDecodeLazily has not yet decoded the fields after
+        # the name from this encoding.
+        self._lazyEncoding = None
+        self._lazyFieldsOffset = 0
+        self._lazyWireFormat = None
 
     def wireEncode(self, wireFormat = None):
         """
@@ -108,6 +113,8 @@ class Data(object):
             # Don't use a default argument since getDefaultWireFormat can change.
             wireFormat = WireFormat.getDefaultWireFormat()
 
+        # Any fields not yet decoded by wireDecodeLazily are replaced.
+        self._lazyEncoding = None
         if isinstance(input, Blob):
           # Input is a blob, so get its buf() and set copy False.
           result = wireFormat.decodeData(self, input.buf(), False)
@@ -125,6 +132,46 @@ class Data(object):
         else:
             self._setDefaultWireEncoding(SignedBlob(), None)
 
+    def wireDecodeLazily(self, input, wireFormat = None):
+        """
+        Decode the input like wireDecode, but only decode the name now. The
+        other fields are decoded from the saved wire encoding when first needed
+        by getMetaInfo(), getContent(), getSignature() or a setter. This saves
+        the work of decoding a packet which is dropped or whose name is the only
+        field used. If wireFormat is not the default wire format, this simply
+        calls wireDecode.
+
+        :param input: The array with the bytes to decode. If input is not a
+          Blob, then copy the bytes to save the defaultWireEncoding (otherwise
+          take another pointer to the same Blob). The decoded fields share
+          memory with this encoding.
+        :type input: A Blob or an array type with int elements
+        :param wireFormat: (optional) A WireFormat object used to decode this
+           Data object. If omitted, use WireFormat.getDefaultWireFormat().
+        :type wireFormat: A subclass of WireFormat
+        """
+        if wireFormat == None:
+            # Don't use a default argument since getDefaultWireFormat can change.
+            wireFormat = WireFormat.getDefaultWireFormat()
+
+        if wireFormat != WireFormat.getDefaultWireFormat():
+            # We can only use the default wire encoding to decode later.
+            self.wireDecode(input, wireFormat)
+            return
+
+        # In the Blob constructor, set copy true, but if input is already a
+        #   Blob, it won't copy.
+        encoding = Blob(input, True)
+        (signedPortionBeginOffset, signedPortionEndOffset, fieldsOffset) = \
+          wireFormat.decodeDataName(self, encoding.buf(), False)
+        self._lazyEncoding = encoding
+        self._lazyFieldsOffset = fieldsOffset
+        self._lazyWireFormat = wireFormat
+
+        self._setDefaultWireEncoding(SignedBlob(
+            encoding, signedPortionBeginOffset, signedPortionEndOffset),
+          wireFormat)
+
     def getName(self):
         """
         Get the data packet's name.
@@ -141,6 +188,7 @@ class Data(object):
         :return: The meta info.
         :rtype: MetaInfo
         """
+        self._finishLazyDecode()
         return self._metaInfo.get()
 
     def getSignature(self):
@@ -150,6 +198,7 @@ class Data(object):
         :return: The signature object.
         :rtype: a subclass of Signature such as Sha256WithRsaSignature
         """
+        self._finishLazyDecode()
         return self._signature.get()
 
     def getContent(self):
@@ -159,6 +208,7 @@ class Data(object):
         :return: The content as a Blob, which isNull() if unspecified.
         :rtype: Blob
         """
+        self._finishLazyDecode()
         return self._content
 
     def getDefaultWireEncoding(self):
@@ -268,6 +318,7 @@ class Data(object):
         :return: This Data so that you can chain calls to update values.
         :rtype: Data
         """
+        self._finishLazyDecode()
         self._metaInfo.set(MetaInfo() if metaInfo == None
                                       else MetaInfo(metaInfo))
         self._changeCount += 1
@@ -282,6 +333,7 @@ class Data(object):
         :return: This Data so that you can chain calls to update values.
         :rtype: Data
         """
+        self._finishLazyDecode()
         self._signature.set(Sha256WithRsaSignature() if signature == None
                                                      else signature.clone())
         self._changeCount += 1
@@ -296,6 +348,7 @@ class Data(object):
           take another pointer to the same Blob).
         :type content: A Blob or an array type with int elements
         """
+        self._finishLazyDecode()
         self._content = content if isinstance(content, Blob) else Blob(content)
         self._changeCount += 1
 
@@ -339,6 +392,28 @@ class Data(object):
         # getDefaultWireEncoding() won't clear _defaultWireEncoding.
         self._getDefaultWireEncodingChangeCount = self.getChangeCount()
 
+    def _finishLazyDecode(self):
+        """
+        If wireDecodeLazily has not yet decoded the fields after the name, then
+        decode them now and keep the default wire encoding (which setting the
+        fields would otherwise invalidate).
+        """
+        if self._lazyEncoding == None:
+            return
+
+        encoding = self._lazyEncoding
+        # Clear first since decodeDataFields calls the setters.
+        self._lazyEncoding = None
+
+        defaultWireEncoding = self.getDefaultWireEncoding()
+        defaultWireEncodingFormat = self._defaultWireEncodingFormat
+        self._lazyWireFormat.decodeDataFields(
+          self, encoding.buf(), self._lazyFieldsOffset, False)
+        if not defaultWireEncoding.isNull():
+            # The decoded fields are the same as in the encoding.
+            self._setDefaultWireEncoding(
+              defaultWireEncoding, defaultWireEncodingFormat)
+
     # Create managed properties for read/write properties of the class for more pythonic syntax.
     name = property(getName, setName)
     metaInfo = property(getMetaInfo, setMetaInfo)
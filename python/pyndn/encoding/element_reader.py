@@ -22,7 +22,9 @@ This module defines the ElementReader class which lets you call onReceivedData
 multiple times which uses a TlvStructureDecoder to detect the end of a TLV
 element, and calls elementListener.onReceivedElement(element) with the element.
 This handles the case where a single call to onReceivedData may contain multiple
-elements.
+elements. If the elementListener also has an onReceivedElements(elements)
+method, then the elements from one call to onReceivedData are delivered at once
+as a list.
 """
 
 from pyndn.util.blob import Blob
@@ -32,22 +34,31 @@ from pyndn.util.common import Common
 
 class ElementReader(object):
     """
-    Create an ElementReader with the elementListener and an initial buffer for
-    saving partial data.
+    Create an ElementReader with the elementListener and a buffer for saving
+    partial data. The buffer is allocated with the maximum packet size and
+    reused for every partial element.
+
+    :param elementListener: The object with an onReceivedElement(element)
+      method. If it also has an onReceivedElements(elements) method, then call
+      it with the list of all the elements decoded from one call to
+      onReceivedData instead of calling onReceivedElement for each.
     """
     def __init__(self, elementListener):
         self._elementListener = elementListener
+        self._onReceivedElements = getattr(
+          elementListener, "onReceivedElements", None)
         self._tlvStructureDecoder = TlvStructureDecoder()
         self._usePartialData = False
-        self._partialData = DynamicByteArray(1000)
+        self._partialData = DynamicByteArray(Common.MAX_NDN_PACKET_SIZE)
         self._partialDataLength = 0
 
     def onReceivedData(self, data):
         """
         Continue to read data until the end of an element, then call
-        elementListener.onReceivedElement(element). The buffer passed to
-        onReceivedElement is only valid during this call.  If you need the data
-        later, you must copy.
+        elementListener.onReceivedElement(element), or call
+        elementListener.onReceivedElements(elements) once with all the elements
+        found in data. The buffers passed to the listener are only valid during
+        this call.  If you need the data later, you must copy.
 
         :param data: The buffer with the incoming element's bytes.
         :type data: An array type with int elements
@@ -55,75 +66,85 @@ class ElementReader(object):
         # Create a Blob and take its buf() since this creates a memoryview
         #   which is more efficient for slicing.
         data = Blob(data, False).buf()
+        elements = []
 
-        # Process multiple objects in the data.
-        while True:
+        if self._usePartialData:
+            # Continue scanning the element saved from a previous call.
             try:
-                if not self._usePartialData:
-                    # This is the beginning of an element.
-                    if len(data) <= 0:
-                        # Wait for more data.
-                        return
-
-                # Scan the input to check if a whole TLV element has been read.
                 self._tlvStructureDecoder.seek(0)
                 gotElementEnd = self._tlvStructureDecoder.findElementEnd(data)
                 offset = self._tlvStructureDecoder.getOffset()
             except ValueError as ex:
                 # Reset to read a new element on the next call.
-                self._usePartialData = False
-                self._tlvStructureDecoder = TlvStructureDecoder()
-
+                self._resetPartialData()
                 raise ex
 
-            if gotElementEnd:
-                # Got the remainder of an element. Report to the caller.
-                if self._usePartialData:
-                    # We have partial data from a previous call, so append this
-                    #   data and use partialData for onReceivedElement.
-                    self._partialData.copy(
-                      data[:offset], self._partialDataLength)
-                    self._partialDataLength += offset
-
-                    # Create a Blob and take its buf() since this creates a
-                    #   memoryview which is more efficient for slicing.
-                    partialDataView = Blob(
-                      self._partialData.getArray(), False).buf()
-                    element = partialDataView[:self._partialDataLength]
-                    # Assume we don't need to use partialData anymore until
-                    #   needed.
-                    self._usePartialData = False
-                else:
-                    # We are not using partialData, so just point to the input
-                    #   data buffer.
-                    element = data[:offset]
-
-                # Reset to read a new object. Do this before calling
-                # onReceivedElement in case it throws an exception.
-                data = data[offset:]
-                self._tlvStructureDecoder = TlvStructureDecoder()
-
-                self._elementListener.onReceivedElement(element)
-                if len(data) == 0:
-                    # No more data in the packet.
-                    return
-
-                # else loop back to decode.
-            else:
-                # Save remaining data for a later call.
-                if not self._usePartialData:
-                    self._usePartialData = True
-                    self._partialDataLength = 0
+            if not gotElementEnd:
+                self._savePartialData(data)
+                return
 
-                if self._partialDataLength + len(data) > Common.MAX_NDN_PACKET_SIZE:
-                    # Reset to read a new element on the next call.
-                    self._usePartialData = False
-                    self._tlvStructureDecoder = TlvStructureDecoder()
+            # Got the remainder of the element, so use partialData for it.
+            self._partialData.copy(data[:offset], self._partialDataLength)
+            self._partialDataLength += offset
+            # copy() reallocates the array if the element is larger than the
+            # initial allocation, so get the array after copying.
+            elements.append(Blob(self._partialData.getArray(), False).buf()
+              [:self._partialDataLength])
+            self._resetPartialData()
+            data = data[offset:]
+
+        # Find all the complete elements in one pass.
+        beginOffset = 0
+        for endOffset in TlvStructureDecoder.findElementEnds(data):
+            elements.append(data[beginOffset:endOffset])
+            beginOffset = endOffset
+
+        try:
+            if self._onReceivedElements != None:
+                if len(elements) > 0:
+                    self._onReceivedElements(elements)
+            else:
+                for element in elements:
+                    self._elementListener.onReceivedElement(element)
+        finally:
+            # Save the start of an incomplete element for a later call. Do this
+            # after the listener is finished with an element in partialData,
+            # and even if the listener throws an exception.
+            if beginOffset < len(data):
+                self._savePartialData(data[beginOffset:])
+
+    def _savePartialData(self, data):
+        """
+        Scan data, which is not a complete element, with the
+        TlvStructureDecoder and append it to partialData.
 
-                    raise ValueError(
-                      "The incoming packet exceeds the maximum limit Face.getMaxNdnPacketSize()")
+        :param data: The bytes to save.
+        :type data: memoryview
+        """
+        if self._partialDataLength + len(data) > Common.MAX_NDN_PACKET_SIZE:
+            # Reset to read a new element on the next call.
+            self._resetPartialData()
+            raise ValueError(
+              "The incoming packet exceeds the maximum limit Face.getMaxNdnPacketSize()")
+
+        if not self._usePartialData:
+            # This is the beginning of an element. Scan it so that the next
+            # call continues where this left off.
+            try:
+                self._tlvStructureDecoder.findElementEnd(data)
+            except ValueError as ex:
+                self._resetPartialData()
+                raise ex
+            self._usePartialData = True
 
-                self._partialData.copy(data, self._partialDataLength)
-                self._partialDataLength += len(data)
+        self._partialData.copy(data, self._partialDataLength)
+        self._partialDataLength += len(data)
 
-                return
+    def _resetPartialData(self):
+        """
+        Reset to read a new element from the beginning, keeping the allocated
+        partialData and TlvStructureDecoder.
+        """
+        self._usePartialData = False
+        self._partialDataLength = 0
+        self._tlvStructureDecoder.reset()
@@ -17,6 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
+import struct
 from pyndn.util.blob import Blob
 
 """
@@ -35,7 +36,10 @@ class TlvDecoder(object):
         self._input = input
         # Create a Blob and take its buf() since this creates a memoryview
         #   which is more efficient for slicing.
-        self._inputView = Blob(input, False).buf()
+        inputBlob = Blob(input, False)
+        self._inputView = inputBlob.buf()
+        # toBuffer() implements the buffer protocol for struct.unpack_from.
+        self._inputBuffer = inputBlob.toBuffer()
         self._offset = 0
 
     def readVarNumber(self):
@@ -68,25 +72,17 @@ class TlvDecoder(object):
         """
         # This is a private function so we know firstOctet >= 253.
         if firstOctet == 253:
-            result = ((self._input[self._offset] << 8) +
-                       self._input[self._offset + 1])
-            self._offset += 2
+            unpacker = _uint16
         elif firstOctet == 254:
-            result = ((self._input[self._offset]     << 24) +
-                      (self._input[self._offset + 1] << 16) +
-                      (self._input[self._offset + 2] << 8) +
-                       self._input[self._offset + 3])
-            self._offset += 4
+            unpacker = _uint32
         else:
-            result = ((self._input[self._offset]     << 56) +
-                      (self._input[self._offset + 1] << 48) +
-                      (self._input[self._offset + 2] << 40) +
-                      (self._input[self._offset + 3] << 32) +
-                      (self._input[self._offset + 4] << 24) +
-                      (self._input[self._offset + 5] << 16) +
-                      (self._input[self._offset + 6] << 8) +
-                       self._input[self._offset + 7])
-            self._offset += 8
+            unpacker = _uint64
+
+        try:
+            result = unpacker.unpack_from(self._inputBuffer, self._offset)[0]
+        except struct.error:
+            raise ValueError("Read past the end of the input")
+        self._offset += unpacker.size
 
         return result
 
@@ -205,33 +201,28 @@ class TlvDecoder(object):
         :raises ValueError: if length is an invalid length for a TLV
           non-negative integer.
         """
-        try:
-            if length == 1:
+        if length == 1:
+            try:
                 result = self._input[self._offset]
-            elif length == 2:
-                result = ((self._input[self._offset] << 8) +
-                           self._input[self._offset + 1])
-            elif length == 4:
-                result = ((self._input[self._offset]     << 24) +
-                          (self._input[self._offset + 1] << 16) +
-                          (self._input[self._offset + 2] << 8) +
-                           self._input[self._offset + 3])
-            elif length == 8:
-                result = ((self._input[self._offset]     << 56) +
-                          (self._input[self._offset + 1] << 48) +
-                          (self._input[self._offset + 2] << 40) +
-                          (self._input[self._offset + 3] << 32) +
-                          (self._input[self._offset + 4] << 24) +
-                          (self._input[self._offset + 5] << 16) +
-                          (self._input[self._offset + 6] << 8) +
-                           self._input[self._offset + 7])
-            else:
-                raise ValueError("Invalid length for a TLV nonNegativeInteger")
-
-            self._offset += length
+            except IndexError:
+                raise ValueError("Read past the end of the input")
+            self._offset += 1
             return result
-        except IndexError:
+        elif length == 2:
+            unpacker = _uint16
+        elif length == 4:
+            unpacker = _uint32
+        elif length == 8:
+            unpacker = _uint64
+        else:
+            raise ValueError("Invalid length for a TLV nonNegativeInteger")
+
+        try:
+            result = unpacker.unpack_from(self._inputBuffer, self._offset)[0]
+        except struct.error:
             raise ValueError("Read past the end of the input")
+        self._offset += length
+        return result
 
     def readNonNegativeIntegerTlv(self, expectedType):
         """
@@ -409,3 +400,8 @@ class TlvDecoder(object):
         """
         # Use _inputView to get the slice.
         return self._inputView[beginOffset:endOffset]
+
+# Precompiled big-endian formats for reading multi-byte numbers in one call.
+_uint16 = struct.Struct(">H")
+_uint32 = struct.Struct(">I")
+_uint64 = struct.Struct(">Q")
@@ -17,6 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
+import struct
 from pyndn.util.dynamic_byte_array import DynamicByteArray
 
 """
@@ -64,29 +65,21 @@ class TlvEncoder(object):
         elif varNumber <= 0xffff:
             self._length += 3
             self._output.ensureLengthFromBack(self._length)
-            self._output._array[-self._length] = 253
-            self._output._array[-self._length + 1] = (varNumber >> 8) & 0xff
-            self._output._array[-self._length + 2] = varNumber & 0xff
+            array = self._output._array
+            _varNumber16.pack_into(
+              array, len(array) - self._length, 253, varNumber)
         elif varNumber <= 0xffffffff:
             self._length += 5
             self._output.ensureLengthFromBack(self._length)
-            self._output._array[-self._length] = 254
-            self._output._array[-self._length + 1] = (varNumber >> 24) & 0xff
-            self._output._array[-self._length + 2] = (varNumber >> 16) & 0xff
-            self._output._array[-self._length + 3] = (varNumber >> 8) & 0xff
-            self._output._array[-self._length + 4] = varNumber & 0xff
+            array = self._output._array
+            _varNumber32.pack_into(
+              array, len(array) - self._length, 254, varNumber)
         else:
             self._length += 9
             self._output.ensureLengthFromBack(self._length)
-            self._output._array[-self._length] = 255
-            self._output._array[-self._length + 1] = (varNumber >> 56) & 0xff
-            self._output._array[-self._length + 2] = (varNumber >> 48) & 0xff
-            self._output._array[-self._length + 3] = (varNumber >> 40) & 0xff
-            self._output._array[-self._length + 4] = (varNumber >> 32) & 0xff
-            self._output._array[-self._length + 5] = (varNumber >> 24) & 0xff
-            self._output._array[-self._length + 6] = (varNumber >> 16) & 0xff
-            self._output._array[-self._length + 7] = (varNumber >> 8) & 0xff
-            self._output._array[-self._length + 8] = varNumber & 0xff
+            array = self._output._array
+            _varNumber64.pack_into(
+              array, len(array) - self._length, 255, varNumber)
 
     def writeTypeAndLength(self, type, length):
         """
@@ -97,6 +90,16 @@ class TlvEncoder(object):
         :param int type: The type of the TLV.
         :param int length: The non-negative length of the TLV.
         """
+        if type < 253 and length < 253:
+            # The common case. Write both octets at once.
+            self._length += 2
+            self._output.ensureLengthFromBack(self._length)
+            array = self._output._array
+            offset = len(array) - self._length
+            array[offset] = type
+            array[offset + 1] = length
+            return
+
         # Write backwards.
         self.writeVarNumber(length)
         self.writeVarNumber(type)
@@ -115,29 +118,19 @@ class TlvEncoder(object):
             self._length += 1
             self._output.ensureLengthFromBack(self._length)
             self._output._array[-self._length] = value & 0xff
-        elif value <= 0xffff:
-            self._length += 2
-            self._output.ensureLengthFromBack(self._length)
-            self._output._array[-self._length]     = (value >> 8) & 0xff
-            self._output._array[-self._length + 1] = value & 0xff
+            return
+
+        if value <= 0xffff:
+            packer = _uint16
         elif value <= 0xffffffff:
-            self._length += 4
-            self._output.ensureLengthFromBack(self._length)
-            self._output._array[-self._length]     = (value >> 24) & 0xff
-            self._output._array[-self._length + 1] = (value >> 16) & 0xff
-            self._output._array[-self._length + 2] = (value >> 8) & 0xff
-            self._output._array[-self._length + 3] = value & 0xff
+            packer = _uint32
         else:
-            self._length += 8
-            self._output.ensureLengthFromBack(self._length)
-            self._output._array[-self._length]     = (value >> 56) & 0xff
-            self._output._array[-self._length + 1] = (value >> 48) & 0xff
-            self._output._array[-self._length + 2] = (value >> 40) & 0xff
-            self._output._array[-self._length + 3] = (value >> 32) & 0xff
-            self._output._array[-self._length + 4] = (value >> 24) & 0xff
-            self._output._array[-self._length + 5] = (value >> 16) & 0xff
-            self._output._array[-self._length + 6] = (value >> 8) & 0xff
-            self._output._array[-self._length + 7] = value & 0xff
+            packer = _uint64
+
+        self._length += packer.size
+        self._output.ensureLengthFromBack(self._length)
+        array = self._output._array
+        packer.pack_into(array, len(array) - self._length, value)
 
     def writeNonNegativeIntegerTlv(self, type, value):
         """
@@ -209,9 +202,22 @@ class TlvEncoder(object):
             self.writeTypeAndLength(type, 0)
             return
 
+        length = len(value)
+        if type < 253 and length < 253:
+            # The common case, such as a name component. Make room for the
+            # value and the one-octet type and length at once.
+            self._length += length + 2
+            self._output.ensureLengthFromBack(self._length)
+            self._output.copyFromBack(value, self._length - 2)
+            array = self._output._array
+            offset = len(array) - self._length
+            array[offset] = type
+            array[offset + 1] = length
+            return
+
         # Write backwards, starting with the blob array.
         self.writeBuffer(value)
-        self.writeTypeAndLength(type, len(value))
+        self.writeTypeAndLength(type, length)
 
     def writeOptionalBlobTlv(self, type, value):
         """
@@ -226,6 +232,39 @@ class TlvEncoder(object):
         if value != None and len(value) > 0:
             self.writeBlobTlv(type, value)
 
+    @staticmethod
+    def sizeOfVarNumber(varNumber):
+        """
+        Get the number of bytes that writeVarNumber writes for varNumber. This
+        is used to compute an encoding length before writing it.
+
+        :param int varNumber: The non-negative number to encode.
+        :return: The number of bytes.
+        :rtype: int
+        """
+        if varNumber < 253:
+            return 1
+        elif varNumber <= 0xffff:
+            return 3
+        elif varNumber <= 0xffffffff:
+            return 5
+        else:
+            return 9
+
+    @staticmethod
+    def sizeOfBlobTlv(type, length):
+        """
+        Get the number of bytes that writeBlobTlv writes for a value of the
+        given length, including the type and length.
+
+        :param int type: The type of the TLV.
+        :param int length: The length of the value.
+        :return: The number of bytes.
+        :rtype: int
+        """
+        return (TlvEncoder.sizeOfVarNumber(type) +
+                TlvEncoder.sizeOfVarNumber(length) + length)
+
     def getOutput(self):
         """
         Get a memoryview slice of the encoded bytes.
@@ -236,3 +275,11 @@ class TlvEncoder(object):
         # Create a memoryview from getArray() to make sure we don't copy.
         return memoryview(
          self._output.getArray())[len(self._output.getArray()) - self._length:]
+
+# Precompiled big-endian formats for writing multi-byte numbers in one call.
+_varNumber16 = struct.Struct(">BH")
+_varNumber32 = struct.Struct(">BI")
+_varNumber64 = struct.Struct(">BQ")
+_uint16 = struct.Struct(">H")
+_uint32 = struct.Struct(">I")
+_uint64 = struct.Struct(">Q")
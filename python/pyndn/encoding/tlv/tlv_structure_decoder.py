@@ -28,14 +28,22 @@ class TlvStructureDecoder(object):
     Create and initialize a TlvStructureDecoder.
     """
     def __init__(self):
+        # 8 bytes is enough to hold the extended bytes in the length encoding
+        # where it is an 8-byte number.
+        self._headerBuffer = bytearray(8)
+        self.reset()
+
+    def reset(self):
+        """
+        Reset this decoder to scan a new element from offset 0, keeping the
+        allocated header buffer. This is the same as creating a new
+        TlvStructureDecoder.
+        """
         self._gotElementEnd = False
         self._offset = 0
         self._state = self.READ_TYPE
         self._headerLength = 0
         self._useHeaderBuffer = False
-        # 8 bytes is enough to hold the extended bytes in the length encoding
-        # where it is an 8-byte number.
-        self._headerBuffer = bytearray(8)
         self._nBytesToRead = 0
 
     READ_TYPE =         0
@@ -62,7 +70,7 @@ class TlvStructureDecoder(object):
             # Someone is calling when we already got the end.
             return True
 
-        decoder = TlvDecoder(input)
+        decoder = None
 
         while True:
             if self._offset >= len(input):
@@ -131,6 +139,8 @@ class TlvStructureDecoder(object):
                 if (not self._useHeaderBuffer and
                     nRemainingBytes >= self._nBytesToRead):
                     # We don't have to use the headerBuffer. Set nBytesToRead.
+                    if decoder == None:
+                        decoder = TlvDecoder(input)
                     decoder.seek(self._offset)
 
                     self._nBytesToRead = decoder.readExtendedVarNumber(
@@ -198,6 +208,45 @@ class TlvStructureDecoder(object):
                 # We don't expect this to happen.
                 raise RuntimeError("findElementEnd: unrecognized state")
 
+    @staticmethod
+    def findElementEnds(input):
+        """
+        Scan input in one pass for the end of each complete top-level TLV
+        element, where the first element starts at offset 0. This is faster than
+        calling findElementEnd for each element when the input has the whole
+        header of each element, such as a large read from a socket.
+
+        :param input: The input buffer.
+        :type input: An array type with int elements
+        :return: A list of the offset of the end of each complete element, in
+          order. The last offset (or 0 if the list is empty) is where the next
+          incomplete element starts, which you can pass to findElementEnd after
+          reading more input.
+        :rtype: list of int
+        """
+        endOffsets = []
+        decoder = TlvDecoder(input)
+        inputLength = len(input)
+        offset = 0
+        while offset < inputLength:
+            decoder.seek(offset)
+            try:
+                decoder.readVarNumber()
+                length = decoder.readVarNumber()
+            except ValueError:
+                # The type or length is not complete.
+                break
+
+            endOffset = decoder.getOffset() + length
+            if endOffset > inputLength:
+                # The value is not complete.
+                break
+
+            endOffsets.append(endOffset)
+            offset = endOffset
+
+        return endOffsets
+
     def getOffset(self):
         """
         Get the current offset into the input buffer.
@@ -313,7 +313,12 @@ class Tlv0_2WireFormat(WireFormat):
             result = _pyndn.Tlv0_1_1WireFormat_encodeData(data)
             return (Blob(result[0], False), result[1], result[2])
 
-        encoder = TlvEncoder(1500)
+        # Presize the buffer so that it is not reallocated while encoding.
+        encoder = TlvEncoder(
+          TlvEncoder.sizeOfBlobTlv(Tlv.Content, data.getContent().size()) +
+          TlvEncoder.sizeOfBlobTlv(
+            Tlv.SignatureValue, data.getSignature().getSignature().size()) +
+          Tlv0_2WireFormat._DATA_FIELDS_LENGTH_ESTIMATE)
         saveLength = len(encoder)
 
         # Encode backwards.
@@ -363,19 +368,73 @@ class Tlv0_2WireFormat(WireFormat):
         signedPortionBeginOffset = decoder.getOffset()
 
         self._decodeName(data.getName(), decoder, copy)
-        if decoder.peekType(Tlv.MetaInfo, endOffset):
-            self._decodeMetaInfo(data.getMetaInfo(), decoder, copy)
-        else:
-            data.getMetaInfo().clear()
-        data.setContent(Blob(decoder.readOptionalBlobTlv(Tlv.Content, endOffset), copy))
-        self._decodeSignatureInfo(data, decoder, copy)
+        signedPortionEndOffset = self._decodeDataFields(
+          data, decoder, endOffset, copy)
 
+        decoder.finishNestedTlvs(endOffset)
+        return (signedPortionBeginOffset, signedPortionEndOffset)
+
+    def decodeDataName(self, data, input, copy = True):
+        """
+        Decode input as an NDN-TLV data packet, but only set the name in the
+        data object and skip the other fields. This is used by
+        Data.wireDecodeLazily which calls decodeDataFields when the other fields
+        are needed.
+
+        :param Data data: The Data object whose name is updated.
+        :param input: The array with the bytes to decode.
+        :type input: An array type with int elements
+        :param bool copy: (optional) If True, copy from the input when making
+          new Blob values. If False, then Blob values share memory with the
+          input, which must remain unchanged while the Blob values are used.
+          If omitted, use True.
+        :return: A Tuple of (signedPortionBeginOffset, signedPortionEndOffset,
+          fieldsOffset) where signedPortionBeginOffset and
+          signedPortionEndOffset are the same as returned by decodeData, and
+          fieldsOffset is the offset in the encoding of the first field after
+          the name, to pass to decodeDataFields.
+        :rtype: (int, int, int)
+        """
+        decoder = TlvDecoder(input)
+
+        endOffset = decoder.readNestedTlvsStart(Tlv.Data)
+        signedPortionBeginOffset = decoder.getOffset()
+
+        self._decodeName(data.getName(), decoder, copy)
+        fieldsOffset = decoder.getOffset()
+
+        # Find the end of the signed portion without decoding the fields.
+        decoder.skipOptionalTlv(Tlv.MetaInfo, endOffset)
+        decoder.skipOptionalTlv(Tlv.Content, endOffset)
+        decoder.skipTlv(Tlv.SignatureInfo)
         signedPortionEndOffset = decoder.getOffset()
-        data.getSignature().setSignature(
-          Blob(decoder.readBlobTlv(Tlv.SignatureValue), copy))
+        decoder.skipTlv(Tlv.SignatureValue)
+
+        decoder.finishNestedTlvs(endOffset)
+        return (signedPortionBeginOffset, signedPortionEndOffset, fieldsOffset)
+
+    def decodeDataFields(self, data, input, fieldsOffset, copy = True):
+        """
+        Decode the fields after the name of input as an NDN-TLV data packet and
+        set them in the data object. This does not change the data name.
+
+        :param Data data: The Data object whose fields are updated.
+        :param input: The array with the bytes to decode.
+        :type input: An array type with int elements
+        :param int fieldsOffset: The offset of the first field after the name,
+          returned by decodeDataName.
+        :param bool copy: (optional) If True, copy from the input when making
+          new Blob values. If False, then Blob values share memory with the
+          input, which must remain unchanged while the Blob values are used.
+          If omitted, use True.
+        """
+        decoder = TlvDecoder(input)
+
+        endOffset = decoder.readNestedTlvsStart(Tlv.Data)
+        decoder.seek(fieldsOffset)
+        self._decodeDataFields(data, decoder, endOffset, copy)
 
         decoder.finishNestedTlvs(endOffset)
-        return (signedPortionBeginOffset, signedPortionEndOffset)
 
     def encodeControlParameters(self, controlParameters):
         """
@@ -807,6 +866,10 @@ class Tlv0_2WireFormat(WireFormat):
             self._instance = Tlv0_2WireFormat()
         return self._instance
 
+    # An allowance for the encoding length of the Data fields other than the
+    # Content and SignatureValue, such as the name, MetaInfo and SignatureInfo.
+    _DATA_FIELDS_LENGTH_ESTIMATE = 512
+
     @staticmethod
     def _encodeNameComponent(component, encoder):
         """
@@ -1053,6 +1116,28 @@ class Tlv0_2WireFormat(WireFormat):
 
         encoder.writeTypeAndLength(Tlv.MetaInfo, len(encoder) - saveLength)
 
+    @staticmethod
+    def _decodeDataFields(data, decoder, endOffset, copy):
+        """
+        Decode the MetaInfo, Content, SignatureInfo and SignatureValue of a
+        Data packet, starting at the decoder offset after the name.
+
+        :return: The signedPortionEndOffset.
+        :rtype: int
+        """
+        if decoder.peekType(Tlv.MetaInfo, endOffset):
+            Tlv0_2WireFormat._decodeMetaInfo(data.getMetaInfo(), decoder, copy)
+        else:
+            data.getMetaInfo().clear()
+        data.setContent(Blob(decoder.readOptionalBlobTlv(Tlv.Content, endOffset), copy))
+        Tlv0_2WireFormat._decodeSignatureInfo(data, decoder, copy)
+
+        signedPortionEndOffset = decoder.getOffset()
+        data.getSignature().setSignature(
+          Blob(decoder.readBlobTlv(Tlv.SignatureValue), copy))
+
+        return signedPortionEndOffset
+
     @staticmethod
     def _decodeMetaInfo(metaInfo, decoder, copy):
         endOffset = decoder.readNestedTlvsStart(Tlv.MetaInfo)
@@ -1447,7 +1532,7 @@ class Tlv0_2WireFormat(WireFormat):
         """
         # TODO: Throw error if the interest speficies V02 fields.
 
-        encoder = TlvEncoder(256)
+        encoder = TlvEncoder(256 + interest.getApplicationParameters().size())
         saveLength = len(encoder)
 
         # Encode backwards.
@@ -140,6 +140,47 @@ class WireFormat(object):
         """
         raise RuntimeError("decodeData is not implemented")
 
+    def decodeDataName(self, data, input, copy = True):
+        """
+        Decode input as a data packet, but only set the name in the data object
+        and return the signed offsets and the offset of the other fields. Your
+        derived class should override.
+
+        :param Data data: The Data object whose name is updated.
+        :param input: The array with the bytes to decode.
+        :type input: An array type with int elements
+        :param bool copy: (optional) If True, copy from the input when making
+          new Blob values. If False, then Blob values share memory with the
+          input, which must remain unchanged while the Blob values are used.
+          If omitted, use True.
+        :return: A Tuple of (signedPortionBeginOffset, signedPortionEndOffset,
+          fieldsOffset) where fieldsOffset is the offset in the encoding of the
+          first field after the name, to pass to decodeDataFields.
+        :rtype: (int, int, int)
+        :raises RuntimeError: for unimplemented if the derived class does not
+          override.
+        """
+        raise RuntimeError("decodeDataName is not implemented")
+
+    def decodeDataFields(self, data, input, fieldsOffset, copy = True):
+        """
+        Decode the fields after the name of input as a data packet and set them
+        in the data object. Your derived class should override.
+
+        :param Data data: The Data object whose fields are updated.
+        :param input: The array with the bytes to decode.
+        :type input: An array type with int elements
+        :param int fieldsOffset: The offset of the first field after the name,
+          returned by decodeDataName.
+        :param bool copy: (optional) If True, copy from the input when making
+          new Blob values. If False, then Blob values share memory with the
+          input, which must remain unchanged while the Blob values are used.
+          If omitted, use True.
+        :raises RuntimeError: for unimplemented if the derived class does not
+          override.
+        """
+        raise RuntimeError("decodeDataFields is not implemented")
+
     def encodeControlParameters(self, controlParameters):
         """
         Encode controlParameters and return the encoding.  Your derived class
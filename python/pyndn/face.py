@@ -542,8 +542,10 @@ class Face(object):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: A handle whose cancel() method cancels the call. (A subclass
+          which overrides this may return None.)
         """
-        self._node.callLater(delayMilliseconds, callback)
+        return self._node.callLater(delayMilliseconds, callback)
 
     @staticmethod
     def _getUnixSocketFilePathForLocalhost():
@@ -22,11 +22,16 @@ This module defines DelayedCallTable which is an internal class used by the Node
 implementation of callLater to store callbacks and call them when they time out.
 """
 
+import heapq
 from pyndn.util.common import Common
 
 class DelayedCallTable(object):
     def __init__(self):
-        self._table = [] # of _Entry
+        # A heap of (callTime, sequenceNo, _Entry). The sequenceNo keeps entries
+        # with the same call time in the order they were added.
+        self._table = []
+        self._nextSequenceNo = 0
+        self._nCancelled = 0
         self._nowOffsetMilliseconds = 0
 
     def callLater(self, delayMilliseconds, callback):
@@ -37,35 +42,57 @@ class DelayedCallTable(object):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: A handle whose cancel() removes the callback so that it is
+          not called.
+        :rtype: DelayedCallTable._Entry
         """
-        entry = DelayedCallTable._Entry(delayMilliseconds, callback)
-        # Insert into _table, sorted on getCallTime().
-        # Search from the back since we expect it to go there.
-        i = len(self._table) - 1
-        while i >= 0:
-            if (self._table[i].getCallTime() <= entry.getCallTime()):
-                break
-            i -= 1
-
-        # Element i is the greatest less than or equal to
-        # entry.getCallTime(), so insert after it.
-        self._table.insert(i + 1, entry)
+        entry = DelayedCallTable._Entry(delayMilliseconds, callback, self)
+        heapq.heappush(
+          self._table, (entry.getCallTime(), self._nextSequenceNo, entry))
+        self._nextSequenceNo += 1
+        return entry
 
     def callTimedOut(self):
         """
-        Call and remove timed-out callback entries. Since callLater does a
-        sorted insert into the delayed call table, the check for timed-out
-        entries is quick and does not require searching the entire table.
+        Call and remove timed-out callback entries. Since the delayed call table
+        is a heap on the call time, the check for timed-out entries is quick
+        and does not require searching the entire table.
         """
         # nowOffsetMilliseconds_ is only used for testing.
         now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
-        # _table is sorted on _callTime, so we only need to process the
+        # _table is a heap on _callTime, so we only need to process the
         # timed-out entries at the front, then quit.
-        while (len(self._table) > 0 and self._table[0].getCallTime() <= now):
-            entry = self._table[0]
-            del self._table[0]
+        while (len(self._table) > 0 and self._table[0][0] <= now):
+            entry = heapq.heappop(self._table)[2]
+            if entry.isCancelled():
+                self._nCancelled -= 1
+                continue
+
             entry.callCallback()
 
+    def size(self):
+        """
+        Get the number of callbacks which are waiting to be called, not counting
+        cancelled callbacks.
+
+        :return: The number of waiting callbacks.
+        :rtype: int
+        """
+        return len(self._table) - self._nCancelled
+
+    def _onCancelled(self):
+        """
+        This is called by _Entry.cancel. If more than half the heap is cancelled
+        entries, then remove them so that the heap doesn't grow with dead
+        callbacks.
+        """
+        self._nCancelled += 1
+        if self._nCancelled > 64 and self._nCancelled * 2 > len(self._table):
+            self._table = [
+              item for item in self._table if not item[2].isCancelled()]
+            heapq.heapify(self._table)
+            self._nCancelled = 0
+
     def _setNowOffsetMilliseconds(self, nowOffsetMilliseconds):
         """
         Set the offset when prepareCommandInterestName() gets the current time,
@@ -84,10 +111,14 @@ class DelayedCallTable(object):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :param DelayedCallTable table: The DelayedCallTable to notify when this
+          is cancelled.
         """
-        def __init__(self, delayMilliseconds, callback):
+        def __init__(self, delayMilliseconds, callback, table):
             self._callback = callback
             self._callTime = Common.getNowMilliseconds() + delayMilliseconds
+            self._table = table
+            self._isCancelled = False
 
         def getCallTime(self):
             """
@@ -99,9 +130,37 @@ class DelayedCallTable(object):
             """
             return self._callTime
 
+        def cancel(self):
+            """
+            Cancel the callback so that it is not called, and release the
+            callback object. If the callback was already called or cancelled,
+            do nothing.
+            """
+            if self._table == None:
+                return
+
+            table = self._table
+            self._table = None
+            self._callback = None
+            self._isCancelled = True
+            table._onCancelled()
+
+        def isCancelled(self):
+            """
+            Check if cancel() was called before the callback was called.
+
+            :return: True if cancelled.
+            :rtype: bool
+            """
+            return self._isCancelled
+
         def callCallback(self):
             """
             Call the callback given to the constructor. This does not catch
             exceptions.
             """
-            self._callback()
+            callback = self._callback
+            # The callback has been called, so cancel() does nothing.
+            self._callback = None
+            self._table = None
+            callback()
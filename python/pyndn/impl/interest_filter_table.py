@@ -22,11 +22,30 @@ This module defines InterestFilterTable which is an internal class to hold a
 list of entries with an interest Filter and its OnInterestCallback.
 """
 
+import inspect
 import logging
 
 class InterestFilterTable(object):
+    """
+    An InterestFilterTable indexes its entries by the filter prefix so that
+    finding the entries for an incoming Interest costs one dictionary lookup per
+    prefix of the Interest name instead of a check of every filter. Filters with
+    a regex filter are kept in a separate index since the regex must also be
+    checked on the remaining components. Like InterestFilter.doesMatch, which
+    uses Name.match, a filter prefix matches by component values and not by
+    component types.
+    """
     def __init__(self):
-        self._table = [] # of Entry
+        # The key is from _getValueKey(filter prefix). The value is a list of
+        # (sequenceNo, Entry) for filters without a regex filter.
+        self._prefixEntries = {}
+        # The key is from _getValueKey(filter prefix). The value is a list of
+        # (sequenceNo, Entry) for filters with a regex filter.
+        self._regexEntries = {}
+        # The key is the interestFilterId. The value is the list of Entry.
+        self._entriesById = {}
+        # The sequenceNo keeps matched filters in the order they were added.
+        self._nextSequenceNo = 0
 
     class Entry(object):
         """
@@ -46,6 +65,8 @@ class InterestFilterTable(object):
             self._filter = filter
             self._onInterest = onInterest
             self._face = face
+            self._onInterestTakesFilter = (
+              InterestFilterTable.Entry._takesFilterArgument(onInterest))
 
         def getInterestFilterId(self):
             """
@@ -83,6 +104,42 @@ class InterestFilterTable(object):
             """
             return self._face
 
+        def getOnInterestTakesFilter(self):
+            """
+            Check if the OnInterestCallback takes the filter argument, which was
+            determined once by the constructor.
+
+            :return: True if the callback takes 5 arguments
+              (prefix, interest, face, interestFilterId, filter), or False if
+              it is old-style and takes 4 arguments.
+            :rtype: bool
+            """
+            return self._onInterestTakesFilter
+
+        @staticmethod
+        def _takesFilterArgument(onInterest):
+            """
+            Use inspect.getcallargs to test if onInterest accepts 5 args.
+
+            :param onInterest: The callback to check.
+            :type onInterest: function object
+            :return: True if onInterest accepts 5 args.
+            :rtype: bool
+            """
+            onInterestCall = onInterest
+            # If onInterest is not a function nor a method assumes it is a
+            # callable object
+            if (not inspect.isfunction(onInterestCall) and
+                not inspect.ismethod(onInterestCall)):
+                onInterestCall = onInterestCall.__call__
+            try:
+                inspect.getcallargs(onInterestCall,
+                  None, None, None, None, None)
+                return True
+            except TypeError:
+                # Assume onInterest is old-style with 4 arguments.
+                return False
+
     def setInterestFilter(self, interestFilterId, filterCopy, onInterest, face):
         """
         Add an entry to the table.
@@ -93,8 +150,20 @@ class InterestFilterTable(object):
         :type onInterest: function object
         :param Face face: The face which is passed to the onInterest callback.
         """
-        self._table.append(InterestFilterTable.Entry
-          (interestFilterId, filterCopy, onInterest, face))
+        entry = InterestFilterTable.Entry(
+          interestFilterId, filterCopy, onInterest, face)
+
+        index = (self._regexEntries if filterCopy.hasRegexFilter()
+                 else self._prefixEntries)
+        key = InterestFilterTable._getValueKey(filterCopy.getPrefix())
+        bucket = index.get(key)
+        if bucket == None:
+            bucket = []
+            index[key] = bucket
+        bucket.append((self._nextSequenceNo, entry))
+        self._nextSequenceNo += 1
+
+        self._entriesById.setdefault(interestFilterId, []).append(entry)
 
     def getMatchedFilters(self, interest, matchedFilters):
         """
@@ -104,13 +173,30 @@ class InterestFilterTable(object):
         :param Interest interest: The interest which may match the filter in
           multiple entries.
         :param List<InterestFilterTable.Entry> matchedFilters: Add each matching
-          InterestFilterTable.Entry from the interest filter table.  The caller
-          should pass in an empty list.
+          InterestFilterTable.Entry from the interest filter table, in the order
+          that they were added. The caller should pass in an empty list.
         """
-        for i in range(len(self._table)):
-            entry = self._table[i]
-            if entry.getFilter().doesMatch(interest.getName()):
-                matchedFilters.append(entry)
+        name = interest.getName()
+        matched = []
+        key = ()
+        for i in range(name.size() + 1):
+            if i > 0:
+                key += (InterestFilterTable._getValueBytes(name.get(i - 1)),)
+
+            bucket = self._prefixEntries.get(key)
+            if bucket != None:
+                matched.extend(bucket)
+
+            bucket = self._regexEntries.get(key)
+            if bucket != None:
+                for item in bucket:
+                    if item[1].getFilter().doesMatch(name):
+                        matched.append(item)
+
+        if len(matched) > 1:
+            matched.sort(key = lambda item: item[0])
+        for item in matched:
+            matchedFilters.append(item[1])
 
     def unsetInterestFilter(self, interestFilterId):
         """
@@ -121,17 +207,44 @@ class InterestFilterTable(object):
 
         :param int interestFilterId: The ID returned from setInterestFilter.
         """
-        count = 0
-        # Go backwards through the list so we can erase entries.
         # Remove all entries even though interestFilterId should be unique.
-        i = len(self._table) - 1
-        while i >= 0:
-            if (self._table[i].getInterestFilterId() == interestFilterId):
-                count += 1
-                self._table.pop(i)
-            i -= 1
-
-        if count == 0:
+        entries = self._entriesById.pop(interestFilterId, None)
+        if entries == None:
             logging.getLogger(__name__).debug(
               "unsetInterestFilter: Didn't find interestFilterId " +
               str(interestFilterId))
+            return
+
+        for entry in entries:
+            index = (self._regexEntries if entry.getFilter().hasRegexFilter()
+                     else self._prefixEntries)
+            key = InterestFilterTable._getValueKey(entry.getFilter().getPrefix())
+            bucket = [item for item in index[key] if item[1] is not entry]
+            if len(bucket) == 0:
+                del index[key]
+            else:
+                index[key] = bucket
+
+    @staticmethod
+    def _getValueKey(name):
+        """
+        Get the index key for the name, which is the tuple of the component
+        values so that the key does not depend on the component types.
+
+        :param Name name: The name.
+        :return: The tuple of the bytes of each component value.
+        :rtype: tuple
+        """
+        return tuple(InterestFilterTable._getValueBytes(name.get(i))
+                     for i in range(name.size()))
+
+    @staticmethod
+    def _getValueBytes(component):
+        """
+        Get the bytes of the component value.
+
+        :param Name.Component component: The name component.
+        :rtype: bytes (str in Python 2)
+        """
+        value = component.getValue().toBytes()
+        return b"" if value == None else value
@@ -25,9 +25,25 @@ list of pending interests with their callbacks.
 import logging
 
 class PendingInterestTable(object):
+    """
+    A PendingInterestTable indexes its entries by the interest name and by the
+    pendingInterestId so that finding the entries for an incoming Data packet
+    costs one dictionary lookup per prefix of the Data name instead of a scan of
+    the whole table.
+    """
     def __init__(self):
-        self._table = []  # of Entry
-        self._removeRequests = [] # of int
+        # The key is the interest Name. The value is the list of Entry whose
+        # interest can match a Data with a longer name (CanBePrefix).
+        self._prefixEntries = {}
+        # The key is the interest Name. The value is the list of Entry whose
+        # interest can only match a Data with the same name (not CanBePrefix).
+        self._exactEntries = {}
+        # The key is the pendingInterestId. The value is the Entry.
+        self._entriesById = {}
+        # The number of entries whose interest name ends in an implicit digest,
+        # so that we only compute the Data full name when needed.
+        self._nImplicitDigestEntries = 0
+        self._removeRequests = set() # of int
 
     class Entry(object):
         """
@@ -55,6 +71,7 @@ class PendingInterestTable(object):
             self._onTimeout = onTimeout
             self._onNetworkNack = onNetworkNack
             self._isRemoved = False
+            self._timeoutHandle = None
 
         def getPendingInterestId(self):
             """
@@ -103,11 +120,26 @@ class PendingInterestTable(object):
                 except:
                     logging.exception("Error in onTimeout")
 
+        def setTimeoutHandle(self, timeoutHandle):
+            """
+            Set the handle returned by callLater for the interest timeout, so
+            that setIsRemoved() can cancel it.
+
+            :param timeoutHandle: The handle with a cancel() method, or None if
+              callLater did not return a handle.
+            """
+            self._timeoutHandle = timeoutHandle
+
         def setIsRemoved(self):
             """
-            Set the isRemoved flag which is returned by getIsRemoved().
+            Set the isRemoved flag which is returned by getIsRemoved(). If
+            setTimeoutHandle was called, cancel the interest timeout since it
+            is no longer needed.
             """
             self._isRemoved = True
+            if self._timeoutHandle != None:
+                self._timeoutHandle.cancel()
+                self._timeoutHandle = None
 
         def getIsRemoved(self):
             """
@@ -142,18 +174,28 @@ class PendingInterestTable(object):
           removePendingInterest was already called with the pendingInterestId.
         :rtype: PendingInterestTable.Entry
         """
-        try:
-            removeRequestIndex = self._removeRequests.index(pendingInterestId)
+        if pendingInterestId in self._removeRequests:
             # removePendingInterest was called with the pendingInterestId returned by
             #   expressInterest before we got here, so don't add a PIT entry.
-            del self._removeRequests[removeRequestIndex]
+            self._removeRequests.remove(pendingInterestId)
             return None
-        except ValueError:
-            pass
 
         entry = PendingInterestTable.Entry(
           pendingInterestId, interestCopy, onData, onTimeout, onNetworkNack)
-        self._table.append(entry)
+
+        name = interestCopy.getName()
+        index = (self._prefixEntries if interestCopy.getCanBePrefix()
+                 else self._exactEntries)
+        bucket = index.get(name)
+        if bucket == None:
+            index[name] = [entry]
+        else:
+            bucket.append(entry)
+
+        self._entriesById[pendingInterestId] = entry
+        if name.size() > 0 and name.get(-1).isImplicitSha256Digest():
+            self._nImplicitDigestEntries += 1
+
         return entry
 
     def extractEntriesForExpressedInterest(self, data, entries):
@@ -167,19 +209,24 @@ class PendingInterestTable(object):
           PendingInterestTable.Entry from the pending interest table. The caller
           should pass in an empty list.
         """
-        # Go backwards through the list so we can erase entries.
-        i = len(self._table) - 1
-        while i >= 0:
-            pendingInterest = self._table[i]
-
-            if pendingInterest.getInterest().matchesData(data):
-                entries.append(pendingInterest)
-                # We let the callback from callLater call _processInterestTimeout,
-                # but for efficiency, mark this as removed so that it returns
-                # right away.
-                self._table.pop(i)
-                pendingInterest.setIsRemoved()
-            i -= 1
+        if len(self._entriesById) == 0:
+            return
+
+        dataName = data.getName()
+        # Only an interest whose name is a prefix of the Data full name can
+        # match, so look up each prefix. An interest which can't be a prefix
+        # only matches a Data name (or full name) of the same length.
+        if len(self._prefixEntries) > 0:
+            for i in range(dataName.size()):
+                self._extractMatchingEntries(
+                  self._prefixEntries, dataName.getPrefix(i), data, entries)
+        for index in (self._prefixEntries, self._exactEntries):
+            self._extractMatchingEntries(index, dataName, data, entries)
+
+        if self._nImplicitDigestEntries > 0:
+            fullName = data.getFullName()
+            for index in (self._prefixEntries, self._exactEntries):
+                self._extractMatchingEntries(index, fullName, data, entries)
 
     def extractEntriesForNackInterest(self, interest, entries):
         """
@@ -198,13 +245,19 @@ class PendingInterestTable(object):
           PendingInterestTable.Entry from the pending interest table. The caller
           should pass in an empty list.
         """
-        encoding = interest.wireEncode()
-
-        # Go backwards through the list so we can erase entries.
-        i = len(self._table) - 1
-        while i >= 0:
-            pendingInterest = self._table[i]
-            if pendingInterest.getOnNetworkNack() != None:
+        encoding = None
+        # Interests with the same encoding have the same name.
+        for index in (self._prefixEntries, self._exactEntries):
+            bucket = index.get(interest.getName())
+            if bucket == None:
+                continue
+
+            for pendingInterest in bucket[:]:
+                if pendingInterest.getOnNetworkNack() == None:
+                    continue
+
+                if encoding == None:
+                    encoding = interest.wireEncode()
                 # wireEncode returns the encoding cached when the interest was
                 # sent (if it was the default wire encoding).
                 if pendingInterest.getInterest().wireEncode().equals(encoding):
@@ -212,11 +265,9 @@ class PendingInterestTable(object):
                     # We let the callback from callLater call _processInterestTimeout,
                     # but for efficiency, mark this as removed so that it returns
                     # right away.
-                    self._table.pop(i)
+                    self._removeFromIndex(pendingInterest)
                     pendingInterest.setIsRemoved()
 
-            i -= 1
-
     def removePendingInterest(self, pendingInterestId):
         """
         Remove the pending interest entry with the pendingInterestId from the
@@ -227,44 +278,22 @@ class PendingInterestTable(object):
 
         :param int pendingInterestId: The ID returned from expressInterest.
         """
-        count = 0
-        # Go backwards through the list so we can erase entries.
-        # Remove all entries even though pendingInterestId should be unique.
-        i = len(self._table) - 1
-        while i >= 0:
-            if (self._table[i].getPendingInterestId() ==
-                  pendingInterestId):
-                count += 1
-                # For efficiency, mark this as removed so that
-                # _processInterestTimeout doesn't look for it.
-                self._table[i].setIsRemoved()
-                self._table.pop(i)
-            i -= 1
-
-        if count == 0:
-            logging.getLogger(__name__).debug(
-              "removePendingInterest: Didn't find pendingInterestId " +
-              str(pendingInterestId))
-
-        if count == 0:
-            # The pendingInterestId was not found. Perhaps this has been called before
-            #   the callback in expressInterest can add to the PIT. Add this
-            #   removal request which will be checked before adding to the PIT.
-            try:
-                self._removeRequests.index(pendingInterestId)
-            except ValueError:
-                # Not already requested, so add the request.
-                self._removeRequests.append(pendingInterestId)
-
-        if count == 0:
-            # The pendingInterestId was not found. Perhaps this has been called before
-            #   the callback in expressInterest can add to the PIT. Add this
-            #   removal request which will be checked before adding to the PIT.
-            try:
-                self._removeRequests.index(pendingInterestId)
-            except ValueError:
-                # Not already requested, so add the request.
-                self._removeRequests.append(pendingInterestId)
+        entry = self._entriesById.get(pendingInterestId)
+        if entry != None:
+            # For efficiency, mark this as removed so that
+            # _processInterestTimeout doesn't look for it.
+            self._removeFromIndex(entry)
+            entry.setIsRemoved()
+            return
+
+        logging.getLogger(__name__).debug(
+          "removePendingInterest: Didn't find pendingInterestId " +
+          str(pendingInterestId))
+
+        # The pendingInterestId was not found. Perhaps this has been called before
+        #   the callback in expressInterest can add to the PIT. Add this
+        #   removal request which will be checked before adding to the PIT.
+        self._removeRequests.add(pendingInterestId)
 
     def removeEntry(self, pendingInterest):
         """
@@ -284,13 +313,62 @@ class PendingInterestTable(object):
             # for it. Do nothing.
             return False
 
-        try:
-            index = self._table.index(pendingInterest)
-        except ValueError:
+        if (self._entriesById.get(pendingInterest.getPendingInterestId()) is not
+              pendingInterest):
             # The pending interest has been removed. Do nothing.
             return False
 
+        self._removeFromIndex(pendingInterest)
         pendingInterest.setIsRemoved()
-        del self._table[index]
         return True
 
+    def size(self):
+        """
+        Get the number of entries in the pending interest table.
+
+        :return: The number of entries.
+        :rtype: int
+        """
+        return len(self._entriesById)
+
+    def _extractMatchingEntries(self, index, name, data, entries):
+        """
+        Remove the entries in index[name] whose interest matches data and add
+        them to the entries list.
+
+        :param dict index: The index, either _prefixEntries or _exactEntries.
+        :param Name name: The key in the index.
+        :param Data data: The incoming Data packet.
+        :param List<PendingInterestTable.Entry> entries: Add matching entries.
+        """
+        bucket = index.get(name)
+        if bucket == None:
+            return
+
+        for pendingInterest in bucket[:]:
+            if pendingInterest.getInterest().matchesData(data):
+                entries.append(pendingInterest)
+                # We let the callback from callLater call _processInterestTimeout,
+                # but for efficiency, mark this as removed so that it returns
+                # right away.
+                self._removeFromIndex(pendingInterest)
+                pendingInterest.setIsRemoved()
+
+    def _removeFromIndex(self, entry):
+        """
+        Remove the entry from the name index and the pendingInterestId index.
+
+        :param PendingInterestTable.Entry entry: The entry to remove.
+        """
+        del self._entriesById[entry.getPendingInterestId()]
+
+        name = entry.getInterest().getName()
+        if name.size() > 0 and name.get(-1).isImplicitSha256Digest():
+            self._nImplicitDigestEntries -= 1
+
+        index = (self._prefixEntries if entry.getInterest().getCanBePrefix()
+                 else self._exactEntries)
+        bucket = index[name]
+        bucket.remove(entry)
+        if len(bucket) == 0:
+            del index[name]
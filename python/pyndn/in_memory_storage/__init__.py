@@ -18,12 +18,20 @@
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
 # Don't include internal modules.
+from pyndn.in_memory_storage import in_memory_storage, in_memory_storage_fifo
+from pyndn.in_memory_storage import in_memory_storage_lfu, in_memory_storage_lru
 from pyndn.in_memory_storage import in_memory_storage_retaining
-__all__ = ['in_memory_storage_retaining']
+__all__ = ['in_memory_storage', 'in_memory_storage_fifo',
+  'in_memory_storage_lfu', 'in_memory_storage_lru',
+  'in_memory_storage_retaining']
 
 import sys as _sys
 
 try:
+    from pyndn.in_memory_storage.in_memory_storage import *
+    from pyndn.in_memory_storage.in_memory_storage_fifo import *
+    from pyndn.in_memory_storage.in_memory_storage_lfu import *
+    from pyndn.in_memory_storage.in_memory_storage_lru import *
     from pyndn.in_memory_storage.in_memory_storage_retaining import *
 except ImportError:
     del _sys.modules[__name__]
@@ -0,0 +1,334 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+# Author: From ndn-cxx security https://github.com/named-data/ndn-cxx/blob/master/ndn-cxx/ims/in-memory-storage.cpp
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the InMemoryStorage class which is the base class for an
+application cache with in-memory storage. The Data packets are indexed by full
+name in the NDN canonical order, so that finding and removing by prefix is a
+binary search. A subclass such as InMemoryStorageFifo, InMemoryStorageLru or
+InMemoryStorageLfu implements the eviction policy which is used when the number
+of packets or the total size of their encodings exceeds the limit.
+"""
+
+import bisect
+import heapq
+from pyndn.interest import Interest
+from pyndn.data import Data
+from pyndn.util.common import Common
+
+class InMemoryStorage(object):
+    """
+    Create an empty InMemoryStorage. This is called by the subclass constructor.
+
+    :param int limit: (optional) The maximum number of packets to store. If
+      omitted or None, there is no limit.
+    :param int byteLimit: (optional) The maximum total size of the wire
+      encodings of the stored packets. If omitted or None, there is no limit.
+    """
+    def __init__(self, limit = None, byteLimit = None):
+        self._limit = limit
+        self._byteLimit = byteLimit
+        # The dictionary key is the Data packet full Name. The value is a Data.
+        self._cache = {}
+        # Full Name => InMemoryStorage._Entry with the eviction and freshness
+        # values.
+        self._entries = {}
+        # The keys of _entries in the NDN canonical order.
+        self._sortedNames = []
+        self._nBytes = 0
+        # The heap of (staleTime, sequenceNo, full Name). An item is outdated
+        # if the entry for the name has a different sequenceNo.
+        self._staleHeap = []
+        self._nextSequenceNo = 0
+        self._nowOffsetMilliseconds = 0
+
+    def insert(self, data, mustBeFreshProcessingWindow = None):
+        """
+        Insert a Data packet. If a Data packet with the same name, including the
+        implicit digest, already exists, replace it. If inserting would exceed
+        the limit for the number of packets or their total size, then first
+        evict packets according to the eviction policy of the subclass.
+
+        :param Data data: The packet to insert, which is copied.
+        :param float mustBeFreshProcessingWindow: (optional) The number of
+          milliseconds after which the packet is stale and won't be returned by
+          find() for an Interest with MustBeFresh. If omitted or None, use the
+          FreshnessPeriod of the Data packet, and if it doesn't have one then
+          the packet does not become stale.
+        """
+        self._markStale()
+
+        dataCopy = Data(data)
+        fullName = dataCopy.getFullName()
+        if fullName in self._entries:
+            self._erase(fullName)
+
+        if mustBeFreshProcessingWindow == None:
+            mustBeFreshProcessingWindow = (
+              dataCopy.getMetaInfo().getFreshnessPeriod())
+            if (mustBeFreshProcessingWindow != None and
+                mustBeFreshProcessingWindow < 0):
+                mustBeFreshProcessingWindow = None
+
+        nBytes = dataCopy.wireEncode().size()
+        # Evict before inserting so that the new entry is not evicted.
+        while len(self._entries) > 0 and (
+               (self._limit != None and
+                len(self._entries) + 1 > self._limit) or
+               (self._byteLimit != None and
+                self._nBytes + nBytes > self._byteLimit)):
+            evictName = self._evictItem()
+            if evictName == None:
+                # The eviction policy does not evict.
+                break
+            self._erase(evictName)
+
+        entry = InMemoryStorage._Entry(self._nextSequenceNo, nBytes)
+        self._nextSequenceNo += 1
+        self._entries[fullName] = entry
+        self._cache[fullName] = dataCopy
+        bisect.insort(self._sortedNames, fullName)
+        self._nBytes += entry._nBytes
+
+        if mustBeFreshProcessingWindow != None:
+            # _nowOffsetMilliseconds is only used for testing.
+            now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
+            heapq.heappush(self._staleHeap,
+              (now + mustBeFreshProcessingWindow, entry._sequenceNo, fullName))
+            if len(self._staleHeap) > 2 * len(self._entries) + 100:
+                self._compactStaleHeap()
+
+        self._afterInsert(fullName)
+
+    def find(self, nameOrInterest):
+        """
+        Find the best match Data for a Name or an Interest.
+
+        :param nameOrInterest: If this is a Name, find the first Data packet in
+          the NDN canonical order whose full name has the Name as a prefix.
+          Otherwise this is an Interest, so find the first Data packet which
+          can satisfy it, considering CanBePrefix, MustBeFresh and the
+          selectors checked by Interest.matchesData.
+        :type nameOrInterest: Name or Interest
+        :return: The best match if any, otherwise None. You should not modify
+          the returned object. If you need to modify it then you must make a copy.
+        :rtype: Data
+        """
+        self._markStale()
+
+        if isinstance(nameOrInterest, Interest):
+            interest = nameOrInterest
+            name = interest.getName()
+            if name.size() > 0 and name.get(-1).isImplicitSha256Digest():
+                # Only the packet with the full name can match.
+                names = [name] if name in self._entries else []
+            else:
+                names = self._iteratePrefix(name)
+
+            for fullName in names:
+                data = self._cache[fullName]
+                # Without CanBePrefix, the Interest name must be the Data name
+                # or the full name.
+                if (not interest.getCanBePrefix() and
+                    fullName.size() != name.size() and
+                    data.getName().size() != name.size()):
+                    continue
+                if (interest.getMustBeFresh() and
+                    not self._entries[fullName]._isFresh):
+                    continue
+                if not interest.matchesData(data):
+                    continue
+
+                self._afterAccess(fullName)
+                return data
+        else:
+            for fullName in self._iteratePrefix(nameOrInterest):
+                self._afterAccess(fullName)
+                return self._cache[fullName]
+
+        return None
+
+    def remove(self, prefix, isPrefix = True):
+        """
+        Remove matching entries by prefix.
+
+        :param Name prefix: The prefix Name of the entries to remove.
+        :param bool isPrefix: (optional) If True or omitted, remove all entries
+          whose full name has the prefix. If False, only remove the entry whose
+          full name is the prefix.
+        """
+        if not isPrefix:
+            if prefix in self._entries:
+                self._erase(prefix)
+            return
+
+        # First get the names to remove, to not change the index while iterating.
+        for fullName in list(self._iteratePrefix(prefix)):
+            self._erase(fullName)
+
+    def size(self):
+        """
+        Get the number of packets stored in the in-memory storage.
+
+        :return: The number of packets.
+        :rtype: int
+        """
+        return len(self._entries)
+
+    def getByteSize(self):
+        """
+        Get the total size of the wire encodings of the stored packets.
+
+        :return: The number of bytes.
+        :rtype: int
+        """
+        return self._nBytes
+
+    def getLimit(self):
+        """
+        Get the maximum number of packets to store.
+
+        :return: The maximum number of packets, or None for no limit.
+        :rtype: int
+        """
+        return self._limit
+
+    def getByteLimit(self):
+        """
+        Get the maximum total size of the wire encodings of the stored packets.
+
+        :return: The maximum number of bytes, or None for no limit.
+        :rtype: int
+        """
+        return self._byteLimit
+
+    def _afterInsert(self, fullName):
+        """
+        The subclass can override this to update its eviction policy after an
+        entry is inserted.
+
+        :param Name fullName: The full name of the inserted entry.
+        """
+        pass
+
+    def _afterAccess(self, fullName):
+        """
+        The subclass can override this to update its eviction policy after
+        find() returns the entry.
+
+        :param Name fullName: The full name of the found entry.
+        """
+        pass
+
+    def _beforeEvict(self, fullName):
+        """
+        The subclass can override this to update its eviction policy before an
+        entry is removed for any reason.
+
+        :param Name fullName: The full name of the entry to remove.
+        """
+        pass
+
+    def _evictItem(self):
+        """
+        The subclass must implement this to choose the entry to evict when the
+        storage exceeds its limit.
+
+        :return: The full name of the entry to evict, or None to not evict.
+        :rtype: Name
+        """
+        raise RuntimeError("InMemoryStorage._evictItem is not implemented")
+
+    def _iteratePrefix(self, prefix):
+        """
+        Yield the full names in _sortedNames which have the prefix, in the NDN
+        canonical order. The names with a prefix are consecutive.
+
+        :param Name prefix: The prefix Name.
+        """
+        nPrefixComponents = prefix.size()
+        i = bisect.bisect_left(self._sortedNames, prefix)
+        while i < len(self._sortedNames):
+            fullName = self._sortedNames[i]
+            if (fullName.size() < nPrefixComponents or
+                fullName.compare(0, nPrefixComponents, prefix) != 0):
+                break
+
+            yield fullName
+            i += 1
+
+    def _erase(self, fullName):
+        """
+        Remove the entry for the full name, which must exist.
+
+        :param Name fullName: The full name of the entry.
+        """
+        self._beforeEvict(fullName)
+        entry = self._entries.pop(fullName)
+        del self._cache[fullName]
+        self._nBytes -= entry._nBytes
+
+        i = bisect.bisect_left(self._sortedNames, fullName)
+        self._sortedNames.pop(i)
+
+    def _markStale(self):
+        """
+        Mark the entries whose MustBeFresh processing window has passed as not
+        fresh.
+        """
+        # _nowOffsetMilliseconds is only used for testing.
+        now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
+
+        while len(self._staleHeap) > 0 and self._staleHeap[0][0] <= now:
+            staleTime, sequenceNo, fullName = heapq.heappop(self._staleHeap)
+            entry = self._entries.get(fullName)
+            if entry != None and entry._sequenceNo == sequenceNo:
+                entry._isFresh = False
+
+    def _compactStaleHeap(self):
+        """
+        Remove the outdated items from _staleHeap.
+        """
+        self._staleHeap = [
+          item for item in self._staleHeap
+          if item[2] in self._entries and
+             self._entries[item[2]]._sequenceNo == item[1]]
+        heapq.heapify(self._staleHeap)
+
+    def _setNowOffsetMilliseconds(self, nowOffsetMilliseconds):
+        """
+        Set the offset when insert() and find() get the current time, which
+        should only be used for testing.
+
+        :param float nowOffsetMilliseconds: The offset in milliseconds.
+        """
+        self._nowOffsetMilliseconds = nowOffsetMilliseconds
+
+    class _Entry(object):
+        """
+        Create an _Entry for a Data packet, which is fresh until marked stale.
+
+        :param int sequenceNo: The insertion sequence number.
+        :param int nBytes: The size of the wire encoding of the Data packet.
+        """
+        def __init__(self, sequenceNo, nBytes):
+            self._sequenceNo = sequenceNo
+            self._nBytes = nBytes
+            self._isFresh = True
@@ -0,0 +1,61 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+# Author: From ndn-cxx security https://github.com/named-data/ndn-cxx/blob/master/ndn-cxx/ims/in-memory-storage-fifo.cpp
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the InMemoryStorageFifo class, which provides an application
+cache with in-memory storage, of which the eviction policy is first-in-first-out.
+"""
+
+from collections import OrderedDict
+from pyndn.in_memory_storage.in_memory_storage import InMemoryStorage
+
+class InMemoryStorageFifo(InMemoryStorage):
+    """
+    Create an empty InMemoryStorageFifo. When the storage exceeds the limit,
+    insert() evicts the packet which was inserted first.
+
+    :param int limit: (optional) The maximum number of packets to store. If
+      omitted or None, there is no limit.
+    :param int byteLimit: (optional) The maximum total size of the wire
+      encodings of the stored packets. If omitted or None, there is no limit.
+    """
+    def __init__(self, limit = None, byteLimit = None):
+        super(InMemoryStorageFifo, self).__init__(limit, byteLimit)
+
+        # The full Name keys are in insertion order. The values are not used.
+        self._queue = OrderedDict()
+
+    def _afterInsert(self, fullName):
+        self._queue[fullName] = True
+
+    def _beforeEvict(self, fullName):
+        del self._queue[fullName]
+
+    def _evictItem(self):
+        """
+        Get the packet which was inserted first.
+
+        :return: The full name of the entry to evict, or None if empty.
+        :rtype: Name
+        """
+        for fullName in self._queue:
+            return fullName
+
+        return None
@@ -0,0 +1,94 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+# Author: From ndn-cxx security https://github.com/named-data/ndn-cxx/blob/master/ndn-cxx/ims/in-memory-storage-lfu.cpp
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the InMemoryStorageLfu class, which provides an application
+cache with in-memory storage, of which the eviction policy is
+least-frequently-used.
+"""
+
+import heapq
+from pyndn.in_memory_storage.in_memory_storage import InMemoryStorage
+
+class InMemoryStorageLfu(InMemoryStorage):
+    """
+    Create an empty InMemoryStorageLfu. When the storage exceeds the limit,
+    insert() evicts the packet which was returned by find() the fewest times.
+    Among packets with the same count, evict the one which was inserted first.
+
+    :param int limit: (optional) The maximum number of packets to store. If
+      omitted or None, there is no limit.
+    :param int byteLimit: (optional) The maximum total size of the wire
+      encodings of the stored packets. If omitted or None, there is no limit.
+    """
+    def __init__(self, limit = None, byteLimit = None):
+        super(InMemoryStorageLfu, self).__init__(limit, byteLimit)
+
+        # Full Name => [nAccesses, sequenceNo].
+        self._frequencies = {}
+        # The heap of (nAccesses, sequenceNo, full Name). An item is outdated
+        # if the value in _frequencies for the name is different.
+        self._frequencyHeap = []
+
+    def _afterInsert(self, fullName):
+        frequency = [0, self._entries[fullName]._sequenceNo]
+        self._frequencies[fullName] = frequency
+        self._push(fullName, frequency)
+
+    def _afterAccess(self, fullName):
+        frequency = self._frequencies[fullName]
+        frequency[0] += 1
+        self._push(fullName, frequency)
+
+    def _beforeEvict(self, fullName):
+        del self._frequencies[fullName]
+
+    def _evictItem(self):
+        """
+        Get the packet which was least frequently used.
+
+        :return: The full name of the entry to evict, or None if empty.
+        :rtype: Name
+        """
+        while len(self._frequencyHeap) > 0:
+            nAccesses, sequenceNo, fullName = heapq.heappop(self._frequencyHeap)
+            frequency = self._frequencies.get(fullName)
+            if (frequency != None and frequency[0] == nAccesses and
+                frequency[1] == sequenceNo):
+                return fullName
+
+        return None
+
+    def _push(self, fullName, frequency):
+        """
+        Push the item for the frequency to _frequencyHeap, and discard the
+        outdated items if there are too many.
+
+        :param Name fullName: The full name of the entry.
+        :param list frequency: The [nAccesses, sequenceNo] for the entry.
+        """
+        heapq.heappush(
+          self._frequencyHeap, (frequency[0], frequency[1], fullName))
+
+        if len(self._frequencyHeap) > 2 * len(self._frequencies) + 100:
+            self._frequencyHeap = [
+              (value[0], value[1], name)
+              for name, value in self._frequencies.items()]
+            heapq.heapify(self._frequencyHeap)
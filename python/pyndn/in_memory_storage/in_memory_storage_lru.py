@@ -0,0 +1,69 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+# Author: From ndn-cxx security https://github.com/named-data/ndn-cxx/blob/master/ndn-cxx/ims/in-memory-storage-lru.cpp
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the InMemoryStorageLru class, which provides an application
+cache with in-memory storage, of which the eviction policy is
+least-recently-used.
+"""
+
+from collections import OrderedDict
+from pyndn.in_memory_storage.in_memory_storage import InMemoryStorage
+
+class InMemoryStorageLru(InMemoryStorage):
+    """
+    Create an empty InMemoryStorageLru. When the storage exceeds the limit,
+    insert() evicts the packet which was least recently inserted or returned by
+    find().
+
+    :param int limit: (optional) The maximum number of packets to store. If
+      omitted or None, there is no limit.
+    :param int byteLimit: (optional) The maximum total size of the wire
+      encodings of the stored packets. If omitted or None, there is no limit.
+    """
+    def __init__(self, limit = None, byteLimit = None):
+        super(InMemoryStorageLru, self).__init__(limit, byteLimit)
+
+        # The full Name keys are in least recently used order. The values are
+        # not used.
+        self._queue = OrderedDict()
+
+    def _afterInsert(self, fullName):
+        self._queue[fullName] = True
+
+    def _afterAccess(self, fullName):
+        # Re-insert to make this the most recently used.
+        del self._queue[fullName]
+        self._queue[fullName] = True
+
+    def _beforeEvict(self, fullName):
+        del self._queue[fullName]
+
+    def _evictItem(self):
+        """
+        Get the packet which was least recently used.
+
+        :return: The full name of the entry to evict, or None if empty.
+        :rtype: Name
+        """
+        for fullName in self._queue:
+            return fullName
+
+        return None
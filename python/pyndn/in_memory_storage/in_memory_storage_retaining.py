@@ -26,69 +26,20 @@ Note: In ndn-cxx, this class is called InMemoryStoragePersistent, but
 "persistent" misleadingly sounds like persistent on-disk storage.
 """
 
-from pyndn.interest import Interest
-from pyndn.data import Data
+from pyndn.in_memory_storage.in_memory_storage import InMemoryStorage
 
-class InMemoryStorageRetaining(object):
+class InMemoryStorageRetaining(InMemoryStorage):
     """
     Create an empty InMemoryStorageRetaining.
     """
     def __init__(self):
-        # The dictionary key is the Data packet Name. The value is a Data.
-        self._cache = {}
+        super(InMemoryStorageRetaining, self).__init__()
 
-    def insert(self, data):
+    def _evictItem(self):
         """
-        Insert a Data packet. If a Data packet with the same name, including the
-        implicit digest, already exists, replace it.
+        Don't evict since entries are only removed by remove().
 
-        :param Data data: The packet to insert, which is copied.
+        :return: None.
+        :rtype: Name
         """
-        self._cache[data.getFullName()] = Data(data)
-
-    def find(self, nameOrInterest):
-        """
-        Find the best match Data for a Name or an Interest.
-
-        :param nameOrInterest: The Name or the Interest with the Name of the
-          Data packet to find.
-        :type nameOrInterest: Name or Interest
-        :return: The best match if any, otherwise None. You should not modify
-          the returned object. If you need to modify it then you must make a copy.
-        :rtype: Data
-        """
-        if isinstance(nameOrInterest, Interest):
-            # Debug: Check selectors, especially CanBePrefix.
-            name = nameOrInterest.getName()
-        else:
-            name = nameOrInterest
-
-        for cacheName, data in self._cache.items():
-            if name.isPrefixOf(cacheName):
-                return data
-
         return None
-
-    def remove(self, prefix):
-        """
-        Remove matching entries by prefix.
-
-        :param Name prefix: The prefix Name of the entries to remove.
-        """
-        # First get the keys to delete, to not change the dict while iterating.
-        keys = []
-        for key in self._cache.keys():
-            if prefix.isPrefixOf(key):
-                keys.append(key)
-
-        for key in keys:
-            del self._cache[key]
-
-    def size(self):
-        """
-        Get the number of packets stored in the in-memory storage.
-
-        :return: The number of packets.
-        :rtype: int
-        """
-        return len(self._cache)
\ No newline at end of file
@@ -53,6 +53,10 @@ class InterestFilter(object):
             else:
                 self._regexFilterPattern = None
 
+        # doesMatch creates the NdnRegexTopMatcher when first needed and reuses
+        # it, so that the regex is not compiled for every Interest.
+        self._regexFilterMatcher = None
+
     def doesMatch(self, name):
         """
         Check if the given name matches this filter. Match if name starts with
@@ -86,7 +90,10 @@ class InterestFilter(object):
             if not self._prefix.match(name):
                 return False
 
-            return NdnRegexTopMatcher(self._regexFilterPattern).match(
+            if self._regexFilterMatcher == None:
+                self._regexFilterMatcher = NdnRegexTopMatcher(
+                  self._regexFilterPattern)
+            return self._regexFilterMatcher.match(
               name.getSubName(len(self._prefix)))
         else:
             # Just perform a prefix match.
@@ -21,6 +21,8 @@
 This module defines the NDN Name class.
 """
 
+import struct
+import weakref
 from io import BytesIO
 
 class Name(object):
@@ -34,9 +36,16 @@ class Name(object):
     :type value: Name or str
     """
     def __init__(self, value = None):
+        # _key is the value from _getKey(), or None if not computed.
+        self._key = None
+        self._keyIsGeneric = True
         if isinstance(value, Name):
             # Copy the components array, but don't need to copy each Component.
             self._components = value._components[:]
+            if value._key != None and value._keyChangeCount == value._changeCount:
+                # The key is immutable, so share it.
+                self._key = value._key
+                self._keyIsGeneric = value._keyIsGeneric
         elif Common.typeIsString(value):
             self._components = []
             # Set _changeCount now because self.set() expects it.
@@ -46,6 +55,7 @@ class Name(object):
             self._components = []
 
         self._changeCount = 0
+        self._keyChangeCount = 0
         self._hash = None
         self._hashCodeChangeCount = 0
 
@@ -68,14 +78,21 @@ class Name(object):
           then this is the packet's unrecognized content type code, which must
           be non-negative.
         """
+        # Use __slots__ since an application may keep millions of components.
+        __slots__ = ('_value', '_type', '_otherTypeCode', '_key', '__weakref__')
+
         def __init__(self, value = None, type = None, otherTypeCode = None):
             if isinstance(value, Name.Component):
                 # Copy constructor. Use the existing Blob in the other Component.
                 self._value = value._value
                 self._type = value._type
                 self._otherTypeCode = value._otherTypeCode
+                self._key = value._key
                 return
 
+            # _key is the value from _getKey(), or None if not computed.
+            self._key = None
+
             if value == None:
                 self._value = Blob([])
             else:
@@ -362,11 +379,11 @@ class Name(object):
             :rtype: bool
             """
             if self._type == ComponentType.OTHER_CODE:
-                return (self._value.equals(other._value) and
-                  other._type == ComponentType.OTHER_CODE and
-                  self._otherTypeCode == other._otherTypeCode)
+                return (other._type == ComponentType.OTHER_CODE and
+                  self._otherTypeCode == other._otherTypeCode and
+                  self._value.equals(other._value))
             else:
-                return self._value.equals(other._value) and self._type == other._type
+                return self._type == other._type and self._value.equals(other._value)
 
         def compare(self, other):
             """
@@ -379,23 +396,14 @@ class Name(object):
             :rtype: int
             :see: http://named-data.net/doc/0.2/technical/CanonicalOrder.html
             """
-            myTypeCode = (self._otherTypeCode
-              if self._type == ComponentType.OTHER_CODE else self._type)
-            otherTypeCode = (other._otherTypeCode
-              if other._type == ComponentType.OTHER_CODE else other._type)
-
-            if myTypeCode < otherTypeCode:
+            # The keys compare as bytes in the canonical ordering.
+            myKey = self._getKey()
+            otherKey = other._getKey()
+            if myKey < otherKey:
                 return -1
-            if myTypeCode > otherTypeCode:
+            if myKey > otherKey:
                 return 1
-
-            if self._value.size() < other._value.size():
-                return -1
-            if self._value.size() > other._value.size():
-                return 1
-
-            # The components are equal length. Just do a byte compare.
-            return self._value.compare(other._value)
+            return 0
 
         @staticmethod
         def fromNumber(number, type = None, otherTypeCode = None):
@@ -611,6 +619,30 @@ class Name(object):
                                    else self._type) +
               hash(self._value))
 
+        def _getKey(self):
+            """
+            Get the bytes of the TLV encoding of this component using the type
+            code, which is the concatenation of the type code, the length and
+            the value. Because the TLV VAR-NUMBER encoding preserves the order
+            of numbers, comparing the keys as bytes gives the NDN canonical
+            ordering of the components. The key is computed once, since the
+            component is immutable.
+
+            :return: The key.
+            :rtype: bytes (str in Python 2)
+            """
+            if self._key == None:
+                typeCode = (self._otherTypeCode
+                  if self._type == ComponentType.OTHER_CODE else self._type)
+                value = self._value.toBytes()
+                if value == None:
+                    value = b""
+
+                self._key = (Name._encodeVarNumber(typeCode) +
+                  Name._encodeVarNumber(len(value)) + value)
+
+            return self._key
+
     def set(self, uri):
         """
         Parse the uri according to the NDN URI Scheme and set the name with
@@ -730,14 +762,21 @@ class Name(object):
             else:
                 components = value._components
 
-            for component in components:
-                self._components.append(component)
+            if Name._componentPool != None:
+                components = [Name._internComponent(component)
+                              for component in components]
+            self._components.extend(components)
         elif isinstance(value, Name.Component):
             # The Name.Component is immutable, so use it as is.
+            if Name._componentPool != None:
+                value = Name._internComponent(value)
             self._components.append(value)
         else:
             # Just use the Name.Component constructor.
-            self._components.append(Name.Component(value, type, otherTypeCode))
+            component = Name.Component(value, type, otherTypeCode)
+            if Name._componentPool != None:
+                component = Name._internComponent(component)
+            self._components.append(component)
 
         self._changeCount += 1
         return self
@@ -955,12 +994,7 @@ class Name(object):
         if len(self._components) != len(name._components):
             return False
 
-        # Check from last to first since the last components are more likely to differ.
-        for i in range(len(self._components) - 1, -1, -1):
-            if not self._components[i].equals(name._components[i]):
-                return False
-
-        return True
+        return self._getKey() == name._getKey()
 
     def compare(self, iStartComponent, nComponents = None, other = None,
           iOtherStartComponent = None, nOtherComponents = None):
@@ -1021,21 +1055,16 @@ class Name(object):
         nComponents = min(nComponents, self.size() - iStartComponent)
         nOtherComponents = min(nOtherComponents, other.size() - iOtherStartComponent)
 
-        count = min(nComponents, nOtherComponents)
-        for i in range(count):
-            comparison = self._components[iStartComponent + i].compare(
-              other._components[iOtherStartComponent + i])
-            if comparison == 0:
-                # The components at this index are equal, so check the next
-                #   components.
-                continue
-
-            # Otherwise, the result is based on the components at this index.
-            return comparison
-
-        # The components up to min(self.size(), other.size()) are equal, so the
-        #   shorter name is less.
-        if nComponents < nOtherComponents:
+        # The keys compare as bytes in the canonical ordering, where a shorter
+        # name is less if the components of the longer name start with it.
+        myKey = self._getKey(iStartComponent, max(nComponents, 0))
+        otherKey = other._getKey(iOtherStartComponent, max(nOtherComponents, 0))
+        if myKey < otherKey:
+            return -1
+        elif myKey > otherKey:
+            return 1
+        # The keys are equal, so the components up to the shorter are equal.
+        elif nComponents < nOtherComponents:
             return -1
         elif nComponents > nOtherComponents:
             return 1
@@ -1083,8 +1112,17 @@ class Name(object):
         if len(self._components) > len(name._components):
             return False
 
-        # Check if at least one of given components doesn't match. Check from
-        # last to first since the last components are more likely to differ.
+        # Each component key has its length, so the keys have the same
+        # components if one key starts with the other.
+        if name._getKey().startswith(self._getKey()):
+            return True
+        if self._keyIsGeneric and name._keyIsGeneric:
+            # The component types are the same, so some value doesn't match.
+            return False
+
+        # This only compares the values, not the types. Check if at least one
+        # of given components doesn't match. Check from last to first since the
+        # last components are more likely to differ.
         for i in range(len(self._components) - 1, -1, -1):
             if not self._components[i].getValue().equals(
                   name._components[i].getValue()):
@@ -1140,6 +1178,38 @@ class Name(object):
         else:
           wireFormat.decodeName(self, input, True)
 
+    @staticmethod
+    def setInternComponents(internComponents):
+        """
+        Set whether to intern the components added to a Name. If True, then
+        when a component is added to a Name (including when decoding or
+        creating a Name from a URI), if an equal Name.Component is already in
+        a Name then use the existing Name.Component object. This reduces the
+        memory used by an application which keeps many names with the same
+        components, such as names with a long common prefix, but adds the cost
+        of a lookup when adding a component. A component is removed from the
+        pool when it is no longer used by any Name. The default is False.
+
+        :param bool internComponents: True to intern components, False to not
+          intern and clear the pool.
+        """
+        if internComponents:
+            if Name._componentPool == None:
+                Name._componentPool = weakref.WeakValueDictionary()
+        else:
+            Name._componentPool = None
+
+    @staticmethod
+    def getInternComponents():
+        """
+        Get whether to intern the components added to a Name, as set by
+        setInternComponents.
+
+        :return: True if interning components.
+        :rtype: bool
+        """
+        return Name._componentPool != None
+
     def getChangeCount(self):
         """
         Get the change count, which is incremented each time this object is
@@ -1271,17 +1341,19 @@ class Name(object):
     def __ne__(self, other):
         return not self == other
 
+    # The keys of whole names compare the same as compare(), without its
+    # argument handling. This makes sorting and bisect faster.
     def __le__(self, other):
-        return self.compare(other) <= 0
+        return self._getKey() <= other._getKey()
 
     def __lt__(self, other):
-        return self.compare(other) < 0
+        return self._getKey() < other._getKey()
 
     def __ge__(self, other):
-        return self.compare(other) >= 0
+        return self._getKey() >= other._getKey()
 
     def __gt__(self, other):
-        return self.compare(other) > 0
+        return self._getKey() > other._getKey()
 
     def __str__(self):
         return self.toUri()
@@ -1296,14 +1368,80 @@ class Name(object):
             self._hashCodeChangeCount = self.getChangeCount()
 
         if self._hash == None:
-            hashCode = 0
-            # Use a similar hash code algorithm as String.
+            self._hash = hash(self._getKey())
+
+        return self._hash
+
+    def _getKey(self, iStartComponent = 0, nComponents = None):
+        """
+        Get the concatenation of the keys of the components from
+        Name.Component._getKey(). Comparing the keys of two names as bytes
+        gives the NDN canonical ordering, and the keys are equal if the names
+        are equal. The key of the whole name is saved until the name is changed,
+        so that hashing and comparing a name is done by comparing bytes.
+
+        :param int iStartComponent: (optional) The index of the first component.
+          If omitted, use 0.
+        :param int nComponents: (optional) The number of components starting at
+          iStartComponent. If omitted, use until the end of the name.
+        :return: The key.
+        :rtype: bytes (str in Python 2)
+        """
+        if not (iStartComponent == 0 and
+                (nComponents == None or nComponents >= len(self._components))):
+            # Don't save the key of a subname.
+            return b"".join([component._getKey() for component in
+              self._components[iStartComponent:iStartComponent + nComponents]])
+
+        if self._key == None or self._keyChangeCount != self._changeCount:
+            isGeneric = True
             for component in self._components:
-                hashCode = 37 * hashCode + hash(component)
+                if component._type != ComponentType.GENERIC:
+                    isGeneric = False
+                    break
 
-            self._hash = hashCode
+            self._key = b"".join(
+              [component._getKey() for component in self._components])
+            self._keyIsGeneric = isGeneric
+            self._keyChangeCount = self._changeCount
 
-        return self._hash
+        return self._key
+
+    @staticmethod
+    def _internComponent(component):
+        """
+        Get the Name.Component in the component pool which equals the given
+        component, adding it if there is none. setInternComponents(True) must
+        have been called.
+
+        :param Name.Component component: The component.
+        :return: The interned component.
+        :rtype: Name.Component
+        """
+        key = component._getKey()
+        result = Name._componentPool.get(key)
+        if result == None:
+            Name._componentPool[key] = component
+            result = component
+
+        return result
+
+    @staticmethod
+    def _encodeVarNumber(number):
+        """
+        Get the TLV VAR-NUMBER encoding of the number.
+
+        :param int number: The non-negative number.
+        :rtype: bytes (str in Python 2)
+        """
+        if number < 253:
+            return struct.pack(">B", number)
+        elif number <= 0xffff:
+            return struct.pack(">BH", 253, number)
+        elif number <= 0xffffffff:
+            return struct.pack(">BI", 254, number)
+        else:
+            return struct.pack(">BQ", 255, number)
 
     @staticmethod
     def _unescape(escaped):
@@ -1343,6 +1481,9 @@ class Name(object):
 
         return bytearray(result.getvalue())
 
+    # The key of a Name.Component => Name.Component, or None if not interning.
+    _componentPool = None
+
 class ComponentType(object):
     """
     A ComponentType specifies the recognized types of a name component. If the
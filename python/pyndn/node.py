@@ -22,7 +22,6 @@ This module defines the Node class which provides functionality for the Face
 class.
 """
 
-import inspect
 import logging
 import threading
 from random import SystemRandom
@@ -382,6 +381,9 @@ class Node(object):
         # processEvents is not needed to check for delayed calls.
         self._delayedCallTable.callTimedOut()
 
+        # Send any packets which the transport queued during the callbacks.
+        self._transport.flush()
+
     def getTransport(self):
         """
         Get the transport object given to the constructor.
@@ -400,6 +402,17 @@ class Node(object):
         """
         return self._connectionInfo
 
+    def onReceivedElements(self, elements):
+        """
+        This is called by the transport's ElementReader to process all the
+        entire elements received in one read from the transport.
+
+        :param elements: The list of the bytes of each incoming element.
+        :type elements: list of an array type with int elements
+        """
+        for element in elements:
+            self.onReceivedElement(element)
+
     def onReceivedElement(self, element):
         """
         This is called by the transport's ElementReader to process an
@@ -419,19 +432,23 @@ class Node(object):
             TlvWireFormat.get().decodeLpPacket(lpPacket, element, False)
             element = lpPacket.getFragmentWireEncoding().buf()
 
-        # First, decode as Interest or Data.
+        # First, decode as Interest or Data. Copy the element once into a Blob
+        # so that the decoded fields can share its memory.
         interest = None
         data = None
         decoder = TlvDecoder(element)
         if decoder.peekType(Tlv.Interest, len(element)):
             interest = Interest()
-            interest.wireDecode(element, TlvWireFormat.get())
+            interest.wireDecode(Blob(element), TlvWireFormat.get())
 
             if lpPacket != None:
                 interest.setLpPacket(lpPacket)
         elif decoder.peekType(Tlv.Data, len(element)):
             data = Data()
-            data.wireDecode(element, TlvWireFormat.get())
+            # Only decode the name now. Matching the PIT usually only needs the
+            # name, and the other fields are decoded if the application uses
+            # them.
+            data.wireDecodeLazily(Blob(element), TlvWireFormat.get())
 
             if lpPacket != None:
                 data.setLpPacket(lpPacket)
@@ -538,8 +555,11 @@ class Node(object):
                 # Use a default timeout delay.
                 delayMilliseconds = 4000.0
 
-            face.callLater(delayMilliseconds,
-                           lambda: self._processInterestTimeout(pendingInterest))
+            # When the entry is removed from the PIT, this cancels the timeout
+            # so that the callback doesn't stay in the delayed call table.
+            pendingInterest.setTimeoutHandle(face.callLater(
+              delayMilliseconds,
+              lambda: self._processInterestTimeout(pendingInterest)))
 
         # Special case: For _timeoutPrefix we don't actually send the interest.
         if not self._timeoutPrefix.match(interestCopy.getName()):
@@ -613,8 +633,9 @@ class Node(object):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: A handle whose cancel() method cancels the call.
         """
-        self._delayedCallTable.callLater(delayMilliseconds, callback)
+        return self._delayedCallTable.callLater(delayMilliseconds, callback)
 
     def _processInterestTimeout(self, pendingInterest):
         """
@@ -652,20 +673,8 @@ class Node(object):
         self._interestFilterTable.getMatchedFilters(interest, matchedFilters)
         for i in range(len(matchedFilters)):
             entry = matchedFilters[i]
-            includeFilter = True
-            onInterestCall = entry.getOnInterest()
-            # If onInterest is not a function nor a method assumes it is a
-            # callable object
-            if (not inspect.isfunction(onInterestCall) and
-                not inspect.ismethod(onInterestCall)):
-                onInterestCall = onInterestCall.__call__
-            # Use getcallargs to test if onInterest accepts 5 args.
-            try:
-                inspect.getcallargs(onInterestCall,
-                  None, None, None, None, None)
-            except TypeError:
-                # Assume onInterest is old-style with 4 arguments.
-                includeFilter = False
+            # setInterestFilter already checked if onInterest accepts 5 args.
+            includeFilter = entry.getOnInterestTakesFilter()
 
             if includeFilter:
                 try:
@@ -44,6 +44,7 @@ from pyndn.sha256_with_rsa_signature import Sha256WithRsaSignature
 from pyndn.key_locator import KeyLocator, KeyLocatorType
 from pyndn.validity_period import ValidityPeriod
 from pyndn.util.blob import Blob
+from pyndn.util.signed_blob import SignedBlob
 from pyndn.util.common import Common
 from pyndn.util.config_file import ConfigFile
 from pyndn.security.security_exception import SecurityException
@@ -69,6 +70,9 @@ from pyndn.security.tpm.tpm_back_end_osx import TpmBackEndOsx
 from pyndn.security.v2.certificate_v2 import CertificateV2
 from pyndn.hmac_with_sha256_signature import HmacWithSha256Signature
 from pyndn.encoding.wire_format import WireFormat
+from pyndn.encoding.tlv_0_2_wire_format import Tlv0_2WireFormat
+from pyndn.encoding.tlv.tlv_encoder import TlvEncoder
+from pyndn.encoding.tlv.tlv import Tlv
 
 class KeyChain(object):
     """
@@ -110,6 +114,7 @@ class KeyChain(object):
         self._identityManager_ = None  # for security v1
         self._policyManager = NoVerifyPolicyManager() # for security v1
         self._face = None              # for security v1
+        self._verifiedDataCache = None # for security v1
 
         self._pib = None
         self._tpm = None
@@ -534,10 +539,8 @@ class KeyChain(object):
 
             signatureBytes = self._signBuffer(
               encoding.toSignedBytes(), keyName[0], params.getDigestAlgorithm())
-            data.getSignature().setSignature(signatureBytes)
-
-            # Encode again to include the signature.
-            data.wireEncode(wireFormat)
+            KeyChain._setSignatureValue(
+              data, encoding, signatureBytes, wireFormat)
         elif isinstance(target, Interest):
             interest = target
 
@@ -567,6 +570,68 @@ class KeyChain(object):
             return self._signBuffer(
               buffer, keyName[0], params.getDigestAlgorithm())
 
+    def signBatch(self, datas, params = None, wireFormat = None,
+                  executor = None):
+        """
+        Sign each Data packet in the list with the same signing parameters. This
+        is the same as calling sign(data, params, wireFormat) for each, but the
+        signing key and SignatureInfo are prepared once and each Data packet is
+        only encoded once.
+
+        :param datas: The Data packets to sign. Each signature is replaced and
+          the wire encoding is updated.
+        :type datas: list of Data
+        :param SigningInfo params: (optional) The signing parameters. If omitted
+          or None, use the default key of the default identity.
+        :param wireFormat: (optional) A WireFormat object used to encode the
+           Data packets. If omitted, use WireFormat.getDefaultWireFormat().
+        :type wireFormat: A subclass of WireFormat
+        :param executor: (optional) An executor such as a
+          concurrent.futures.ThreadPoolExecutor with a submit method, used to
+          compute the signatures in parallel. If omitted or None, sign on the
+          calling thread.
+        """
+        if wireFormat == None:
+            wireFormat = WireFormat.getDefaultWireFormat()
+        if params == None:
+            params = KeyChain._defaultSigningInfo
+
+        if self._isSecurityV1:
+            for data in datas:
+                self.sign(data, params, wireFormat)
+            return
+
+        if len(datas) == 0:
+            return
+
+        keyName = [None]
+        signatureInfo = self._prepareSignatureInfo(params, keyName)
+        digestAlgorithm = params.getDigestAlgorithm()
+
+        encodings = []
+        for data in datas:
+            # setSignature copies the SignatureInfo.
+            data.setSignature(signatureInfo)
+            encodings.append(data.wireEncode(wireFormat))
+
+        # Sign the first on this thread so that the TPM caches the key handle.
+        signatures = [self._signBuffer(
+          encodings[0].toSignedBytes(), keyName[0], digestAlgorithm)]
+        if executor != None:
+            futures = [executor.submit(
+                         self._signBuffer, encoding.toSignedBytes(), keyName[0],
+                         digestAlgorithm)
+                       for encoding in encodings[1:]]
+            signatures.extend([future.result() for future in futures])
+        else:
+            for encoding in encodings[1:]:
+                signatures.append(self._signBuffer(
+                  encoding.toSignedBytes(), keyName[0], digestAlgorithm))
+
+        for i in range(len(datas)):
+            KeyChain._setSignatureValue(
+              datas[i], encodings[i], signatures[i], wireFormat)
+
     def selfSign(self, key, wireFormat = None):
         """
         Generate a self-signed certificate for the public key and add it to the
@@ -1044,6 +1109,30 @@ class KeyChain(object):
         """
         return self._policyManager
 
+    def setVerifiedDataCache(self, verifiedDataCache):
+        """
+        Set the cache of verified Data packets used by verifyData. When the
+        policy manager verifies a Data packet, its full name is added to the
+        cache. When verifying a Data packet with the same full name (so that it
+        is byte-identical), call onVerified without checking the policy again.
+        Since the policy manager does not report the certificate that it used,
+        an entry is removed after the maxLifetime of the cache. (A
+        security.v2.Validator also limits the entry by the certificate validity.)
+
+        :param VerifiedDataCache verifiedDataCache: The VerifiedDataCache, or
+          None to not use a cache (the default).
+        """
+        self._verifiedDataCache = verifiedDataCache
+
+    def getVerifiedDataCache(self):
+        """
+        Get the cache of verified Data packets given to setVerifiedDataCache.
+
+        :return: The VerifiedDataCache, or None if not using a cache.
+        :rtype: VerifiedDataCache
+        """
+        return self._verifiedDataCache
+
     #
     # Sign/Verify
     #
@@ -1185,7 +1274,22 @@ class KeyChain(object):
             oldValidationFailed = onValidationFailed
             onValidationFailed = lambda d, reason: oldValidationFailed(d)
 
+        verifiedDataCache = self._verifiedDataCache
+        if verifiedDataCache != None and verifiedDataCache.contains(data):
+            try:
+                onVerified(data)
+            except:
+                logging.exception("Error in onVerified")
+            return
+
         if self._policyManager.requireVerify(data):
+            if verifiedDataCache != None:
+                # Add the data to the cache before calling onVerified.
+                originalOnVerified = onVerified
+                def onVerified(verifiedData):
+                    verifiedDataCache.insert(verifiedData)
+                    originalOnVerified(verifiedData)
+
             nextStep = self._policyManager.checkVerificationPolicy(
               data, stepCount, onVerified, onValidationFailed)
             if nextStep != None:
@@ -1725,6 +1829,43 @@ class KeyChain(object):
         keyName[0] = key.getName()
         return signatureInfo
 
+    @staticmethod
+    def _setSignatureValue(data, encoding, signatureBytes, wireFormat):
+        """
+        Set the signature value of the Data packet and update its wire encoding.
+        For an NDN-TLV wire format, the SignatureValue is the last element, so
+        make the new encoding from the signed portion of the encoding instead of
+        encoding the Data again.
+
+        :param Data data: The Data packet.
+        :param SignedBlob encoding: The encoding of data with the SignatureInfo
+          and an empty signature value.
+        :param Blob signatureBytes: The signature value.
+        :param WireFormat wireFormat: The WireFormat of the encoding.
+        """
+        data.getSignature().setSignature(signatureBytes)
+        if not (isinstance(wireFormat, Tlv0_2WireFormat) and
+                wireFormat == WireFormat.getDefaultWireFormat()):
+            # Encode again to include the signature.
+            data.wireEncode(wireFormat)
+            return
+
+        signedPortion = encoding.signedBuf()
+        signatureValueLength = TlvEncoder.sizeOfBlobTlv(
+          Tlv.SignatureValue, signatureBytes.size())
+        encoder = TlvEncoder(
+          len(signedPortion) + signatureValueLength + 10)
+        encoder.writeBlobTlv(Tlv.SignatureValue, signatureBytes.buf())
+        encoder.writeBuffer(signedPortion)
+        encoder.writeTypeAndLength(Tlv.Data, len(encoder))
+
+        signedPortionEndOffset = len(encoder) - signatureValueLength
+        data._setDefaultWireEncoding(
+          SignedBlob(Blob(encoder.getOutput(), False),
+                     signedPortionEndOffset - len(signedPortion),
+                     signedPortionEndOffset),
+          wireFormat)
+
     def _signBuffer(self, buffer, keyName, digestAlgorithm):
         """
         Sign the byte buffer using the key with name keyName.
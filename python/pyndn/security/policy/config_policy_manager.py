@@ -41,6 +41,7 @@ from pyndn.key_locator import KeyLocatorType
 
 from pyndn.util.boost_info_parser import BoostInfoParser
 from pyndn.util.regex.ndn_regex_top_matcher import NdnRegexTopMatcher
+from pyndn.security.v2.validator_config.config_rule_index import ConfigRuleIndex
 
 """
 This module manages trust according to a configuration file in the
@@ -136,6 +137,11 @@ class ConfigPolicyManager(PolicyManager):
 
         self.requiresVerification = True
 
+        # The rules for "data" and "interest" from config, compiled by load().
+        self._ruleIndexes = {}
+        # Regex string => NdnRegexTopMatcher.
+        self._regexMatchers = {}
+
         self.config = BoostInfoParser()
         self._refreshManager = TrustAnchorRefreshManager(self._isSecurityV1)
 
@@ -156,6 +162,7 @@ class ConfigPolicyManager(PolicyManager):
         self.reset()
         self.config.read(configFileNameOrInput, inputName)
         self._loadTrustAnchorCertificates()
+        self._compileRules()
 
     def requireVerify(self, dataOrInterest):
         """
@@ -235,6 +242,79 @@ class ConfigPolicyManager(PolicyManager):
             else:
                 self._lookupCertificateV2(certID, isPath)
 
+    def _compileRules(self):
+        """
+        Compile the filters of the rules in the configuration and index the
+        rules by type and filter name, and compile the checker regexes, so
+        that this is not done for each packet.
+        """
+        self._ruleIndexes = {}
+        self._regexMatchers = {}
+
+        try:
+            rules = self.config["validator/rule"]
+        except KeyError:
+            return
+
+        for r in rules:
+            matchType = r.getFirstValue("for")
+            if matchType == None:
+                continue
+
+            compiledRule = ConfigPolicyManager._CompiledRule(r)
+            requiredPrefixes = None
+            for f in r["filter"]:
+                # don't check the type - it can only be name for now
+                # we need to see if this is a regex or a relation
+                regexPattern = f.getFirstValue("regex")
+                if regexPattern == None:
+                    matchName = Name(f.getFirstValue("name"))
+                    compiledRule._filters.append(
+                      (None, matchName, f.getFirstValue("relation")))
+                    if requiredPrefixes == None:
+                        # Every relation requires the name to have matchName
+                        # as a prefix, and all filters must pass.
+                        requiredPrefixes = [matchName]
+                else:
+                    compiledRule._filters.append(
+                      (self._getRegexMatcher(regexPattern), None, None))
+
+            if not matchType in self._ruleIndexes:
+                # Only cache the rule for an interest name without the signature
+                # components, which repeats. A data name is usually unique.
+                self._ruleIndexes[matchType] = ConfigRuleIndex(
+                  ConfigRuleIndex.DEFAULT_CACHE_CAPACITY
+                  if matchType == "interest" else 0)
+            self._ruleIndexes[matchType].add(compiledRule, requiredPrefixes)
+
+            for checker in r["checker"]:
+                for keyLocatorInfo in checker["key-locator"]:
+                    regexPattern = keyLocatorInfo.getFirstValue("regex")
+                    if regexPattern != None:
+                        self._getRegexMatcher(regexPattern)
+                    for hyperRelation in keyLocatorInfo["hyper-relation"]:
+                        for regexKey in ['k-regex', 'p-regex']:
+                            regexPattern = hyperRelation.getFirstValue(regexKey)
+                            if regexPattern != None:
+                                self._getRegexMatcher(regexPattern)
+
+    def _getRegexMatcher(self, regexPattern):
+        """
+        Get the compiled NdnRegexTopMatcher for the regex string, compiling it
+        and saving it if needed.
+
+        :param str regexPattern: The regex string.
+        :return: The NdnRegexTopMatcher. The result of match() is only valid
+          until it is used again.
+        :rtype: NdnRegexTopMatcher
+        """
+        matcher = self._regexMatchers.get(regexPattern)
+        if matcher == None:
+            matcher = NdnRegexTopMatcher(regexPattern)
+            self._regexMatchers[regexPattern] = matcher
+
+        return matcher
+
     def _checkSignatureMatch(self, signatureName, objectName, rule, failureReason):
         """
         Once a rule is found to match data or a signed interest, the name in the
@@ -308,7 +388,7 @@ class ConfigPolicyManager(PolicyManager):
             # this just means the data/interest name has the signing identity as a prefix
             # that means everything before 'ksk-?' in the key name
             identityRegex = '^([^<KEY>]*)<KEY>(<>*)<ksk-.+><ID-CERT>'
-            identityMatch = NdnRegexTopMatcher(identityRegex)
+            identityMatch = self._getRegexMatcher(identityRegex)
             if identityMatch.match(signatureName):
                 identityPrefix = identityMatch.expand("\\1").append(
                   identityMatch.expand("\\2"))
@@ -323,7 +403,7 @@ class ConfigPolicyManager(PolicyManager):
             if not self._isSecurityV1:
                 # Check for a security v2 key name.
                 identityRegex2 = "^(<>*)<KEY><>$"
-                identityMatch2 = NdnRegexTopMatcher(identityRegex2)
+                identityMatch2 = self._getRegexMatcher(identityRegex2)
                 if identityMatch2.match(signatureName):
                     identityPrefix = identityMatch2.expand("\\1")
                     if self._matchesRelation(objectName, identityPrefix, 'is-prefix-of'):
@@ -357,7 +437,7 @@ class ConfigPolicyManager(PolicyManager):
             # Is this a simple regex?
             simpleKeyRegex = keyLocatorInfo.getFirstValue("regex")
             if simpleKeyRegex != None:
-                if NdnRegexTopMatcher(simpleKeyRegex).match(signatureName):
+                if self._getRegexMatcher(simpleKeyRegex).match(signatureName):
                     return True
                 else:
                     failureReason[0] = ("The custom signatureName \"" +
@@ -379,7 +459,7 @@ class ConfigPolicyManager(PolicyManager):
                 if (keyRegex != None and keyExpansion != None and
                       nameRegex != None and nameExpansion != None and
                       relationType != None):
-                    keyMatch = NdnRegexTopMatcher(keyRegex)
+                    keyMatch = self._getRegexMatcher(keyRegex)
                     if not keyMatch.match(signatureName):
                         failureReason[0] = (
                           "The custom hyper-relation signatureName \"" +
@@ -388,7 +468,7 @@ class ConfigPolicyManager(PolicyManager):
                         return False
                     keyMatchPrefix = keyMatch.expand(keyExpansion)
 
-                    nameMatch = NdnRegexTopMatcher(nameRegex)
+                    nameMatch = self._getRegexMatcher(nameRegex)
                     if not nameMatch.match(objectName):
                         failureReason[0] = (
                           "The custom hyper-relation objectName \"" +
@@ -486,34 +566,40 @@ class ConfigPolicyManager(PolicyManager):
         :param Name objName: The name to be matched.
         :param string matchType: The rule type to match, "data" or "interest".
         """
-        rules = self.config["validator/rule"]
-        for r in rules:
-            if r['for'][0].getValue() == matchType:
-                passed = True
-                try:
-                    filters = r['filter']
-                except KeyError:
-                    # no filters means we pass!
-                    return r
+        ruleIndex = self._ruleIndexes.get(matchType)
+        if ruleIndex == None:
+            return None
+
+        def matches(compiledRule):
+            for regexMatcher, matchName, matchRelation in compiledRule._filters:
+                if regexMatcher == None:
+                    passed = self._matchesRelation(objName, matchName, matchRelation)
                 else:
-                    for f in filters:
-                        # don't check the type - it can only be name for now
-                        # we need to see if this is a regex or a relation
-                        regexPattern = f.getFirstValue("regex")
-                        if regexPattern == None:
-                            matchRelation =f.getFirstValue("relation")
-                            matchUri = f.getFirstValue("name")
-                            matchName = Name(matchUri)
-                            passed = self._matchesRelation(objName, matchName, matchRelation)
-                        else:
-                            passed =  NdnRegexTopMatcher(regexPattern).match(objName)
+                    passed = regexMatcher.match(objName)
 
-                        if not passed:
-                            break
-                    if passed:
-                        return r
+                if not passed:
+                    return False
 
-        return None
+            # no filters means we pass!
+            return True
+
+        compiledRule = ruleIndex.find(objName, matches)
+        if compiledRule == None:
+            return None
+        return compiledRule._rule
+
+    class _CompiledRule(object):
+        """
+        A _CompiledRule holds a rule from the configuration and its compiled
+        filters.
+
+        :param BoostInfoTree rule: The rule from the configuration.
+        """
+        def __init__(self, rule):
+            self._rule = rule
+            # The list of (regexMatcher, matchName, matchRelation) where
+            # regexMatcher is None for a relation filter.
+            self._filters = []
 
     @staticmethod
     def _matchesRelation(name, matchName, matchRelation):
@@ -25,14 +25,15 @@ from pyndn.security.v2 import validation_policy, validation_policy_accept_all
 from pyndn.security.v2 import validation_policy_command_interest
 from pyndn.security.v2 import validation_policy_config, validation_policy_from_pib
 from pyndn.security.v2 import validation_policy_simple_hierarchy, validation_state
-from pyndn.security.v2 import validator
+from pyndn.security.v2 import validator, verified_data_cache
 __all__ = ['certificate_v2', 'certificate_cache_v2',
   'certificate_fetcher', 'certificate_fetcher_from_network',
   'certificate_fetcher_offline', 'data_validation_state',
   'interest_validation_state', 'validation_error', 'validation_policy',
   'validation_policy_accept_all', 'validation_policy_command_interest',
   'validation_policy_config', 'validation_policy_from_pib',
-  'validation_policy_simple_hierarchy', 'validation_state']
+  'validation_policy_simple_hierarchy', 'validation_state',
+  'verified_data_cache']
 
 import sys as _sys
 
@@ -53,6 +54,7 @@ try:
     from pyndn.security.v2.validation_policy_simple_hierarchy import *
     from pyndn.security.v2.validation_state import *
     from pyndn.security.v2.validator import *
+    from pyndn.security.v2.verified_data_cache import *
 except ImportError:
     del _sys.modules[__name__]
     raise
@@ -25,9 +25,10 @@ removed no later than its NotAfter time, or maxLifetime after it has been added
 to the cache.
 """
 
-import sys
 import logging
 import bisect
+import heapq
+from collections import OrderedDict
 from pyndn.name import Name
 from pyndn.security.v2.certificate_v2 import CertificateV2
 from pyndn.encrypt.schedule import Schedule
@@ -40,19 +41,34 @@ class CertificateCacheV2(object):
     :param float maxLifetimeMilliseconds: (optional) The maximum time that
       certificates can live inside the cache, in milliseconds. If omitted use
       getDefaultLifetime()
+    :param int capacity: (optional) The maximum number of certificates. When
+      the cache is full, inserting removes the least recently used certificate.
+      If omitted use getDefaultCapacity().
     """
-    def __init__(self, maxLifetimeMilliseconds = None):
+    def __init__(self, maxLifetimeMilliseconds = None, capacity = None):
         if maxLifetimeMilliseconds == None:
             maxLifetimeMilliseconds = CertificateCacheV2.getDefaultLifetime()
-
-        # Name => CertificateCacheV2._Entry.
-        self._certificatesByName = {}
-        # The keys of _certificatesByName in sorted order, kept in sync with it.
-        # (We don't use OrderedDict because it doesn't sort keys on insert.)
+        if capacity == None:
+            capacity = CertificateCacheV2.getDefaultCapacity()
+
+        # Name => CertificateCacheV2._Entry, in least recently used order.
+        self._certificatesByName = OrderedDict()
+        # The keys of _certificatesByName in sorted order for a prefix search,
+        # or None if it must be rebuilt. insert() only sets this to None so
+        # that inserting is not O(N), and it is rebuilt when needed by find().
         self._certificatesByNameKeys = []
+        # Key Name => sorted list of certificate Name. This is used by find()
+        # when searching by a KeyLocator key name, which is the common case.
+        self._certificateNamesByKeyName = {}
+        # The heap of (removalTime, sequenceNo, certificate Name). An item is
+        # stale if the entry for the name has a different sequenceNo.
+        self._removalHeap = []
+        self._nextSequenceNo = 0
 
-        self._nextRefreshTime = sys.float_info.max
         self._maxLifetimeMilliseconds = maxLifetimeMilliseconds
+        self._capacity = capacity
+        self._refreshAheadMilliseconds = None
+        self._onRefresh = None
         self._nowOffsetMilliseconds = 0
 
     def insert(self, certificate):
@@ -74,9 +90,6 @@ class CertificateCacheV2(object):
             return
 
         removalTime = min(notAfterTime, now + self._maxLifetimeMilliseconds)
-        if removalTime < self._nextRefreshTime:
-            # We need to run refresh() sooner.
-            self._nextRefreshTime = removalTime
 
         logging.getLogger(__name__).info("Adding " + certificate.getName().toUri() +
           ", will remove in " + str((removalTime - now) / (3600 * 1000.0)) +
@@ -85,20 +98,39 @@ class CertificateCacheV2(object):
         certificateCopy = CertificateV2(certificate)
         certificateName = certificateCopy.getName()
 
-        if certificateName in self._certificatesByName:
-            # A duplicate name. Simply replace.
-            self._certificatesByName[certificateName]._certificate = certificateCopy
-            self._certificatesByName[certificateName]._removalTime = removalTime
-        else:
-            # Insert into _certificatesByNameKeys sorted.
-            # Keep it sync with _certificatesByName.
-            self._certificatesByName[certificateName] = CertificateCacheV2._Entry(
-              certificateCopy, removalTime)
-            bisect.insort(self._certificatesByNameKeys, certificateName)
+        entry = CertificateCacheV2._Entry(certificateCopy, removalTime)
+        entry._sequenceNo = self._nextSequenceNo
+        self._nextSequenceNo += 1
+        heapq.heappush(
+          self._removalHeap, (removalTime, entry._sequenceNo, certificateName))
+
+        # Remove first so that a replaced entry becomes the most recently used.
+        if self._certificatesByName.pop(certificateName, None) == None:
+            # A new name.
+            self._certificatesByNameKeys = None
+            keyName = certificateCopy.getKeyName()
+            if keyName in self._certificateNamesByKeyName:
+                bisect.insort(
+                  self._certificateNamesByKeyName[keyName], certificateName)
+            else:
+                self._certificateNamesByKeyName[keyName] = [certificateName]
+        self._certificatesByName[certificateName] = entry
+
+        while len(self._certificatesByName) > self._capacity:
+            self._remove(next(iter(self._certificatesByName)))
+
+        if len(self._removalHeap) > 2 * len(self._certificatesByName) + 100:
+            # Discard the stale items.
+            self._removalHeap = [
+              (value._removalTime, value._sequenceNo, name)
+              for name, value in self._certificatesByName.items()]
+            heapq.heapify(self._removalHeap)
 
     def find(self, certificatePrefixOrInterest):
         """
-        Find the certificate by the given key name or interest.
+        Find the certificate by the given key name or interest. If setRefreshAhead
+        was called, this may call the onRefresh callback for the found
+        certificate.
 
         :param certificatePrefixOrInterest: If a Name, it is the  certificate
           prefix for searching for the certificate. If an Interest, it is the
@@ -111,51 +143,29 @@ class CertificateCacheV2(object):
         """
         if isinstance(certificatePrefixOrInterest, Name):
             certificatePrefix = certificatePrefixOrInterest
-
-            if (certificatePrefix.size() > 0 and
-                certificatePrefix.get(-1).isImplicitSha256Digest()):
-                logging.getLogger(__name__).error(
-                  "Certificate search using a name with an implicit digest is not yet supported")
-
-            self._refresh()
-
-            # Find the first that is greater than or equal to certificatePrefix.
-            i = bisect.bisect_left(self._certificatesByNameKeys, certificatePrefix)
-            if (i >= len(self._certificatesByNameKeys) or
-                not certificatePrefix.isPrefixOf(self._certificatesByNameKeys[i])):
-                return None
-            return self._certificatesByName[self._certificatesByNameKeys[i]]._certificate
+            interest = None
         else:
             interest = certificatePrefixOrInterest
+            certificatePrefix = interest.getName()
 
             if interest.getChildSelector() != None:
                 logging.getLogger(__name__).error(
                   "Certificate search using a ChildSelector is not supported. Searching as if this selector not specified")
 
-            if (interest.getName().size() > 0 and
-                interest.getName().get(-1).isImplicitSha256Digest()):
-                logging.getLogger(__name__).error(
-                  "Certificate search using a name with an implicit digest is not yet supported")
-
-            self._refresh()
-
-            # Find the first that is greater than or equal to interest.getName().
-            i = bisect.bisect_left(self._certificatesByNameKeys, interest.getName())
-            if i >= len(self._certificatesByNameKeys):
-                return None
+        if (certificatePrefix.size() > 0 and
+            certificatePrefix.get(-1).isImplicitSha256Digest()):
+            logging.getLogger(__name__).error(
+              "Certificate search using a name with an implicit digest is not yet supported")
 
-            while i < len(self._certificatesByNameKeys):
-                key = self._certificatesByNameKeys[i]
-                certificate = self._certificatesByName[key]._certificate
-                if not interest.getName().isPrefixOf(certificate.getName()):
-                    break
+        self._refresh()
 
-                if interest.matchesData(certificate):
-                    return certificate
+        for certificateName in self._getCandidateNames(certificatePrefix):
+            entry = self._certificatesByName[certificateName]
+            if interest == None or interest.matchesData(entry._certificate):
+                self._use(certificateName, entry)
+                return entry._certificate
 
-                i += 1
-
-            return None
+        return None
 
     def deleteCertificate(self, certificateName):
         """
@@ -164,28 +174,52 @@ class CertificateCacheV2(object):
 
         :param Name certificateName: The name of the certificate.
         """
-        try:
-            del self._certificatesByName[certificateName]
-        except KeyError:
-            # Do nothing if it doesn't exist.
-            pass
-        try:
-            self._certificatesByNameKeys.remove(certificateName)
-        except ValueError:
-            # Do nothing if it doesn't exist.
-            pass
-
-        # This may be the certificate to be removed at _nextRefreshTime by
-        # _refresh(), but just allow _refresh() to run instead of updating
-        # _nextRefreshTime now.
+        if certificateName in self._certificatesByName:
+            # The item in _removalHeap becomes stale.
+            self._remove(certificateName)
 
     def clear(self):
         """
         Clear all certificates from the cache.
         """
-        self._certificatesByName = {}
+        self._certificatesByName = OrderedDict()
         self._certificatesByNameKeys = []
-        self._nextRefreshTime = sys.float_info.max
+        self._certificateNamesByKeyName = {}
+        self._removalHeap = []
+
+    def size(self):
+        """
+        Get the number of certificates in the cache, including expired
+        certificates which have not yet been removed.
+
+        :return: The number of certificates.
+        :rtype: int
+        """
+        return len(self._certificatesByName)
+
+    def setRefreshAhead(self, refreshAheadMilliseconds, onRefresh):
+        """
+        Set the callback to refresh a frequently used certificate before it is
+        removed from the cache. When find() returns a certificate which it
+        has already returned since the certificate was inserted and which will
+        be removed within refreshAheadMilliseconds, call onRefresh(certificate)
+        once. The certificate stays in the cache until its removal time, so
+        onRefresh can fetch a new certificate asynchronously and insert it.
+
+        :param float refreshAheadMilliseconds: The time before the removal time
+          in milliseconds, or None to not refresh (the default).
+        :param onRefresh: This calls onRefresh(certificate) where certificate is
+          the CertificateV2 to refresh. You must not modify the certificate
+          object. If you need to modify it, then make a copy.
+          NOTE: The library will log any exceptions raised by this callback, but
+          for better error handling the callback should catch and properly
+          handle any exceptions.
+        :type onRefresh: function object
+        """
+        if refreshAheadMilliseconds == None:
+            onRefresh = None
+        self._refreshAheadMilliseconds = refreshAheadMilliseconds
+        self._onRefresh = onRefresh
 
     @staticmethod
     def getDefaultLifetime():
@@ -197,6 +231,16 @@ class CertificateCacheV2(object):
         """
         return 3600.0 * 1000
 
+    @staticmethod
+    def getDefaultCapacity():
+        """
+        Get the default maximum number of certificates (10000).
+
+        :return: The capacity.
+        :rtype: int
+        """
+        return 10000
+
     def _setNowOffsetMilliseconds(self, nowOffsetMilliseconds):
         """
         Set the offset when insert() and _refresh() get the current time, which
@@ -218,29 +262,89 @@ class CertificateCacheV2(object):
         def __init__(self, certificate, removalTime):
             self._certificate = certificate
             self._removalTime = removalTime
+            # The sequence number of the item in _removalHeap.
+            self._sequenceNo = 0
+            # The number of times find() returned the certificate.
+            self._nUses = 0
+            self._isRefreshRequested = False
 
-    def _refresh(self):
+    def _getCandidateNames(self, certificatePrefix):
         """
-        Remove all outdated certificate entries.
+        Get the names in sorted order of the certificates which have the
+        certificate prefix.
+
+        :param Name certificatePrefix: The certificate prefix.
+        :return: An iterable of the certificate names.
+        """
+        certificateNames = self._certificateNamesByKeyName.get(certificatePrefix)
+        if certificateNames != None:
+            # The prefix is a key name.
+            return list(certificateNames)
+
+        if self._certificatesByNameKeys == None:
+            self._certificatesByNameKeys = sorted(self._certificatesByName)
+
+        # Find the first that is greater than or equal to certificatePrefix.
+        result = []
+        i = bisect.bisect_left(self._certificatesByNameKeys, certificatePrefix)
+        while (i < len(self._certificatesByNameKeys) and
+               certificatePrefix.isPrefixOf(self._certificatesByNameKeys[i])):
+            result.append(self._certificatesByNameKeys[i])
+            i += 1
+
+        return result
+
+    def _use(self, certificateName, entry):
+        """
+        Make the entry the most recently used, and call _onRefresh if needed.
         """
+        # Re-insert to make this the most recently used.
+        del self._certificatesByName[certificateName]
+        self._certificatesByName[certificateName] = entry
+
+        entry._nUses += 1
+        if (self._onRefresh == None or entry._isRefreshRequested or
+            entry._nUses < 2):
+            return
+
         # _nowOffsetMilliseconds is only used for testing.
         now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
-        if now < self._nextRefreshTime:
-            return
+        if now >= entry._removalTime - self._refreshAheadMilliseconds:
+            entry._isRefreshRequested = True
+            logging.getLogger(__name__).info("Refreshing " +
+              certificateName.toUri())
+            try:
+                self._onRefresh(entry._certificate)
+            except:
+                logging.exception("Error in onRefresh")
+
+    def _remove(self, certificateName):
+        """
+        Remove the entry for the certificate name from _certificatesByName and
+        the indexes, but not from _removalHeap.
+        """
+        entry = self._certificatesByName.pop(certificateName)
 
-        # We recompute _nextRefreshTime.
-        nextRefreshTime = sys.float_info.max
-        # Go backwards through the list so we can erase entries.
-        i = len(self._certificatesByNameKeys) - 1
-        while i >= 0:
-            entry = self._certificatesByName[self._certificatesByNameKeys[i]]
+        keyName = entry._certificate.getKeyName()
+        certificateNames = self._certificateNamesByKeyName[keyName]
+        certificateNames.remove(certificateName)
+        if len(certificateNames) == 0:
+            del self._certificateNamesByKeyName[keyName]
 
-            if entry._removalTime <= now:
-                del self._certificatesByName[self._certificatesByNameKeys[i]]
-                self._certificatesByNameKeys.pop(i)
-            else:
-                nextRefreshTime = min(nextRefreshTime, entry._removalTime)
+        if self._certificatesByNameKeys != None:
+            i = bisect.bisect_left(self._certificatesByNameKeys, certificateName)
+            self._certificatesByNameKeys.pop(i)
 
-            i -= 1
+    def _refresh(self):
+        """
+        Remove all outdated certificate entries.
+        """
+        # _nowOffsetMilliseconds is only used for testing.
+        now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
 
-        self._nextRefreshTime = nextRefreshTime
+        while len(self._removalHeap) > 0 and self._removalHeap[0][0] <= now:
+            removalTime, sequenceNo, certificateName = heapq.heappop(
+              self._removalHeap)
+            entry = self._certificatesByName.get(certificateName)
+            if entry != None and entry._sequenceNo == sequenceNo:
+                self._remove(certificateName)
@@ -24,15 +24,59 @@ CertificateFetcher to fetch missing certificates from the network.
 """
 
 import logging
+from pyndn.name import Name
+from pyndn.interest import Interest
 from pyndn.security.v2.certificate_v2 import CertificateV2
 from pyndn.security.v2.validation_error import ValidationError
 from pyndn.security.v2.certificate_fetcher import CertificateFetcher
 
 class CertificateFetcherFromNetwork(CertificateFetcher):
+    """
+    Create a CertificateFetcherFromNetwork to fetch certificates using the
+    Face. If a certificate is requested while a request for the same name is
+    pending, for example by concurrent validations, the requests share one
+    Interest.
+
+    :param Face face: The face for calling expressInterest.
+    """
     def __init__(self, face):
         super(CertificateFetcherFromNetwork, self).__init__()
 
         self._face = face
+        self._prefetchDepth = 0
+        # Interest Name => list of (certificateRequest, state,
+        # continueValidation) waiting for the pending Interest.
+        self._pendingFetches = {}
+        # Key prefix /<identity>/KEY => list of (certificateRequest, state,
+        # continueValidation) waiting for the pending prefetch Interest.
+        self._pendingPrefetches = {}
+
+    def setPrefetchDepth(self, prefetchDepth):
+        """
+        Set the number of parent identities for which to prefetch certificates.
+        When fetching the certificate for a key of an identity such as
+        /a/b/c/KEY/<key-id>, also request the certificates with the prefixes
+        /a/b/KEY, /a/KEY, etc. in parallel, assuming that the certificate
+        chain follows the identity hierarchy (as required by
+        ValidationPolicySimpleHierarchy or a hierarchical checker in the
+        validator configuration). A fetched certificate is added to the
+        unverified cache, so that walking up the chain finds it instead of
+        waiting one round trip for each certificate. Prefetching stops at a
+        parent whose certificate is already known, such as a trust anchor.
+
+        :param int prefetchDepth: The maximum number of parent identities, or
+          0 to not prefetch (the default).
+        """
+        self._prefetchDepth = prefetchDepth
+
+    def getPrefetchDepth(self):
+        """
+        Get the number of parent identities given to setPrefetchDepth.
+
+        :return: The prefetch depth.
+        :rtype: int
+        """
+        return self._prefetchDepth
 
     def _doFetch(self, certificateRequest, state, continueValidation):
         """
@@ -46,49 +90,79 @@ class CertificateFetcherFromNetwork(CertificateFetcher):
           fetched certificate and state is the ValidationState.
         :type continueValidation: function object
         """
+        interestName = certificateRequest._interest.getName()
+        waiter = (certificateRequest, state, continueValidation)
+
+        if interestName in self._pendingFetches:
+            logging.getLogger(__name__).info(
+              "Waiting for the pending fetch of certificate " +
+              interestName.toUri())
+            self._pendingFetches[interestName].append(waiter)
+            return
+        if (interestName.size() > 0 and
+            interestName.getPrefix(-1) in self._pendingPrefetches):
+            logging.getLogger(__name__).info(
+              "Waiting for the pending prefetch of certificate " +
+              interestName.toUri())
+            self._pendingPrefetches[interestName.getPrefix(-1)].append(waiter)
+            return
+
+        # Copy the Name.
+        interestName = Name(interestName)
+        self._pendingFetches[interestName] = [waiter]
+        # Prefetch first so that the parent certificates are requested in
+        # parallel, even if the face calls onData before returning.
+        self._prefetch(interestName)
+
         def onData(interest, data):
             logging.getLogger(__name__).info("Fetched certificate from network " +
               data.getName().toUri())
+            waiters = self._pendingFetches.pop(interestName, [])
 
             try:
                 certificate = CertificateV2(data)
             except Exception as ex:
-                state.fail(ValidationError
-                  (ValidationError.MALFORMED_CERTIFICATE,
-                   "Fetched a malformed certificate `" + data.getName().toUri() +
-                   "` (" + repr(ex) + ")"))
+                for _, waiterState, _ in waiters:
+                    waiterState.fail(ValidationError
+                      (ValidationError.MALFORMED_CERTIFICATE,
+                       "Fetched a malformed certificate `" +
+                       data.getName().toUri() + "` (" + repr(ex) + ")"))
                 return
 
-            try:
-                continueValidation(certificate, state)
-            except Exception as ex:
-                state.fail(ValidationError
-                  (ValidationError.CANNOT_RETRIEVE_CERTIFICATE,
-                   "Error in continueValidation: " + repr(ex)))
+            for _, waiterState, waiterContinueValidation in waiters:
+                CertificateFetcherFromNetwork._continue(
+                  certificate, waiterState, waiterContinueValidation)
 
         def onTimeout(interest):
             logging.getLogger(__name__).info("Timeout while fetching certificate " +
-              certificateRequest._interest.getName().toUri() + ", retrying")
-
-            certificateRequest._nRetriesLeft -= 1
-            if certificateRequest._nRetriesLeft >= 0:
-                try:
-                    self.fetch(certificateRequest, state, continueValidation)
-                except Exception as ex:
-                   state.fail(ValidationError
-                     (ValidationError.CANNOT_RETRIEVE_CERTIFICATE,
-                      "Error in fetch: " + repr(ex)))
-            else:
-                state.fail(ValidationError
-                  (ValidationError.CANNOT_RETRIEVE_CERTIFICATE,
-                   "Cannot fetch certificate after all retries `" +
-                   certificateRequest._interest.getName().toUri() + "`"))
+              interestName.toUri() + ", retrying")
+            self._retry(self._pendingFetches.pop(interestName, []))
 
         def onNetworkNack(interest, networkNack):
             logging.getLogger(__name__).info("NACK (" +
               str(networkNack.getReason()) + ") while fetching certificate " +
-              certificateRequest._interest.getName().toUri())
+              interestName.toUri())
+            self._retry(self._pendingFetches.pop(interestName, []))
+
+        try:
+            self._face.expressInterest(
+              certificateRequest._interest, onData, onTimeout, onNetworkNack)
+        except Exception as ex:
+            for _, waiterState, _ in self._pendingFetches.pop(interestName, []):
+                waiterState.fail(ValidationError(
+                  ValidationError.CANNOT_RETRIEVE_CERTIFICATE,
+                  "Error in expressInterest: " + repr(ex)))
 
+    def _retry(self, waiters):
+        """
+        Fetch again for each waiter whose certificate request has retries left,
+        otherwise fail its validation state.
+
+        :param waiters: The list of (certificateRequest, state,
+          continueValidation) of the failed Interest.
+        :type waiters: list of tuple
+        """
+        for certificateRequest, state, continueValidation in waiters:
             certificateRequest._nRetriesLeft -= 1
             if certificateRequest._nRetriesLeft >= 0:
                 try:
@@ -103,9 +177,109 @@ class CertificateFetcherFromNetwork(CertificateFetcher):
                    "Cannot fetch certificate after all retries `" +
                    certificateRequest._interest.getName().toUri() + "`"))
 
+    def _prefetch(self, interestName):
+        """
+        If setPrefetchDepth was called, express an Interest for the key prefix
+        of each parent identity of the identity in the certificate or key name,
+        up to the prefetch depth or a parent with a known certificate.
+
+        :param Name interestName: The certificate or key name being fetched.
+        """
+        if self._prefetchDepth <= 0:
+            return
+
+        # Find the KEY component from the end since the identity may have one.
+        keyComponentIndex = -1
+        for i in range(interestName.size() - 1, -1, -1):
+            if interestName.get(i).equals(CertificateV2.KEY_COMPONENT):
+                keyComponentIndex = i
+                break
+        if keyComponentIndex < 0:
+            return
+        identityName = interestName.getPrefix(keyComponentIndex)
+
+        for depth in range(1, self._prefetchDepth + 1):
+            if depth >= identityName.size():
+                # Don't prefetch for the root identity.
+                break
+            keyPrefix = Name(identityName.getPrefix(-depth)).append(
+              CertificateV2.KEY_COMPONENT)
+
+            if (keyPrefix in self._pendingPrefetches or
+                self._certificateStorage.isCertificateKnown(keyPrefix)):
+                # The parents are fetched or known from here.
+                break
+
+            self._prefetchKeyPrefix(keyPrefix)
+
+    def _prefetchKeyPrefix(self, keyPrefix):
+        """
+        Express an Interest for any certificate with the key prefix and add a
+        fetched certificate to the unverified cache. Then continue each waiter
+        whose request matches the certificate, and fetch for the others.
+
+        :param Name keyPrefix: The key prefix /<identity>/KEY.
+        """
+        logging.getLogger(__name__).info("Prefetching certificate " +
+          keyPrefix.toUri())
+        self._pendingPrefetches[keyPrefix] = []
+
+        def fetchForWaiters(waiters, certificate):
+            for certificateRequest, state, continueValidation in waiters:
+                if (certificate != None and
+                    certificateRequest._interest.matchesData(certificate)):
+                    CertificateFetcherFromNetwork._continue(
+                      certificate, state, continueValidation)
+                else:
+                    # The guess was wrong, so fetch the requested certificate.
+                    self._doFetch(certificateRequest, state, continueValidation)
+
+        def onData(interest, data):
+            logging.getLogger(__name__).info("Prefetched certificate " +
+              data.getName().toUri())
+            waiters = self._pendingPrefetches.pop(keyPrefix, [])
+
+            try:
+                certificate = CertificateV2(data)
+            except Exception as ex:
+                logging.getLogger(__name__).info(
+                  "Prefetched a malformed certificate `" +
+                  data.getName().toUri() + "` (" + repr(ex) + ")")
+                certificate = None
+
+            if certificate != None:
+                self._certificateStorage.cacheUnverifiedCertificate(certificate)
+            fetchForWaiters(waiters, certificate)
+
+        def onTimeout(interest):
+            logging.getLogger(__name__).info(
+              "Timeout while prefetching certificate " + keyPrefix.toUri())
+            fetchForWaiters(self._pendingPrefetches.pop(keyPrefix, []), None)
+
+        def onNetworkNack(interest, networkNack):
+            logging.getLogger(__name__).info("NACK (" +
+              str(networkNack.getReason()) + ") while prefetching certificate " +
+              keyPrefix.toUri())
+            fetchForWaiters(self._pendingPrefetches.pop(keyPrefix, []), None)
+
+        interest = Interest(keyPrefix)
+        interest.setCanBePrefix(True)
         try:
-            self._face.expressInterest(
-              certificateRequest._interest, onData, onTimeout, onNetworkNack)
+            self._face.expressInterest(interest, onData, onTimeout, onNetworkNack)
+        except Exception as ex:
+            logging.getLogger(__name__).info(
+              "Error in expressInterest for prefetch: " + repr(ex))
+            fetchForWaiters(self._pendingPrefetches.pop(keyPrefix, []), None)
+
+    @staticmethod
+    def _continue(certificate, state, continueValidation):
+        """
+        Call continueValidation(certificate, state) and fail the state if it
+        raises an exception.
+        """
+        try:
+            continueValidation(certificate, state)
         except Exception as ex:
-            state.fail(ValidationError(ValidationError.CANNOT_RETRIEVE_CERTIFICATE,
-              "Error in expressInterest: " + repr(ex)))
+            state.fail(ValidationError
+              (ValidationError.CANNOT_RETRIEVE_CERTIFICATE,
+               "Error in continueValidation: " + repr(ex)))
@@ -50,6 +50,10 @@ class DataValidationState(ValidationState):
         self._data = Data(data)
         self._successCallback = successCallback
         self._failureCallback = failureCallback
+        # These are set by the Validator to insert the verified packet into its
+        # VerifiedDataCache.
+        self._verifiedDataCache = None
+        self._notAfterTime = None
 
         if self._successCallback == None:
             raise ValueError("The successCallback is None")
@@ -88,9 +92,37 @@ class DataValidationState(ValidationState):
         :param CertificateV2 trustedCertificate: The certificate that signs the
           original packet.
         """
-        if VerificationHelpers.verifyDataSignature(self._data, trustedCertificate):
+        self._finishVerifyOriginalPacket(
+          self._verifyOriginalSignature(trustedCertificate))
+
+    def _verifyOriginalSignature(self, trustedCertificate):
+        """
+        Verify the signature of the original packet without calling a callback.
+        This may be called from another thread. This is only called by the
+        Validator class.
+
+        :param CertificateV2 trustedCertificate: The certificate that signs the
+          original packet.
+        :return: True if the signature verifies, otherwise False.
+        :rtype: bool
+        """
+        return VerificationHelpers.verifyDataSignature(
+          self._data, trustedCertificate)
+
+    def _finishVerifyOriginalPacket(self, isVerified):
+        """
+        Call the success or failure callback with the result of
+        _verifyOriginalSignature. This is only called by the Validator class.
+
+        :param bool isVerified: True if the signature verified.
+        """
+        if isVerified:
             logging.getLogger(__name__).info("OK signature for data `" +
               self._data.getName().toUri() + "`")
+            if (self._verifiedDataCache != None and
+                self._notAfterTime != None):
+                self._verifiedDataCache.insert(self._data, self._notAfterTime)
+
             try:
                 self._successCallback(self._data)
             except:
@@ -96,8 +96,31 @@ class InterestValidationState(ValidationState):
         :param CertificateV2 trustedCertificate: The certificate that signs the
           original packet.
         """
-        if VerificationHelpers.verifyInterestSignature(
-              self._interest, trustedCertificate):
+        self._finishVerifyOriginalPacket(
+          self._verifyOriginalSignature(trustedCertificate))
+
+    def _verifyOriginalSignature(self, trustedCertificate):
+        """
+        Verify the signature of the original packet without calling a callback.
+        This may be called from another thread. This is only called by the
+        Validator class.
+
+        :param CertificateV2 trustedCertificate: The certificate that signs the
+          original packet.
+        :return: True if the signature verifies, otherwise False.
+        :rtype: bool
+        """
+        return VerificationHelpers.verifyInterestSignature(
+          self._interest, trustedCertificate)
+
+    def _finishVerifyOriginalPacket(self, isVerified):
+        """
+        Call the success or failure callback with the result of
+        _verifyOriginalSignature. This is only called by the Validator class.
+
+        :param bool isVerified: True if the signature verified.
+        """
+        if isVerified:
             logging.getLogger(__name__).info("OK signature for interest `" +
               self._interest.getName().toUri() + "`")
             for i in range(len(self._successCallbacks)):
@@ -28,6 +28,7 @@ Signed Interest validation and Data validation requests are delegated to an
 inner policy.
 """
 
+from collections import OrderedDict
 from pyndn.name import Name
 from pyndn.data import Data
 from pyndn.util.common import Common
@@ -55,7 +56,9 @@ class ValidationPolicyCommandInterest(ValidationPolicy):
             # Copy the Options.
             self._options = ValidationPolicyCommandInterest.Options(options)
 
-        self._container = [] # of ValidationPolicyCommandInterest.LastTimestampRecord
+        # Key name => ValidationPolicyCommandInterest.LastTimestampRecord, in
+        # the order last refreshed.
+        self._container = OrderedDict()
         self._nowOffsetMilliseconds = 0
 
         if innerPolicy == None:
@@ -176,11 +179,14 @@ class ValidationPolicyCommandInterest(ValidationPolicy):
         now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
         expiring = now - self._options._recordLifetime
 
-        while ((len(self._container) > 0 and
-                 self._container[0]._lastRefreshed <= expiring) or
-               (self._options._maxRecords >= 0 and
-                 len(self._container) > self._options._maxRecords)):
-            self._container.pop(0)
+        while len(self._container) > 0:
+            # The first record is the least recently refreshed.
+            oldestRecord = next(iter(self._container.values()))
+            if not (oldestRecord._lastRefreshed <= expiring or
+                    (self._options._maxRecords >= 0 and
+                     len(self._container) > self._options._maxRecords)):
+                break
+            self._container.popitem(last = False)
 
     @staticmethod
     def _parseCommandInterest(interest, state, keyLocatorName, timestamp):
@@ -237,9 +243,9 @@ class ValidationPolicyCommandInterest(ValidationPolicy):
               "Timestamp is outside the grace period for key " + keyName.toUri()))
             return False
 
-        index = self._findByKeyName(keyName)
-        if index >= 0:
-            if timestamp <= self._container[index]._timestamp:
+        record = self._container.get(keyName)
+        if record != None:
+            if timestamp <= record._timestamp:
                 state.fail(ValidationError(ValidationError.POLICY_ERROR,
                   "Timestamp is reordered for key " + keyName.toUri()))
                 return False
@@ -262,23 +268,6 @@ class ValidationPolicyCommandInterest(ValidationPolicy):
         newRecord = ValidationPolicyCommandInterest.LastTimestampRecord(
           keyName, timestamp, now)
 
-        index = self._findByKeyName(keyName)
-        if index >= 0:
-            # Remove the existing record so we can move it to the end.
-            self._container.pop(index)
-
-        self._container.append(newRecord)
-
-    def _findByKeyName(self, keyName):
-        """
-        Find the record in container_ which has the keyName.
-
-        :param Name keyName: The key name to search for.
-        :return: The index in container_ of the record, or -1 if not found.
-        :rtype: int
-        """
-        for i in range(len(self._container)):
-            if self._container[i]._keyName.equals(keyName):
-                return i
-
-        return -1
+        # Remove any existing record so that the new record moves to the end.
+        self._container.pop(newRecord._keyName, None)
+        self._container[newRecord._keyName] = newRecord
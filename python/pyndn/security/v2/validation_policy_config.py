@@ -39,6 +39,7 @@ from pyndn.security.v2.certificate_request import CertificateRequest
 from pyndn.security.v2.validation_error import ValidationError
 from pyndn.security.validator_config_error import ValidatorConfigError
 from pyndn.security.v2.validator_config.config_rule import ConfigRule
+from pyndn.security.v2.validator_config.config_rule_index import ConfigRuleIndex
 from pyndn.security.v2.validation_policy import ValidationPolicy
 
 class ValidationPolicyConfig(ValidationPolicy):
@@ -49,6 +50,12 @@ class ValidationPolicyConfig(ValidationPolicy):
         self._isConfigured = False
         self._dataRules = []     # of ConfigRule
         self._interestRules = [] # of ConfigRule
+        # These index the rules in _dataRules and _interestRules.
+        # Only cache the rule for an Interest name without the signature
+        # components, which repeats. A Data name is usually unique.
+        self._dataRuleIndex = ConfigRuleIndex()
+        self._interestRuleIndex = ConfigRuleIndex(
+          ConfigRuleIndex.DEFAULT_CACHE_CAPACITY)
 
     def load(self, filePathOrInputOrConfigSection, inputName = None):
         """
@@ -88,6 +95,8 @@ class ValidationPolicyConfig(ValidationPolicy):
                 self._shouldBypass = False
                 self._dataRules = []
                 self._interestRules = []
+                self._dataRuleIndex.clear()
+                self._interestRuleIndex.clear()
 
                 self._validator.resetAnchors()
                 self._validator.resetVerifiedCertificates()
@@ -106,8 +115,11 @@ class ValidationPolicyConfig(ValidationPolicy):
                 rule = ConfigRule.create(ruleList[i])
                 if rule.getIsForInterest():
                     self._interestRules.append(rule)
+                    self._interestRuleIndex.add(
+                      rule, rule.getRequiredPrefixes())
                 else:
                     self._dataRules.append(rule)
+                    self._dataRuleIndex.add(rule, rule.getRequiredPrefixes())
 
             # Get the trust anchors.
             trustAnchorList = validatorSection["trust-anchor"]
@@ -138,38 +150,67 @@ class ValidationPolicyConfig(ValidationPolicy):
         if isinstance(dataOrInterest, Data):
             data = dataOrInterest
 
-            for i in range(len(self._dataRules)):
-                rule = self._dataRules[i]
-
-                if rule.match(False, data.getName()):
-                    if rule.check(False, data.getName(), keyLocatorName, state):
-                        continueValidation(
-                          CertificateRequest(Interest(keyLocatorName)), state)
-                        return
-                    else:
-                        # rule.check failed and already called state.fail() .
-                        return
+            rule = self._findDataRule(data.getName())
+            if rule != None:
+                if rule.check(False, data.getName(), keyLocatorName, state):
+                    continueValidation(
+                      CertificateRequest(Interest(keyLocatorName)), state)
+                    return
+                else:
+                    # rule.check failed and already called state.fail() .
+                    return
 
             state.fail(ValidationError(ValidationError.POLICY_ERROR,
               "No rule matched for data `" + data.getName().toUri() + "`"))
         else:
             interest = dataOrInterest
 
-            for i in range(len(self._interestRules)):
-                rule = self._interestRules[i]
-
-                if rule.match(True, interest.getName()):
-                    if rule.check(True, interest.getName(), keyLocatorName, state):
-                        continueValidation(
-                          CertificateRequest(Interest(keyLocatorName)), state)
-                        return
-                    else:
-                        # rule.check failed and already called state.fail() .
-                        return
+            rule = self._findInterestRule(interest.getName())
+            if rule != None:
+                if rule.check(True, interest.getName(), keyLocatorName, state):
+                    continueValidation(
+                      CertificateRequest(Interest(keyLocatorName)), state)
+                    return
+                else:
+                    # rule.check failed and already called state.fail() .
+                    return
 
             state.fail(ValidationError(ValidationError.POLICY_ERROR,
               "No rule matched for interest `" + interest.getName().toUri() + "`"))
 
+    def _findDataRule(self, dataName):
+        """
+        Find the first data rule which matches the Data name.
+
+        :param Name dataName: The Data packet name.
+        :return: The matching rule, or None if not found.
+        :rtype: ConfigRule
+        """
+        return self._dataRuleIndex.find(
+          dataName, lambda rule: rule.match(False, dataName))
+
+    def _findInterestRule(self, interestName):
+        """
+        Find the first interest rule which matches the signed Interest name.
+
+        :param Name interestName: The signed Interest name.
+        :return: The matching rule, or None if not found.
+        :rtype: ConfigRule
+        """
+        signedInterestMinSize = 2
+        if interestName.size() < signedInterestMinSize:
+            # Only a rule without filters can match, so don't use the index
+            # which is keyed by the name without the signature components.
+            for rule in self._interestRules:
+                if rule.match(True, interestName):
+                    return rule
+            return None
+
+        # The filters only check the name without the signature components.
+        return self._interestRuleIndex.find(
+          interestName.getPrefix(-signedInterestMinSize),
+          lambda rule: rule.match(True, interestName))
+
     def _processConfigTrustAnchor(self, configSection, inputName):
         """
         Process the trust-anchor configuration section and call
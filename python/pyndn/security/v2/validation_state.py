@@ -50,6 +50,9 @@ class ValidationState(object):
         self._seenCertificateNames = set()  # of Name
         self._hasOutcome = False
         self._outcome = False
+        # This is set by Validator.validateBatch to defer verifying the
+        # original packet.
+        self._validationBatch = None
 
     def hasOutcome(self):
         """
@@ -149,6 +152,30 @@ class ValidationState(object):
         raise RuntimeError(
           "ValidationState._verifyOriginalPacket is not implemented")
 
+    def _verifyOriginalSignature(self, trustedCertificate):
+        """
+        Verify the signature of the original packet without calling a callback.
+        This may be called from another thread. This is only called by the
+        Validator class.
+
+        :param CertificateV2 trustedCertificate: The certificate that signs the
+          original packet.
+        :return: True if the signature verifies, otherwise False.
+        :rtype: bool
+        """
+        raise RuntimeError(
+          "ValidationState._verifyOriginalSignature is not implemented")
+
+    def _finishVerifyOriginalPacket(self, isVerified):
+        """
+        Call the success or failure callback with the result of
+        _verifyOriginalSignature. This is only called by the Validator class.
+
+        :param bool isVerified: True if the signature verified.
+        """
+        raise RuntimeError(
+          "ValidationState._finishVerifyOriginalPacket is not implemented")
+
     def _bypassValidation(self):
         """
         Call the success callback of the original packet without signature
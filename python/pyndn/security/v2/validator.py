@@ -45,6 +45,11 @@ certificates.
 
 import logging
 from pyndn.data import Data
+from pyndn.interest import Interest
+from pyndn.key_locator import KeyLocator, KeyLocatorType
+from pyndn.encoding.wire_format import WireFormat
+from pyndn.security.v2.certificate_v2 import CertificateV2
+from pyndn.security.v2.certificate_request import CertificateRequest
 from pyndn.security.v2.validation_error import ValidationError
 from pyndn.security.v2.data_validation_state import DataValidationState
 from pyndn.security.v2.interest_validation_state import InterestValidationState
@@ -70,6 +75,7 @@ class Validator(CertificateStorage):
         self._policy = policy
         self._certificateFetcher = certificateFetcher
         self._maxDepth = 25
+        self._verifiedDataCache = None
 
         if self._policy == None:
             raise RuntimeError("The policy is None")
@@ -114,6 +120,42 @@ class Validator(CertificateStorage):
         """
         return self._maxDepth
 
+    def setVerifiedDataCache(self, verifiedDataCache):
+        """
+        Set the cache of verified Data packets. When a Data packet's signature
+        is verified, its full name is added to the cache until the earliest
+        NotAfter time of the certificates in its chain. When validating a Data
+        packet with the same full name (so that it is byte-identical), call the
+        success callback without checking the policy or the signature again.
+
+        :param VerifiedDataCache verifiedDataCache: The VerifiedDataCache, or
+          None to not use a cache (the default).
+        """
+        self._verifiedDataCache = verifiedDataCache
+
+    def getVerifiedDataCache(self):
+        """
+        Get the cache of verified Data packets given to setVerifiedDataCache.
+
+        :return: The VerifiedDataCache, or None if not using a cache.
+        :rtype: VerifiedDataCache
+        """
+        return self._verifiedDataCache
+
+    def setCertificateRefreshAhead(self, refreshAheadMilliseconds):
+        """
+        Set the time before a frequently used certificate is removed from the
+        verified certificate cache when the Validator fetches the certificate
+        again with the certificate fetcher, validates it and caches it. The
+        cached certificate is used until then, so that validation does not
+        wait for the fetch.
+
+        :param float refreshAheadMilliseconds: The time before the removal time
+          in milliseconds, or None to not refresh certificates (the default).
+        """
+        self._verifiedCertificateCache.setRefreshAhead(
+          refreshAheadMilliseconds, self._refreshCertificate)
+
     def validate(self, dataOrInterest, successCallback, failureCallback):
         """
         Asynchronously validate the Data or Interest packet.
@@ -129,14 +171,68 @@ class Validator(CertificateStorage):
           ValidationError.
         :type failureCallback: function object
         """
+        self._validateState(
+          dataOrInterest, self._makeState(
+            dataOrInterest, successCallback, failureCallback))
+
+    def validateBatch(self, packets, onEach, onDone, executor = None):
+        """
+        Asynchronously validate a list of Data or Interest packets. The packets
+        are grouped by KeyLocator name. The first packet of each group is
+        validated first so that its certificate chain is fetched and cached
+        once, and then the rest of the group is validated with the cached
+        chain. When the certificate chain of every packet has been checked,
+        the signatures of the packets are verified together, using the
+        executor if given, and then this calls onEach for them. Packets which
+        fail before signature verification are reported when they fail.
+
+        :param packets: The Data or Interest packets to validate. These are
+          not copied, and onEach is called with the same objects, so you must
+          not modify them until onDone is called.
+        :type packets: list of Data or Interest
+        :param onEach: For each packet, this calls onEach(dataOrInterest, error)
+          where error is None on validation success, or a ValidationError.
+        :type onEach: function object
+        :param onDone: After onEach is called for every packet, this calls
+          onDone().
+        :type onDone: function object
+        :param executor: (optional) An executor such as a
+          concurrent.futures.ThreadPoolExecutor with a submit method, used to
+          verify the signatures in parallel. (The cryptography library releases
+          the GIL while verifying.) If omitted or None, verify on the calling
+          thread.
+        """
+        _ValidationBatch(self, packets, onEach, onDone, executor).start()
+
+    def _makeState(self, dataOrInterest, successCallback, failureCallback):
+        """
+        Create a DataValidationState or InterestValidationState for the packet.
+        """
         if isinstance(dataOrInterest, Data):
             state = DataValidationState(
               dataOrInterest, successCallback, failureCallback)
+            state._verifiedDataCache = self._verifiedDataCache
+            return state
+        else:
+            return InterestValidationState(
+              dataOrInterest, successCallback, failureCallback)
+
+    def _validateState(self, dataOrInterest, state):
+        """
+        Start validating the packet with the state from _makeState.
+        """
+        if isinstance(dataOrInterest, Data):
+            if (self._verifiedDataCache != None and
+                self._verifiedDataCache.contains(dataOrInterest)):
+                logging.getLogger(__name__).info(
+                  "Found data in the verified data cache " +
+                  dataOrInterest.getName().toUri())
+                state._finishVerifyOriginalPacket(True)
+                return
+
             logging.getLogger(__name__).info("Start validating data " +
               dataOrInterest.getName().toUri())
         else:
-            state = InterestValidationState(
-              dataOrInterest, successCallback, failureCallback)
             logging.getLogger(__name__).info("Start validating interest " +
               dataOrInterest.getName().toUri())
 
@@ -202,14 +298,225 @@ class Validator(CertificateStorage):
             logging.getLogger(__name__).info("Found trusted certificate " +
               certificate.getName().toUri())
 
-            certificate = state._verifyCertificateChain(certificate)
-            if certificate != None:
-                state._verifyOriginalPacket(certificate)
+            trustedCertificate = certificate
+            certificate = state._verifyCertificateChain(trustedCertificate)
 
+            # Cache the verified chain before verifying the original packet so
+            # that a batch can validate other packets with it.
             for i in range(len(state._certificateChain)):
                 self.cacheVerifiedCertificate(state._certificateChain[i])
 
+            if certificate != None:
+                if isinstance(state, DataValidationState):
+                    # The verified packet can be cached until the first
+                    # certificate in the chain expires.
+                    state._notAfterTime = \
+                      trustedCertificate.getValidityPeriod().getNotAfter()
+                    for chainCertificate in state._certificateChain:
+                        state._notAfterTime = min(state._notAfterTime,
+                          chainCertificate.getValidityPeriod().getNotAfter())
+
+                if state._validationBatch != None:
+                    state._validationBatch.addVerification(state, certificate)
+                else:
+                    state._verifyOriginalPacket(certificate)
+
             return
 
         self._certificateFetcher.fetch(
           certificateRequest, state, self._validateCertificate)
+
+    def _refreshCertificate(self, certificate):
+        """
+        Fetch the certificate for the key name of the verified certificate,
+        validate it and add it to the verified certificate cache. This is the
+        onRefresh callback of the verified certificate cache.
+
+        :param CertificateV2 certificate: The verified certificate to refresh.
+        """
+        def onFailure(data, error):
+            logging.getLogger(__name__).info("Cannot refresh certificate " +
+              certificate.getName().toUri() + ": " + str(error))
+
+        def onSuccess(data):
+            self.cacheVerifiedCertificate(CertificateV2(data))
+
+        def continueRefresh(fetchedCertificate, state):
+            if not fetchedCertificate.isValid():
+                state.fail(ValidationError(ValidationError.EXPIRED_CERTIFICATE,
+                   "Retrieved certificate is not yet valid or expired `" +
+                   fetchedCertificate.getName().toUri() + "`"))
+                return
+
+            self.validate(fetchedCertificate, onSuccess, onFailure)
+
+        # The state is only used to report a failure to fetch.
+        state = DataValidationState(certificate, onSuccess, onFailure)
+        self._certificateFetcher.fetch(
+          CertificateRequest(Interest(certificate.getKeyName())), state,
+          continueRefresh)
+
+class _ValidationBatch(object):
+    """
+    A _ValidationBatch holds the state of one call to Validator.validateBatch.
+    Each packet is "settled" when it has an outcome or is waiting for signature
+    verification. When all packets are settled, verify the waiting signatures.
+
+    :param Validator validator: The Validator.
+    :param packets: The packets given to validateBatch.
+    :param onEach: The onEach callback given to validateBatch.
+    :param onDone: The onDone callback given to validateBatch.
+    :param executor: The executor given to validateBatch, or None.
+    """
+    def __init__(self, validator, packets, onEach, onDone, executor):
+        self._validator = validator
+        self._packets = packets
+        self._onEach = onEach
+        self._onDone = onDone
+        self._executor = executor
+        self._nUnsettled = len(packets)
+        self._settledStates = set()
+        # The key is the state of the first packet of a group. The value is the
+        # list of the other packets in the group.
+        self._followers = {}
+        # The list of (state, certificate) to verify.
+        self._verifications = []
+
+    def start(self):
+        if len(self._packets) == 0:
+            self._callOnDone()
+            return
+
+        # Group the packets by KeyLocator name, keeping the order.
+        groups = []
+        groupByKeyName = {}
+        for packet in self._packets:
+            keyName = _ValidationBatch._getKeyName(packet)
+            if keyName == None:
+                # Let the policy report the error.
+                groups.append([packet])
+            elif keyName in groupByKeyName:
+                groupByKeyName[keyName].append(packet)
+            else:
+                group = [packet]
+                groupByKeyName[keyName] = group
+                groups.append(group)
+
+        for group in groups:
+            self._validate(group[0], group[1:])
+
+    def addVerification(self, state, certificate):
+        """
+        Add the state to verify the original packet with the certificate after
+        all packets are settled. This is called by Validator.
+
+        :param ValidationState state: The state of a packet in this batch.
+        :param CertificateV2 certificate: The trusted certificate to verify the
+          original packet.
+        """
+        self._verifications.append((state, certificate))
+        self._settle(state)
+
+    def _validate(self, packet, followers):
+        """
+        Start validating the packet, then validate the followers after it is
+        settled.
+        """
+        # The callbacks need the state, which is made after them.
+        stateHolder = []
+        def onSuccess(validatedPacket):
+            self._callOnEach(validatedPacket, None)
+            self._settle(stateHolder[0])
+        def onFailure(failedPacket, error):
+            self._callOnEach(failedPacket, error)
+            self._settle(stateHolder[0])
+
+        state = self._validator._makeState(packet, onSuccess, onFailure)
+        state._validationBatch = self
+        stateHolder.append(state)
+        self._followers[state] = followers
+        self._validator._validateState(packet, state)
+
+    def _settle(self, state):
+        if state in self._settledStates:
+            # Already settled, e.g. this is the callback after verification.
+            return
+        self._settledStates.add(state)
+
+        # Now the certificate chain is cached, so validate the rest of the group.
+        # Do this before decrementing so that only the outermost call verifies.
+        for packet in self._followers.pop(state, []):
+            self._validate(packet, [])
+
+        self._nUnsettled -= 1
+        if self._nUnsettled == 0:
+            self._verifyAll()
+
+    def _verifyAll(self):
+        """
+        Verify the signatures of the packets which are waiting, call their
+        callbacks, then call onDone.
+        """
+        verifications = self._verifications
+        self._verifications = []
+
+        if self._executor != None:
+            futures = [self._executor.submit(
+                         _ValidationBatch._verify, state, certificate)
+                       for state, certificate in verifications]
+            results = [future.result() for future in futures]
+        else:
+            results = [_ValidationBatch._verify(state, certificate)
+                       for state, certificate in verifications]
+
+        for i in range(len(verifications)):
+            verifications[i][0]._finishVerifyOriginalPacket(results[i])
+
+        self._callOnDone()
+
+    @staticmethod
+    def _verify(state, certificate):
+        try:
+            return state._verifyOriginalSignature(certificate)
+        except:
+            logging.exception("Error in verifying the signature")
+            return False
+
+    def _callOnEach(self, packet, error):
+        try:
+            self._onEach(packet, error)
+        except:
+            logging.exception("Error in onEach")
+
+    def _callOnDone(self):
+        try:
+            self._onDone()
+        except:
+            logging.exception("Error in onDone")
+
+    @staticmethod
+    def _getKeyName(dataOrInterest):
+        """
+        Get the KeyLocator name of the packet for grouping.
+
+        :return: The KeyLocator name, or None if the packet doesn't have one.
+        :rtype: Name
+        """
+        try:
+            if isinstance(dataOrInterest, Data):
+                signature = dataOrInterest.getSignature()
+            else:
+                name = dataOrInterest.getName()
+                if name.size() < 2:
+                    return None
+                signature = WireFormat.getDefaultWireFormat().decodeSignatureInfoAndValue(
+                  name.get(-2).getValue().buf(), name.get(-1).getValue().buf())
+
+            if not KeyLocator.canGetFromSignature(signature):
+                return None
+            keyLocator = KeyLocator.getFromSignature(signature)
+            if keyLocator.getType() != KeyLocatorType.KEYNAME:
+                return None
+            return keyLocator.getKeyName()
+        except:
+            return None
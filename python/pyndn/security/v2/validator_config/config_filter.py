@@ -83,6 +83,16 @@ class ConfigFilter(object):
         """
         raise RuntimeError("ConfigFilter.matchName is not implemented")
 
+    def getRequiredPrefix(self):
+        """
+        Get the name prefix which a packet name must have to match this filter.
+
+        :return: The required name prefix, or None if this filter can match any
+          packet name. You must not change the Name object.
+        :rtype: Name
+        """
+        return None
+
     @staticmethod
     def _createNameFilter(configSection):
         """
@@ -151,6 +161,17 @@ class ConfigRelationNameFilter(ConfigFilter):
         return ConfigNameRelation.checkNameRelation(
           self._relation, self._name, packetName)
 
+    def getRequiredPrefix(self):
+        """
+        Get the name prefix which a packet name must have to match this filter.
+        Every relation requires the packet name to have the relation name as a
+        prefix.
+
+        :return: The relation name. You must not change the Name object.
+        :rtype: Name
+        """
+        return self._name
+
 class ConfigRegexNameFilter(ConfigFilter):
     """
     ConfigRegexNameFilter extends ConfigFilter to check that the packet name
@@ -110,6 +110,29 @@ class ConfigRule(object):
 
         return result
 
+    def getRequiredPrefixes(self):
+        """
+        Get the name prefixes of which a packet name must have at least one to
+        match the rule's filters. (For a signed interest, this is the name
+        without the last two components.)
+
+        :return: The list of name prefixes, or None if the rule can match any
+          packet name.
+        :rtype: list of Name
+        """
+        if len(self._filters) == 0:
+            return None
+
+        prefixes = []
+        for filter in self._filters:
+            prefix = filter.getRequiredPrefix()
+            if prefix == None:
+                # One filter can match any name, so the rule can.
+                return None
+            prefixes.append(prefix)
+
+        return prefixes
+
     def check(self, isForInterest, packetName, keyLocatorName, state):
         """
         Check if the packet satisfies the rule's condition.
@@ -0,0 +1,141 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the ConfigRuleIndex class which finds the first rule of a
+validator configuration that matches a packet name. It is used by
+ValidationPolicyConfig and ConfigPolicyManager.
+"""
+
+from collections import OrderedDict
+from pyndn.name import Name
+
+class ConfigRuleIndex(object):
+    """
+    Create an empty ConfigRuleIndex. A rule is added with the name prefixes
+    which a packet name must have to match the rule, for example the names of
+    the rule's relation filters. To find the matching rule for a packet name,
+    only the rules with one of these prefixes, or with no required prefix, are
+    checked. If cacheCapacity is given, the result is cached for the packet
+    name, evicting the least recently used name when the number of names
+    exceeds the cache capacity. Only use a cache for names which repeat, such as
+    signed Interest names without the signature components. A Data name is
+    usually unique, for example with a segment number, so caching it only adds
+    the cost of inserting and evicting.
+
+    :param int cacheCapacity: (optional) The maximum number of packet names
+      for which to cache the matching rule, for example
+      ConfigRuleIndex.DEFAULT_CACHE_CAPACITY. If omitted or 0, don't cache.
+    """
+    def __init__(self, cacheCapacity = 0):
+        self._cacheCapacity = cacheCapacity
+        self._rules = []
+        # The indexes in _rules of the rules with no required prefix.
+        self._anyNameIndexes = []
+        # Name prefix => list of indexes in _rules.
+        self._indexesByPrefix = {}
+        # The set of the sizes of the keys in _indexesByPrefix.
+        self._prefixSizes = set()
+        # Packet name => (rule,) where rule is None if no rule matches, in
+        # least recently used order.
+        self._cache = OrderedDict()
+
+    DEFAULT_CACHE_CAPACITY = 1000
+
+    def add(self, rule, prefixes):
+        """
+        Add the rule after the rules already added.
+
+        :param object rule: The rule, which is returned by find().
+        :param prefixes: The name prefixes of which a packet name must have at
+          least one to match the rule, or None if the rule can match any name.
+        :type prefixes: list of Name
+        """
+        index = len(self._rules)
+        self._rules.append(rule)
+        self._cache.clear()
+
+        if prefixes == None:
+            self._anyNameIndexes.append(index)
+            return
+
+        for prefix in prefixes:
+            # Copy the Name.
+            prefix = Name(prefix)
+            if prefix in self._indexesByPrefix:
+                self._indexesByPrefix[prefix].append(index)
+            else:
+                self._indexesByPrefix[prefix] = [index]
+                self._prefixSizes.add(prefix.size())
+
+    def find(self, packetName, matches):
+        """
+        Find the first added rule which matches the packet name.
+
+        :param Name packetName: The packet name to match. This is the cache key,
+          so the result of matches(rule) must only depend on it.
+        :param matches: This calls matches(rule) for each candidate rule in the
+          order they were added, which returns True if the rule matches.
+        :type matches: function object
+        :return: The first matching rule, or None if no rule matches.
+        :rtype: object
+        """
+        if self._cacheCapacity > 0:
+            value = self._cache.pop(packetName, None)
+            if value != None:
+                # Re-insert to make this the most recently used.
+                self._cache[packetName] = value
+                return value[0]
+
+        candidates = list(self._anyNameIndexes)
+        for size in self._prefixSizes:
+            if size <= packetName.size():
+                candidates.extend(self._indexesByPrefix.get(
+                  packetName.getPrefix(size), []))
+        candidates.sort()
+
+        result = None
+        previousIndex = -1
+        for index in candidates:
+            if index == previousIndex:
+                # A rule with more than one matching prefix.
+                continue
+            previousIndex = index
+
+            if matches(self._rules[index]):
+                result = self._rules[index]
+                break
+
+        if self._cacheCapacity > 0:
+            # Copy the Name.
+            self._cache[Name(packetName)] = (result,)
+            while len(self._cache) > self._cacheCapacity:
+                self._cache.popitem(last = False)
+
+        return result
+
+    def clear(self):
+        """
+        Remove all rules and cached results.
+        """
+        self._rules = []
+        self._anyNameIndexes = []
+        self._indexesByPrefix = {}
+        self._prefixSizes = set()
+        self._cache.clear()
@@ -0,0 +1,173 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the VerifiedDataCache class which remembers the full names
+of Data packets whose signatures are already verified, so that validating a
+byte-identical packet again can skip the signature verification. Because the
+full name ends with the implicit SHA-256 digest of the wire encoding, a packet
+with the same full name has the same signature bits. An entry is removed no
+later than the NotAfter time of the certificates used to verify the packet, or
+maxLifetime after it has been added to the cache.
+"""
+
+import sys
+from collections import OrderedDict
+from pyndn.util.common import Common
+
+class VerifiedDataCache(object):
+    """
+    Create a VerifiedDataCache.
+
+    :param float maxLifetimeMilliseconds: (optional) The maximum time that an
+      entry can live inside the cache, in milliseconds. If omitted use
+      getDefaultLifetime().
+    :param int capacity: (optional) The maximum number of entries. When the
+      cache is full, inserting removes the entry which was added first. If
+      omitted use getDefaultCapacity().
+    """
+    def __init__(self, maxLifetimeMilliseconds = None, capacity = None):
+        if maxLifetimeMilliseconds == None:
+            maxLifetimeMilliseconds = VerifiedDataCache.getDefaultLifetime()
+        if capacity == None:
+            capacity = VerifiedDataCache.getDefaultCapacity()
+
+        # Full Name => removal time in milliseconds, in the order added.
+        self._removalTimes = OrderedDict()
+
+        self._nextRefreshTime = sys.float_info.max
+        self._maxLifetimeMilliseconds = maxLifetimeMilliseconds
+        self._capacity = capacity
+        self._nowOffsetMilliseconds = 0
+
+    def insert(self, data, notAfterTime = None):
+        """
+        Record that the signature of the Data packet is verified. The entry will
+        be removed no later than notAfterTime, or maxLifetimeMilliseconds given
+        to the constructor.
+
+        :param Data data: The verified Data packet. This uses
+          data.getFullName().
+        :param float notAfterTime: (optional) The earliest NotAfter time of the
+          certificates used to verify the packet, as milliseconds since Jan 1,
+          1970 UTC. If omitted or None, only use maxLifetimeMilliseconds.
+        """
+        if self._capacity <= 0:
+            return
+
+        # _nowOffsetMilliseconds is only used for testing.
+        now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
+        removalTime = now + self._maxLifetimeMilliseconds
+        if notAfterTime != None:
+            if notAfterTime <= now:
+                return
+            removalTime = min(removalTime, notAfterTime)
+
+        fullName = data.getFullName()
+        # Remove first so that a replaced entry moves to the end.
+        self._removalTimes.pop(fullName, None)
+        while len(self._removalTimes) >= self._capacity:
+            self._removalTimes.popitem(last = False)
+        self._removalTimes[fullName] = removalTime
+
+        if removalTime < self._nextRefreshTime:
+            # We need to run _refresh() sooner.
+            self._nextRefreshTime = removalTime
+
+    def contains(self, data):
+        """
+        Check if the signature of a Data packet with the same full name has
+        been verified and the entry has not expired.
+
+        :param Data data: The Data packet to check. This uses
+          data.getFullName().
+        :return: True if the packet is in the cache.
+        :rtype: bool
+        """
+        if len(self._removalTimes) == 0:
+            return False
+
+        self._refresh()
+        return data.getFullName() in self._removalTimes
+
+    def size(self):
+        """
+        Get the number of entries in the cache, including expired entries which
+        have not yet been removed.
+
+        :return: The number of entries.
+        :rtype: int
+        """
+        return len(self._removalTimes)
+
+    def clear(self):
+        """
+        Clear all entries from the cache.
+        """
+        self._removalTimes = OrderedDict()
+        self._nextRefreshTime = sys.float_info.max
+
+    @staticmethod
+    def getDefaultLifetime():
+        """
+        Get the default maximum lifetime (1 hour).
+
+        :return: The lifetime in milliseconds.
+        :rtype: float
+        """
+        return 3600.0 * 1000
+
+    @staticmethod
+    def getDefaultCapacity():
+        """
+        Get the default maximum number of entries (10000).
+
+        :return: The capacity.
+        :rtype: int
+        """
+        return 10000
+
+    def _setNowOffsetMilliseconds(self, nowOffsetMilliseconds):
+        """
+        Set the offset when insert() and _refresh() get the current time, which
+        should only be used for testing.
+
+        :param float nowOffsetMilliseconds: The offset in milliseconds.
+        """
+        self._nowOffsetMilliseconds = nowOffsetMilliseconds
+
+    def _refresh(self):
+        """
+        Remove all expired entries.
+        """
+        # _nowOffsetMilliseconds is only used for testing.
+        now = Common.getNowMilliseconds() + self._nowOffsetMilliseconds
+        if now < self._nextRefreshTime:
+            return
+
+        # We recompute _nextRefreshTime.
+        nextRefreshTime = sys.float_info.max
+        for fullName in list(self._removalTimes.keys()):
+            removalTime = self._removalTimes[fullName]
+            if removalTime <= now:
+                del self._removalTimes[fullName]
+            else:
+                nextRefreshTime = min(nextRefreshTime, removalTime)
+
+        self._nextRefreshTime = nextRefreshTime
@@ -23,6 +23,8 @@ This module defines the VerificationHelpers which has static methods to verify
 signatures and digests.
 """
 
+import threading
+from collections import OrderedDict
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import padding, ec
 from cryptography.hazmat.primitives.serialization import load_der_public_key
@@ -39,7 +41,9 @@ class VerificationHelpers(object):
     def verifySignature(buffer, signature, publicKey,
           digestAlgorithm = DigestAlgorithm.SHA256):
         """
-        Verify the buffer against the signature using the public key.
+        Verify the buffer against the signature using the public key. The
+        loaded public key is cached by its DER so that it is only parsed once
+        (see setPublicKeyCacheCapacity).
 
         :param buffer: The input buffer to verify.
         :type buffer: Blob or an object which is the same as the bytes() operator
@@ -64,20 +68,13 @@ class VerificationHelpers(object):
             buffer = buffer.toBytes()
         if isinstance(signature, Blob):
             signature = signature.toBytes()
-        if not isinstance(publicKey, PublicKey):
-            # Turn publicKey into a PublicKey object.
-            if not isinstance(publicKey, Blob):
-                publicKey = Blob(publicKey)
-            publicKey = PublicKey(publicKey)
+        keyType, cryptoPublicKey = VerificationHelpers._publicKeyCache.get(
+          publicKey)
 
         if digestAlgorithm == DigestAlgorithm.SHA256:
-            if publicKey.getKeyType() == KeyType.RSA:
-                # Get the public key.
-                try:
-                    cryptoPublicKey = load_der_public_key(
-                      publicKey.getKeyDer().toBytes(),
-                      backend = default_backend())
-                except:
+            if keyType == KeyType.RSA:
+                if cryptoPublicKey == None:
+                    # The key DER couldn't be loaded.
                     return False
 
                 try:
@@ -86,13 +83,8 @@ class VerificationHelpers(object):
                     return True
                 except:
                     return False
-            elif publicKey.getKeyType() == KeyType.EC:
-                # Get the public key.
-                try:
-                    cryptoPublicKey = load_der_public_key(
-                      publicKey.getKeyDer().toBytes(),
-                      backend = default_backend())
-                except:
+            elif keyType == KeyType.EC:
+                if cryptoPublicKey == None:
                     return False
 
                 try:
@@ -106,6 +98,21 @@ class VerificationHelpers(object):
         else:
             raise ValueError("verifySignature: Invalid digest algorithm")
 
+    @staticmethod
+    def setPublicKeyCacheCapacity(capacity):
+        """
+        Set the maximum number of loaded public keys which verifySignature
+        keeps, evicting the least recently used. The cache is shared by all
+        verification, including verifyDataSignature, verifyInterestSignature,
+        the policy managers and the Validator. The default capacity is
+        VerificationHelpers.DEFAULT_PUBLIC_KEY_CACHE_CAPACITY.
+
+        :param int capacity: The maximum number of keys, or 0 to not cache.
+        """
+        VerificationHelpers._publicKeyCache.setCapacity(capacity)
+
+    DEFAULT_PUBLIC_KEY_CACHE_CAPACITY = 1000
+
     @staticmethod
     def verifyDataSignature(
       data, publicKeyOrCertificate, digestAlgorithm = None, wireFormat = None):
@@ -262,3 +269,83 @@ class VerificationHelpers(object):
               interest.getName().get(-1).getValue().buf(), False)
         except:
             return None
+
+
+class _PublicKeyCache(object):
+    """
+    A _PublicKeyCache maps the public key DER to the key type and the loaded
+    cryptography public key object, so that verifying many packets with the
+    same key doesn't parse the DER each time. This evicts the least recently
+    used key when the number of keys exceeds the capacity. The methods are
+    thread-safe.
+
+    :param int capacity: The maximum number of keys.
+    """
+    def __init__(self, capacity):
+        self._capacity = capacity
+        # The key is the DER bytes. The value is (keyType, cryptoPublicKey)
+        # where cryptoPublicKey is None if the DER can't be loaded.
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, publicKey):
+        """
+        Get the key type and loaded public key, loading and caching it if
+        needed.
+
+        :param publicKey: The object containing the public key, or the public
+          key DER which is used to make the PublicKey object.
+        :type publicKey: PublicKey or Blob or  an object which is the same as
+          the bytes() operator
+        :return: The tuple (keyType, cryptoPublicKey) where cryptoPublicKey is
+          None if the DER can't be loaded.
+        :rtype: (int from KeyType, object)
+        :raises UnrecognizedKeyFormatException: If the key type can't be
+          decoded from the DER.
+        """
+        if isinstance(publicKey, PublicKey):
+            keyDer = publicKey.getKeyDer()
+        elif isinstance(publicKey, Blob):
+            keyDer = publicKey
+        else:
+            keyDer = Blob(publicKey)
+        keyDerBytes = keyDer.toBytes()
+
+        with self._lock:
+            value = self._keys.pop(keyDerBytes, None)
+            if value != None:
+                # Re-insert to make this the most recently used.
+                self._keys[keyDerBytes] = value
+                return value
+
+        if not isinstance(publicKey, PublicKey):
+            # This raises an exception for an unrecognized key type.
+            publicKey = PublicKey(keyDer)
+        try:
+            cryptoPublicKey = load_der_public_key(
+              keyDerBytes, backend = default_backend())
+        except:
+            cryptoPublicKey = None
+        value = (publicKey.getKeyType(), cryptoPublicKey)
+
+        with self._lock:
+            if self._capacity > 0:
+                self._keys[keyDerBytes] = value
+                while len(self._keys) > self._capacity:
+                    self._keys.popitem(last = False)
+
+        return value
+
+    def setCapacity(self, capacity):
+        """
+        Set the maximum number of keys and evict keys to fit.
+
+        :param int capacity: The maximum number of keys, or 0 to not cache.
+        """
+        with self._lock:
+            self._capacity = capacity
+            while len(self._keys) > max(0, capacity):
+                self._keys.popitem(last = False)
+
+VerificationHelpers._publicKeyCache = _PublicKeyCache(
+  VerificationHelpers.DEFAULT_PUBLIC_KEY_CACHE_CAPACITY)
@@ -24,9 +24,20 @@ Invertible Bloom Lookup Table (IBLT) (Invertible Bloom Filter). This is used by
 FullPSync2017.
 """
 
+import sys
+import struct
 import zlib
+from array import array
 from pyndn.util.blob import Blob
-from pyndn.util.common import Common
+have_mmh3 = True
+try:
+    import mmh3
+except ImportError:
+    have_mmh3 = False
+
+# The array typecodes for signed and unsigned 32-bit integers.
+_INT32 = 'i' if array('i').itemsize == 4 else 'l'
+_UINT32 = 'I' if array('I').itemsize == 4 else 'L'
 
 class InvertibleBloomLookupTable(object):
     """
@@ -36,17 +47,21 @@ class InvertibleBloomLookupTable(object):
     InvertibleBloomLookupTable(iblt) - Create an
     InvertibleBloomLookupTable as a copy of the given iblt.
 
+    The hash table is stored as three arrays of 32-bit integers for the count,
+    keySum and keyCheck of the entries, so that copying, comparing and
+    encoding a table don't use a Python object for each entry.
+
     :param int expectedNEntries: the expected number of entries in the IBLT.
     :param InvertibleBloomLookupTable iblt: The other
       InvertibleBloomLookupTable to copy.
     """
     def __init__(self, value):
         if isinstance(value, InvertibleBloomLookupTable):
-            # Make a deep copy the _hashTable array.
-            self._hashTable = [None] * len(value._hashTable)
-            for i in range(len(value._hashTable)):
-                self._hashTable[i] = InvertibleBloomLookupTable._HashTableEntry(
-                  value._hashTable[i])
+            # Copy the arrays.
+            self._counts = array(_INT32, value._counts)
+            self._keySums = array(_UINT32, value._keySums)
+            self._keyChecks = array(_UINT32, value._keyChecks)
+            self._encoding = value._encoding
         else:
             expectedNEntries = value
             # 1.5 times the expected number of entries gives a very low probability
@@ -57,10 +72,11 @@ class InvertibleBloomLookupTable(object):
             if remainder != 0:
                 nEntries += (InvertibleBloomLookupTable.N_HASH - remainder);
 
-            # initialize() will set the elements.
-            self._hashTable = [None] * nEntries  # of _HashTableEntry
-            for i in range(len(self._hashTable)):
-                self._hashTable[i] = InvertibleBloomLookupTable._HashTableEntry()
+            self._counts = array(_INT32, [0]) * nEntries
+            self._keySums = array(_UINT32, [0]) * nEntries
+            self._keyChecks = array(_UINT32, [0]) * nEntries
+            # The Blob from encode(), or None if the table has changed.
+            self._encoding = None
 
     def initialize(self, encoding):
         """
@@ -73,16 +89,24 @@ class InvertibleBloomLookupTable(object):
         """
         values = InvertibleBloomLookupTable._decode(encoding)
 
-        if 3 * len(self._hashTable) != len(values):
+        if 3 * len(self._counts) != len(values):
             raise RuntimeError(
               "The received Invertible Bloom Filter cannot be decoded")
 
-        for i in range(len(self._hashTable)):
-            entry = self._hashTable[i]
-            if values[i * 3] != 0:
-                entry._count = values[i * 3]
-                entry._keySum = values[(i * 3) + 1]
-                entry._keyCheck = values[(i * 3) + 2]
+        counts = InvertibleBloomLookupTable._convert(values[0::3], _INT32)
+        keySums = values[1::3]
+        keyChecks = values[2::3]
+        # As in PSync, only set the entries whose received count is not zero.
+        for i in range(len(counts)):
+            if counts[i] == 0:
+                keySums[i] = self._keySums[i]
+                keyChecks[i] = self._keyChecks[i]
+                counts[i] = self._counts[i]
+
+        self._counts = counts
+        self._keySums = keySums
+        self._keyChecks = keyChecks
+        self._encoding = None
 
     def insert(self, key):
         """
@@ -90,7 +114,17 @@ class InvertibleBloomLookupTable(object):
         
         :param int key:
         """
-        self._update(InvertibleBloomLookupTable.INSERT, key)
+        self._update(InvertibleBloomLookupTable.INSERT, (key,))
+
+    def insertBatch(self, keys):
+        """
+        Insert an entry for each key. This is the same as calling insert for
+        each key, but faster.
+
+        :param keys: The keys to insert.
+        :type keys: iterable of int
+        """
+        self._update(InvertibleBloomLookupTable.INSERT, keys)
 
     def erase(self, key):
         """
@@ -98,7 +132,7 @@ class InvertibleBloomLookupTable(object):
 
         :param int key:
         """
-        self._update(InvertibleBloomLookupTable.ERASE, key)
+        self._update(InvertibleBloomLookupTable.ERASE, (key,))
 
     def listEntries(self, positive, negative):
         """
@@ -119,30 +153,39 @@ class InvertibleBloomLookupTable(object):
 
         # Make a deep copy.
         peeled = InvertibleBloomLookupTable(self)
+        counts = peeled._counts
+        keySums = peeled._keySums
+        keyChecks = peeled._keyChecks
+
+        # Only an entry changed by peeling another entry can become pure, so
+        # check the entries once and then check the changed entries.
+        candidates = [i for i in range(len(counts))
+                      if counts[i] == 1 or counts[i] == -1]
+        while len(candidates) > 0:
+            i = candidates.pop()
+            count = counts[i]
+            if count != 1 and count != -1:
+                continue
+            key = keySums[i]
+            indexes, check = peeled._getIndexes(key)
+            if keyChecks[i] != check:
+                # Not pure.
+                continue
+
+            if count == 1:
+                positive.add(key)
+            else:
+                negative.add(key)
 
-        nErased = 0
-        while True:
-            nErased = 0;
-            for entry in peeled._hashTable:
-                if entry.isPure():
-                    if entry._count == 1:
-                        positive.add(entry._keySum)
-                    else:
-                        negative.add(entry._keySum)
-
-                    peeled._update(-entry._count, entry._keySum)
-                    nErased += 1
-            
-            if not nErased > 0:
-                break
+            for index in indexes:
+                counts[index] -= count
+                keySums[index] ^= key
+                keyChecks[index] ^= check
+            candidates.extend(indexes)
 
         # If any buckets for one of the hash functions is not empty, then we
         # didn't peel them all.
-        for entry in peeled._hashTable:
-            if not entry.isEmpty():
-                return False
-
-        return True
+        return not (any(counts) or any(keySums) or any(keyChecks))
 
     def difference(self, other):
         """
@@ -152,16 +195,17 @@ class InvertibleBloomLookupTable(object):
         :return: A new IBLT of this - other.
         :rtype: InvertibleBloomLookupTable
         """
-        if len(self._hashTable) != len(other._hashTable):
+        if len(self._counts) != len(other._counts):
             raise RuntimeError("IBLT difference: Both tables must be the same size")
 
         result = InvertibleBloomLookupTable(self)
-        for i in range(len(self._hashTable)):
-            e1 = result._hashTable[i]
-            e2 = other._hashTable[i]
-            e1._count -= e2._count
-            e1._keySum ^= e2._keySum
-            e1._keyCheck ^= e2._keyCheck
+        result._counts = array(_INT32, [
+          x - y for x, y in zip(self._counts, other._counts)])
+        result._keySums = array(_UINT32, [
+          x ^ y for x, y in zip(self._keySums, other._keySums)])
+        result._keyChecks = array(_UINT32, [
+          x ^ y for x, y in zip(self._keyChecks, other._keyChecks)])
+        result._encoding = None
 
         return result
 
@@ -170,48 +214,29 @@ class InvertibleBloomLookupTable(object):
          Encode this IBLT to a Blob. This encodes this hash table from a
          uint32_t array to a uint8_t array. We create a uin8_t array 12 times
          the size of the uint32_t array. We put the first count in the first 4
-         cells, keySum in the next 4, and keyCheck in the next 4. We repeat for
-         all the other cells of the hash table. Then we append this uint8_t
-         array to the name.
+         cells, keySum in the next 4, and keyCheck in the next 4 (each little
+         endian). We repeat for all the other cells of the hash table. Then we
+         append this uint8_t array to the name. The result is saved until the
+         table is changed.
 
          :return: The encoded Blob.
          :rtype: Blob
         """
-        nEntries = len(self._hashTable)
-        # hard coding
-        unitSize = int((32 * 3) / 8)
-        tableSize = unitSize * nEntries
-
-        table = [0] * tableSize
-
-        for i in range(nEntries):
-            entry = self._hashTable[i]
+        if self._encoding != None:
+            return self._encoding
 
-            # table[i*12],   table[i*12+1], table[i*12+2], table[i*12+3] --> hashTable[i]._count
-
-            table[(i * unitSize)]     = 0xFF & entry._count
-            table[(i * unitSize) + 1] = 0xFF & (entry._count >> 8)
-            table[(i * unitSize) + 2] = 0xFF & (entry._count >> 16)
-            table[(i * unitSize) + 3] = 0xFF & (entry._count >> 24)
-
-            # table[i*12+4], table[i*12+5], table[i*12+6], table[i*12+7] --> hashTable[i]._keySum
-
-            table[(i * unitSize) + 4] = 0xFF & entry._keySum
-            table[(i * unitSize) + 5] = 0xFF & (entry._keySum >> 8)
-            table[(i * unitSize) + 6] = 0xFF & (entry._keySum >> 16)
-            table[(i * unitSize) + 7] = 0xFF & (entry._keySum >> 24)
-
-            # table[i*12+8], table[i*12+9], table[i*12+10], table[i*12+11] --> hashTable[i]._keyCheck
-
-            table[(i * unitSize) + 8] = 0xFF & entry._keyCheck
-            table[(i * unitSize) + 9] = 0xFF & (entry._keyCheck >> 8)
-            table[(i * unitSize) + 10] = 0xFF & (entry._keyCheck >> 16)
-            table[(i * unitSize) + 11] = 0xFF & (entry._keyCheck >> 24)
+        table = array(_UINT32, [0]) * (3 * len(self._counts))
+        table[0::3] = InvertibleBloomLookupTable._convert(self._counts, _UINT32)
+        table[1::3] = self._keySums
+        table[2::3] = self._keyChecks
+        if sys.byteorder != 'little':
+            table.byteswap()
 
         Z_BEST_COMPRESSION = 9
-        # Use Blob to convert an array to bytes on both Python 2 and 3.
-        compressedBytes = zlib.compress(Blob(table, False).toBytes(), Z_BEST_COMPRESSION)
-        return Blob(compressedBytes, False)
+        compressedBytes = zlib.compress(
+          InvertibleBloomLookupTable._toBytes(table), Z_BEST_COMPRESSION)
+        self._encoding = Blob(compressedBytes, False)
+        return self._encoding
 
     def equals(self, other):
         """
@@ -220,18 +245,9 @@ class InvertibleBloomLookupTable(object):
 
         :param InvertibleBloomLookupTable other: The other OBLT to check.
         """
-        iblt1HashTable = self._hashTable
-        iblt2HashTable = other._hashTable
-        if len(iblt1HashTable) != len(iblt2HashTable):
-            return False
-
-        for i in range(len(iblt1HashTable)):
-            if  (iblt1HashTable[i]._count != iblt2HashTable[i]._count or
-                 iblt1HashTable[i]._keySum != iblt2HashTable[i]._keySum or
-                 iblt1HashTable[i]._keyCheck != iblt2HashTable[i]._keyCheck):
-                return False
-
-        return True
+        return (self._counts == other._counts and
+                self._keySums == other._keySums and
+                self._keyChecks == other._keyChecks)
 
     def __eq__(self, other):
         return isinstance(other, InvertibleBloomLookupTable) and self.equals(other)
@@ -239,52 +255,53 @@ class InvertibleBloomLookupTable(object):
     def __ne__(self, other):
         return not self == other
 
-    class _HashTableEntry(object):
-        def __init__(self, other = None):
-            if isinstance(other, InvertibleBloomLookupTable._HashTableEntry):
-                self._count = other._count
-                self._keySum = other._keySum
-                self._keyCheck = other._keyCheck
-            else:
-                self._count = 0
-                self._keySum = 0
-                self._keyCheck = 0
-
-        def isPure(self):
-            """
-            :rtype: bool
-            """
-            if self._count == 1 or self._count == -1:
-                # Debug: Convert to
-                check = Common.murmurHash3Uint32(
-                  InvertibleBloomLookupTable.N_HASHCHECK, self._keySum)
-                return self._keyCheck == check
-
-            return False
-
-        def isEmpty(self):
-            """
-            :rtype: bool
-            """
-            return self._count == 0 and self._keySum == 0 and self._keyCheck == 0
-
-    def _update(self, plusOrMinus, key):
+    def _getIndexes(self, key):
         """
-        Update the entries in _hashTable.
+        Get the index of the entry in each of the N_HASH parts of the hash
+        table, and the check hash.
+
+        :param int key: The key for computing the entries.
+        :return: The tuple (indexes, check) where indexes is the list of
+          N_HASH indexes and check is the check hash of the key.
+        :rtype: (list of int, int)
+        """
+        if not have_mmh3:
+            raise RuntimeError(
+              "InvertibleBloomLookupTable: Need to 'sudo python -m pip install mmh3'")
+
+        bucketsPerHash = len(self._counts) // InvertibleBloomLookupTable.N_HASH
+        # The key as a 4-byte little endian array for MurmurHash3, computed once
+        # for all the hashes.
+        keyBytes = struct.pack("<I", key & 0xffffffff)
+
+        indexes = [
+          i * bucketsPerHash +
+            (mmh3.hash(keyBytes, i, signed = False) % bucketsPerHash)
+          for i in range(InvertibleBloomLookupTable.N_HASH)]
+        check = mmh3.hash(
+          keyBytes, InvertibleBloomLookupTable.N_HASHCHECK, signed = False)
+        return indexes, check
+
+    def _update(self, plusOrMinus, keys):
+        """
+        Update the entries in the hash table.
 
         :param int plusOrMinus: The amount to update the count.
-        :param int key: The key for computing the entry.
+        :param keys: The keys for computing the entries.
+        :type keys: iterable of int
         """
-        bucketsPerHash = int(len(self._hashTable) / InvertibleBloomLookupTable.N_HASH)
+        counts = self._counts
+        keySums = self._keySums
+        keyChecks = self._keyChecks
 
-        for i in range(InvertibleBloomLookupTable.N_HASH):
-            startEntry = i * bucketsPerHash
-            h = Common.murmurHash3Uint32(i, key)
-            entry = self._hashTable[startEntry + (h % bucketsPerHash)]
-            entry._count += plusOrMinus
-            entry._keySum ^= key
-            entry._keyCheck ^= Common.murmurHash3Uint32(
-              InvertibleBloomLookupTable.N_HASHCHECK, key)
+        for key in keys:
+            indexes, check = self._getIndexes(key)
+            for index in indexes:
+                counts[index] += plusOrMinus
+                keySums[index] ^= key
+                keyChecks[index] ^= check
+
+        self._encoding = None
 
     @staticmethod
     def _decode(encoding):
@@ -294,22 +311,50 @@ class InvertibleBloomLookupTable(object):
 
         :param Blob encoding: The encoded IBLT.
         :return: A uint32_t array representing the hash table of the IBLT.
-        :rtype: Array<int>
+        :rtype: array
+        """
+        ibltBytes = zlib.decompress(encoding.toBytes())
+        # Ignore extra bytes, as if decoding each 4 bytes.
+        ibltBytes = ibltBytes[:4 * (len(ibltBytes) // 4)]
+
+        values = InvertibleBloomLookupTable._fromBytes(_UINT32, ibltBytes)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    @staticmethod
+    def _convert(values, typecode):
         """
-        # Use Blob to convert bytes to an integer array.
-        ibltValues = Blob(zlib.decompress(encoding.toBytes()), False)
+        Get a new array with the same bits as the 32-bit values, for converting
+        between signed and unsigned.
 
-        nEntries = int(len(ibltValues) / 4)
-        values = [0] * nEntries
+        :param array values: The array of 32-bit integers.
+        :param str typecode: The typecode of the new array.
+        :rtype: array
+        """
+        return InvertibleBloomLookupTable._fromBytes(
+          typecode, InvertibleBloomLookupTable._toBytes(values))
 
-        ibltValuesBuf = ibltValues.buf()
-        for i in range(0, 4 * nEntries, 4):
-          t = ((ibltValuesBuf[i + 3] << 24) +
-               (ibltValuesBuf[i + 2] << 16) +
-               (ibltValuesBuf[i + 1] << 8)  +
-               ibltValuesBuf[i])
-          values[int(i / 4)] = t
+    @staticmethod
+    def _toBytes(values):
+        """
+        Get the bytes of the array in machine byte order.
+        """
+        if sys.version_info[0] > 2:
+            return values.tobytes()
+        else:
+            return values.tostring()
 
+    @staticmethod
+    def _fromBytes(typecode, valueBytes):
+        """
+        Create an array from the bytes in machine byte order.
+        """
+        values = array(typecode)
+        if sys.version_info[0] > 2:
+            values.frombytes(valueBytes)
+        else:
+            values.fromstring(valueBytes)
         return values
 
     N_HASH = 3
@@ -24,9 +24,10 @@ segmented data used by PSync.
 """
 
 from pyndn.name import Name
+from pyndn.interest import Interest
 from pyndn.data import Data
 from pyndn.security.signing_info import SigningInfo
-from pyndn.in_memory_storage.in_memory_storage_retaining import InMemoryStorageRetaining
+from pyndn.in_memory_storage.in_memory_storage_fifo import InMemoryStorageFifo
 from pyndn.util.blob import Blob
 from pyndn.util.common import Common
 
@@ -44,9 +45,7 @@ class PSyncSegmentPublisher(object):
       inMemoryStorageLimit = MAX_SEGMENTS_STORED):
         self._face = face
         self._keyChain = keyChain
-        # Until InMemoryStorageFifo implements an eviction policy, use InMemoryStorageRetaining.
-        # storage_(inMemoryStorageLimit)
-        self._storage = InMemoryStorageRetaining()
+        self._storage = InMemoryStorageFifo(inMemoryStorageLimit)
 
     def publish(self, interestName, dataName, content, freshnessPeriod, 
       signingInfo = SigningInfo()):
@@ -102,17 +101,8 @@ class PSyncSegmentPublisher(object):
             if interestSegment == segmentNo:
                 self._face.putData(data)
 
-            # Until InMemoryStorageFifo implements an eviction policy, use InMemoryStorageRetaining.
-            # storage_.insert(*data, freshnessPeriod)
-            self._storage.insert(data)
-
-            # Make and return a callback since segmentName is different each time.
-            def makeCallback(localSegmentName):
-                def callback():
-                    self._storage.remove(localSegmentName)
-                return callback
-
-            self._face.callLater(freshnessPeriod, makeCallback(segmentName))
+            # The segment is stale after freshnessPeriod.
+            self._storage.insert(data, freshnessPeriod)
 
             segmentNo += 1
             
@@ -130,7 +120,11 @@ class PSyncSegmentPublisher(object):
           publish the segment.
         :rtype: bool
         """
-        data = self._storage.find(interestName)
+        # Only reply with a segment which is not stale.
+        interest = Interest(interestName)
+        interest.setCanBePrefix(True)
+        interest.setMustBeFresh(True)
+        data = self._storage.find(interest)
 
         if data != None:
             self._face.putData(data)
@@ -346,11 +346,13 @@ class FullPSync2017(PSyncProducerBase):
 
         state = PSyncState(encodedContent)
         names = []
+        # The set of the names in names, to skip a repeated name in the content.
+        newNames = set()
 
         logging.getLogger(__name__).debug("Sync Data Received: " + state.toString())
 
         for contentName in state.getContent():
-            if not (contentName in self._nameToHash):
+            if not (contentName in self._nameToHash or contentName in newNames):
               logging.getLogger(__name__).debug("Checking whether to add " + 
                 contentName.toUri())
               if (self._canAddReceivedName == None or
@@ -359,7 +361,7 @@ class FullPSync2017(PSyncProducerBase):
                     contentName.toUri())
                   # The Name is freshly created by PSyncState decode, so don't copy.
                   names.append(contentName)
-                  self.insertIntoIblt(contentName)
+                  newNames.add(contentName)
 
               # We should not call _satisfyPendingSyncInterests here because we
               # just got data and deleted pending interests by calling
@@ -367,6 +369,9 @@ class FullPSync2017(PSyncProducerBase):
               # match this interest that might not have been deleted from the
               # pending sync interests.
 
+        # Insert the new names together, which is faster than one at a time.
+        self.insertIntoIbltBatch(names)
+
         # We just got the data, so send a new sync Interest.
         if len(names) > 0:
             try:
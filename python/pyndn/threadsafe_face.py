@@ -220,6 +220,8 @@ class ThreadsafeFace(Face):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: The handle from call_later, whose cancel() method cancels the
+          call.
         """
         # Convert milliseconds to seconds.
-        self._loop.call_later(delayMilliseconds / 1000.0, callback)
+        return self._loop.call_later(delayMilliseconds / 1000.0, callback)
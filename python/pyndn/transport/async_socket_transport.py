@@ -30,6 +30,7 @@ except ImportError:
     # Use Trollius on Python <= 3.2
     import trollius as asyncio
 import logging
+from pyndn.util.blob import _memoryviewWrapper
 from pyndn.transport.transport import Transport
 from pyndn.encoding.element_reader import ElementReader
 
@@ -45,6 +46,9 @@ class AsyncSocketTransport(Transport):
         self._loop = loop
         self._transport = None
         self._elementReader = None
+        self._sendQueueThreshold = 0
+        self._sendQueue = []
+        self._sendQueueLength = 0
 
     def _connectHelper(self, elementListener, connectCoroutine):
         """
@@ -83,13 +87,79 @@ class AsyncSocketTransport(Transport):
             except:
                 logging.exception("Error in data_received")
 
+    def setSendQueueThreshold(self, threshold):
+        """
+        Set the threshold for queuing the data given to send(). If threshold is
+        greater than zero, then send() adds the data to a queue, and the queued
+        buffers are given together to the asyncio transport's writelines when
+        the queue has threshold bytes or at the next iteration of the event
+        loop. This coalesces the packets sent from the callbacks of one loop
+        iteration. Since send() does not copy, the caller must not modify a
+        queued buffer until it is flushed. If threshold is zero (the default),
+        send() writes immediately.
+
+        :param int threshold: The number of queued bytes which causes a flush,
+          or zero to not queue.
+        """
+        if threshold <= 0:
+            self.flush()
+        self._sendQueueThreshold = threshold
+
+    def send(self, data):
+        """
+        Send data to the host, or queue it if setSendQueueThreshold was called.
+        To be thread-safe, this must be called from a dispatch to the loop
+        which was given to the constructor, as is done by ThreadsafeFace.
+
+        :param data: The buffer of data to send.
+        :type data: An array type accepted by Transport.write.
+        """
+        if self._sendQueueThreshold <= 0:
+            self._write(data)
+            return
+
+        if type(data) is _memoryviewWrapper:
+            # Use the underlying memoryview directly.  (When we only support
+            #   Python 3.3 or later, this check is not necessary.)
+            data = data._view
+        if len(self._sendQueue) == 0:
+            # Flush after the callbacks in this iteration of the loop.
+            self._loop.call_soon(self.flush)
+        self._sendQueue.append(data)
+        self._sendQueueLength += len(data)
+        if self._sendQueueLength >= self._sendQueueThreshold:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the data queued by send(). If the queue is empty, this does
+        nothing.
+        """
+        if len(self._sendQueue) == 0 or self._transport == None:
+            return
+
+        buffers = self._sendQueue
+        self._sendQueue = []
+        self._sendQueueLength = 0
+        if AsyncSocketTransport._sendNeedsStr:
+            data = bytearray()
+            for buffer in buffers:
+                data.extend(buffer)
+            self._write(data)
+        else:
+            try:
+                self._transport.writelines(buffers)
+            except TypeError:
+                # Assume we need to convert to a str.
+                AsyncSocketTransport._sendNeedsStr = True
+                for buffer in buffers:
+                    self._write(buffer)
+
     # This will be set True if send gets a TypeError.
     _sendNeedsStr = False
-    def send(self, data):
+    def _write(self, data):
         """
-        Send data to the host. To be thread-safe, this must be called from a
-        dispatch to the loop which was given to the constructor, as is done by
-        ThreadsafeFace.
+        Write data to the asyncio transport without queuing.
 
         :param data: The buffer of data to send.
         :type data: An array type accepted by Transport.write.
@@ -103,7 +173,7 @@ class AsyncSocketTransport(Transport):
             except TypeError:
                 # Assume we need to convert to a str.
                 AsyncSocketTransport._sendNeedsStr = True
-                self.send(data)
+                self._write(data)
 
     def processEvents(self):
         """
@@ -128,5 +198,6 @@ class AsyncSocketTransport(Transport):
 
     def close(self):
         if self._transport != None:
+            self.flush()
             self._transport.close()
             self._transport = None
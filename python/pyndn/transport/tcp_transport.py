@@ -22,24 +22,39 @@ This module defines the TcpTransport class which extends Transport for
 communication over TCP.
 """
 
+import errno
+import logging
 import socket
-from pyndn.util.blob import Blob, Common
+from pyndn.util.blob import Blob, _memoryviewWrapper
 from pyndn.transport.transport import Transport
 from pyndn.transport.socket_poller import SocketPoller
 from pyndn.encoding.element_reader import ElementReader
 
+# Use a non-blocking receive if the platform supports it, otherwise poll first.
+_MSG_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0)
+_WOULD_BLOCK_ERRORS = (errno.EAGAIN, errno.EWOULDBLOCK)
+# Python 2 doesn't have sendmsg.
+_HAVE_SENDMSG = hasattr(socket.socket, "sendmsg")
+# The maximum number of buffers for one call to sendmsg (IOV_MAX).
+_MAX_SEND_BUFFERS = 1024
+
 class TcpTransport(Transport):
     """
     Create a new TcpTransport in the unconnected state.
     """
+    # The default size of the buffer for each read from the socket. This is
+    # larger than the maximum packet size so that one read can get many
+    # packets.
+    DEFAULT_READ_BUFFER_SIZE = 65536
+
     def __init__(self):
         self._socket = None
         self._socketPoller = None
-        self._buffer = bytearray(Common.MAX_NDN_PACKET_SIZE)
-        # Create a Blob and take its buf() since this creates a memoryview
-        #   which is more efficient for slicing.
-        self._bufferView = Blob(self._buffer, False).buf()
+        self._setBuffer(self.DEFAULT_READ_BUFFER_SIZE)
         self._elementReader = None
+        self._sendQueueThreshold = 0
+        self._sendQueue = []
+        self._sendQueueLength = 0
         self._connectionInfo = None
         self._isLocal = False
 
@@ -52,10 +67,21 @@ class TcpTransport(Transport):
         :param str host: The host for the connection.
         :param int port: (optional) The port number for the connection. If
           omitted, use 6363.
+        :param int readBufferSize: (optional) The size of the buffer for each
+          read from the socket. If omitted or None, use
+          TcpTransport.DEFAULT_READ_BUFFER_SIZE.
+        :param int receiveBufferSize: (optional) The value for the socket
+          SO_RCVBUF option. If omitted or None, use the system default.
+        :param int sendBufferSize: (optional) The value for the socket SO_SNDBUF
+          option. If omitted or None, use the system default.
         """
-        def __init__(self, host, port = 6363):
+        def __init__(self, host, port = 6363, readBufferSize = None,
+                     receiveBufferSize = None, sendBufferSize = None):
             self._host = host
             self._port = port
+            self._readBufferSize = readBufferSize
+            self._receiveBufferSize = receiveBufferSize
+            self._sendBufferSize = sendBufferSize
 
         def getHost(self):
             """
@@ -75,6 +101,34 @@ class TcpTransport(Transport):
             """
             return self._port
 
+        def getReadBufferSize(self):
+            """
+            Get the readBufferSize given to the constructor.
+
+            :return: The size of the buffer for each read, or None for the
+              default.
+            :rtype: int
+            """
+            return self._readBufferSize
+
+        def getReceiveBufferSize(self):
+            """
+            Get the receiveBufferSize given to the constructor.
+
+            :return: The SO_RCVBUF value, or None for the system default.
+            :rtype: int
+            """
+            return self._receiveBufferSize
+
+        def getSendBufferSize(self):
+            """
+            Get the sendBufferSize given to the constructor.
+
+            :return: The SO_SNDBUF value, or None for the system default.
+            :rtype: int
+            """
+            return self._sendBufferSize
+
     def isLocal(self, connectionInfo):
         """
         Determine whether this transport connecting according to connectionInfo
@@ -125,6 +179,9 @@ class TcpTransport(Transport):
         """
         self.close()
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Set the buffer sizes before connecting so that they are used for the
+        # TCP window.
+        self._setSocketOptions(connectionInfo)
         self._socket.connect(
           (connectionInfo.getHost(), connectionInfo.getPort()))
 
@@ -134,11 +191,83 @@ class TcpTransport(Transport):
         if onConnected != None:
             onConnected()
 
+    def setSendQueueThreshold(self, threshold):
+        """
+        Set the threshold for queuing the data given to send(). If threshold is
+        greater than zero, then send() adds the data to a queue, and the queued
+        buffers are sent together with one vectored write when the queue has
+        threshold bytes or when flush() is called. Face.processEvents calls
+        flush(), so the packets sent from the callbacks of one processEvents
+        are coalesced. Since send() does not copy, the caller must not modify a
+        queued buffer until it is flushed. If threshold is zero (the default),
+        send() sends immediately.
+
+        :param int threshold: The number of queued bytes which causes a flush,
+          or zero to not queue.
+        """
+        if threshold <= 0:
+            self.flush()
+        self._sendQueueThreshold = threshold
+
+    def send(self, data):
+        """
+        Send data to the host, or queue it if setSendQueueThreshold was called.
+
+        :param data: The buffer of data to send.
+        :type data: An array type accepted by socket.send
+        """
+        if self._sendQueueThreshold <= 0:
+            self._sendNow(data)
+            return
+
+        if type(data) is _memoryviewWrapper:
+            # Use the underlying memoryview directly.  (When we only support
+            #   Python 3.3 or later, this check is not necessary.)
+            data = data._view
+        self._sendQueue.append(data)
+        self._sendQueueLength += len(data)
+        if self._sendQueueLength >= self._sendQueueThreshold:
+            self.flush()
+
+    def flush(self):
+        """
+        Send the data queued by send(). If the queue is empty, this does nothing.
+        """
+        if len(self._sendQueue) == 0:
+            return
+
+        buffers = self._sendQueue
+        # Reset the queue before sending in case sending throws an exception.
+        self._sendQueue = []
+        self._sendQueueLength = 0
+
+        if not _HAVE_SENDMSG:
+            # Coalesce into one buffer.
+            data = bytearray()
+            for buffer in buffers:
+                data.extend(buffer)
+            self._sendNow(data)
+            return
+
+        # sendmsg may not send all the bytes, so loop.
+        while len(buffers) > 0:
+            nBytesSent = self._socket.sendmsg(buffers[:_MAX_SEND_BUFFERS])
+
+            # Skip the buffers which were completely sent.
+            nSentBuffers = 0
+            while (nSentBuffers < len(buffers) and
+                   nBytesSent >= len(buffers[nSentBuffers])):
+                nBytesSent -= len(buffers[nSentBuffers])
+                nSentBuffers += 1
+            buffers = buffers[nSentBuffers:]
+            if nBytesSent > 0:
+                buffers[0] = buffers[0][nBytesSent:]
+
     # This will be set True if send gets a TypeError.
     _sendNeedsStr = False
-    def send(self, data):
+    def _sendNow(self, data):
         """
-        Send data to the host.
+        Send data to the host without queuing.
 
         :param data: The buffer of data to send.
         :type data: An array type accepted by socket.send
@@ -152,7 +281,7 @@ class TcpTransport(Transport):
             except TypeError:
                 # Assume we need to convert to a str.
                 TcpTransport._sendNeedsStr = True
-                self.send(data)
+                self._sendNow(data)
 
     def processEvents(self):
         """
@@ -171,17 +300,31 @@ class TcpTransport(Transport):
 
         # Loop until there is no more data in the receive buffer.
         while True:
-            if not self._socketPoller.isReady():
-                # There is no data waiting.
+            if _MSG_DONTWAIT == 0 and not self._socketPoller.isReady():
+                # We can't do a non-blocking receive, and there is no data
+                # waiting.
                 return
 
-            nBytesRead = self._socket.recv_into(self._buffer)
+            try:
+                nBytesRead = self._socket.recv_into(
+                  self._buffer, 0, _MSG_DONTWAIT)
+            except socket.error as ex:
+                if ex.errno in _WOULD_BLOCK_ERRORS:
+                    # There is no data waiting.
+                    return
+                raise ex
+
             if nBytesRead <= 0:
-                # Since we checked for data ready, we don't expect this.
+                # The connection is closed.
                 return
 
             # _bufferView is a memoryview, so we can slice efficienty.
             self._elementReader.onReceivedData(self._bufferView[0:nBytesRead])
+            if nBytesRead < len(self._buffer):
+                # The read didn't fill the buffer, so the receive buffer was
+                # drained. Don't make another system call just to find that
+                # there is no data waiting.
+                return
 
     def getIsConnected(self):
         """
@@ -196,6 +339,39 @@ class TcpTransport(Transport):
         # Assume we are still connected.  TODO: Do a test receive?
         return True
 
+    def _setBuffer(self, size):
+        """
+        Allocate the buffer for reading from the socket with the given size.
+
+        :param int size: The size of the buffer.
+        """
+        self._buffer = bytearray(size)
+        # Create a Blob and take its buf() since this creates a memoryview
+        #   which is more efficient for slicing.
+        self._bufferView = Blob(self._buffer, False).buf()
+
+    def _setSocketOptions(self, connectionInfo):
+        """
+        Set the socket buffer sizes from connectionInfo and reallocate the read
+        buffer if needed.
+
+        :param connectionInfo: The connection info with the buffer sizes.
+        """
+        readBufferSize = connectionInfo.getReadBufferSize()
+        if readBufferSize == None:
+            readBufferSize = self.DEFAULT_READ_BUFFER_SIZE
+        if readBufferSize != len(self._buffer):
+            self._setBuffer(readBufferSize)
+
+        if connectionInfo.getReceiveBufferSize() != None:
+            self._socket.setsockopt(
+              socket.SOL_SOCKET, socket.SO_RCVBUF,
+              connectionInfo.getReceiveBufferSize())
+        if connectionInfo.getSendBufferSize() != None:
+            self._socket.setsockopt(
+              socket.SOL_SOCKET, socket.SO_SNDBUF,
+              connectionInfo.getSendBufferSize())
+
     def close(self):
         """
         Close the connection.  If not connected, this does nothing.
@@ -205,6 +381,13 @@ class TcpTransport(Transport):
             self._socketPoller = None
 
         if self._socket != None:
+            try:
+                self.flush()
+            except Exception as ex:
+                # The peer may have closed the connection. Still close the
+                # socket, and don't raise from close().
+                logging.getLogger(__name__).error(
+                  "Error flushing the send queue on close: %s", str(ex))
             self._socket.close()
             self._socket = None
 
@@ -102,6 +102,14 @@ class Transport(object):
         """
         raise RuntimeError("processEvents is not implemented")
 
+    def flush(self):
+        """
+        Send any data which send() has queued. This is called by
+        Face.processEvents. This base class implementation does nothing, but
+          your derived class can override if it queues data.
+        """
+        pass
+
     def getIsConnected(self):
         """
         Check if the transport is connected.
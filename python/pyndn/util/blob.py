@@ -43,6 +43,10 @@ class Blob(object):
       IMPORTANT: If copy is false, if you keep a pointer to the array then you
       must treat the array as immutable and promise not to change it.
     """
+    # Use __slots__ since an application may keep millions of blobs, for
+    # example as the values of name components.
+    __slots__ = ('_array', '_hash')
+
     def __init__(self, array = None, copy = True):
         self._hash = None
 
@@ -217,11 +221,8 @@ class Blob(object):
         if len(self._array) != len(other._array):
             return False
 
-        # Manually compare int elements.
-        for i in range(len(self._array)):
-            if self._array[i] != other._array[i]:
-                return False
-        return True
+        # Compare as bytes, which is faster than comparing each element.
+        return self.toBytes() == other.toBytes()
 
     def compare(self, other):
         """
@@ -245,16 +246,13 @@ class Blob(object):
         if self._array != None and other._array == None:
             return 1
 
-        # Manually compare int elements.
-        for i in range(min(len(self._array), len(other._array))):
-            if self._array[i] < other._array[i]:
-                return -1
-            if self._array[i] > other._array[i]:
-                return 1
-        # They are equal up to the shorter.
-        if len(self._array) < len(other._array):
+        # Compare as bytes, which is faster than comparing each element. If
+        # they are equal up to the shorter, then the shorter is less.
+        myBytes = self.toBytes()
+        otherBytes = other.toBytes()
+        if myBytes < otherBytes:
             return -1
-        if len(self._array) > len(other._array):
+        if myBytes > otherBytes:
             return 1
         return 0
 
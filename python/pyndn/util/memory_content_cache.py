@@ -19,15 +19,18 @@
 
 """
 This module defines the MemoryContentCache class which holds a set of Data
-packets and answers an Interest to return the correct Data packet. The cache is
-periodically cleaned up to remove each stale Data packet based on its
-FreshnessPeriod (if it has one).
+packets and answers an Interest to return the correct Data packet. The Data
+packets are indexed by name in the NDN canonical order, so that the candidates
+for an Interest are found by a binary search. The cache is periodically cleaned
+up to remove each stale Data packet based on its FreshnessPeriod (if it has one).
 Note: This class is an experimental feature. See the API docs for more detail at
 http://named-data.net/doc/ndn-ccl-api/memory-content-cache.html .
 """
 
 import logging
 import collections
+import bisect
+import heapq
 from pyndn.registration_options import RegistrationOptions
 from pyndn.interest_filter import InterestFilter
 from pyndn.encoding.wire_format import WireFormat
@@ -60,12 +63,22 @@ class MemoryContentCache(object):
         self._interestFilterIdList = []
         # elements are int
         self._registeredPrefixIdList = []
-        # elements are MemoryContentCache._Content
-        self._noStaleTimeCache = []
-        # elements are MemoryContentCache.StaleTimeContent
-        self._staleTimeCache = []
-        self._emptyComponent = Name.Component()
-        self._pendingInterestTable = [] # of PendingInterest
+        # Data Name => MemoryContentCache._Content or
+        # MemoryContentCache._StaleTimeContent, in the order they were added.
+        self._contents = collections.OrderedDict()
+        # The keys of _contents in the NDN canonical order.
+        self._sortedNames = []
+        # The heap of (cacheRemovalTimeMilliseconds, sequenceNo, Data Name) for
+        # each _StaleTimeContent. An item is outdated if the content for the
+        # name has a different sequenceNo.
+        self._removalHeap = []
+        self._nextSequenceNo = 0
+        self._capacity = None
+        # Interest Name => list of MemoryContentCache._PendingInterest.
+        self._pendingInterestsByName = {}
+        # The heap of (timeoutTimeMilliseconds, sequenceNo, _PendingInterest).
+        # An item is outdated if the pending interest was already satisfied.
+        self._pendingInterestTimeoutHeap = []
         self._minimumCacheLifetime = 0.0
 
     def registerPrefix(
@@ -242,6 +255,9 @@ class MemoryContentCache(object):
         None, set the staleness time to now plus the maximum of
         data.getMetaInfo().getFreshnessPeriod() and minimumCacheLifetime, which
         is checked during cleanup to remove stale content.
+        If the cache has a Data packet with the same name, replace it. If the
+        number of Data packets exceeds the capacity from setCapacity(), remove
+        the Data packet which was added first.
         This also checks if cleanupIntervalMilliseconds
         milliseconds have passed and
         removes stale content from the cache. After removing stale content,
@@ -257,49 +273,78 @@ class MemoryContentCache(object):
 
         if (data.getMetaInfo().getFreshnessPeriod() != None and
               data.getMetaInfo().getFreshnessPeriod() >= 0.0):
-            # The content will go stale, so use staleTimeCache.
+            # The content will go stale, so add it to the removal heap.
             content = MemoryContentCache._StaleTimeContent(
               data, nowMilliseconds, self._minimumCacheLifetime)
-            # Insert into _staleTimeCache, sorted on
-            # content._cacheRemovalTimeMilliseconds.
-            # Search from the back since we expect it to go there.
-            i = len(self._staleTimeCache) - 1
-            while i >= 0:
-                if (self._staleTimeCache[i]._cacheRemovalTimeMilliseconds <=
-                      content._cacheRemovalTimeMilliseconds):
-                    break
-                i -= 1
-
-            # Element i is the greatest less than or equal to
-            # content._cacheRemovalTimeMilliseconds, so insert after it.
-            self._staleTimeCache.insert(i + 1, content)
+            content._sequenceNo = self._nextSequenceNo
+            heapq.heappush(self._removalHeap,
+              (content._cacheRemovalTimeMilliseconds, content._sequenceNo,
+               content.getName()))
         else:
-            # The data does not go stale, so use _noStaleTimeCache.
-            self._noStaleTimeCache.append(MemoryContentCache._Content(data))
-
-        # Remove timed-out interests and check if the data packet matches any
-        #   pending interest.
-        # Go backwards through the list so we can erase entries.
-        for i in range(len(self._pendingInterestTable) - 1, -1, -1):
-            pendingInterest = self._pendingInterestTable[i]
-            if pendingInterest.isTimedOut(nowMilliseconds):
-                self._pendingInterestTable.pop(i)
+            content = MemoryContentCache._Content(data)
+            content._sequenceNo = self._nextSequenceNo
+        self._nextSequenceNo += 1
+
+        name = content.getName()
+        if name in self._contents:
+            # Remove first so that the replacement is the last added.
+            self._remove(name)
+        self._contents[name] = content
+        bisect.insort(self._sortedNames, name)
+
+        if self._capacity != None:
+            while len(self._contents) > self._capacity:
+                self._remove(next(iter(self._contents)))
+
+        if len(self._removalHeap) > 2 * len(self._contents) + 100:
+            # Discard the outdated items.
+            self._removalHeap = [
+              (value._cacheRemovalTimeMilliseconds, value._sequenceNo, key)
+              for key, value in self._contents.items()
+              if isinstance(value, MemoryContentCache._StaleTimeContent)]
+            heapq.heapify(self._removalHeap)
+
+        # Remove timed-out interests.
+        while (len(self._pendingInterestTimeoutHeap) > 0 and
+               self._pendingInterestTimeoutHeap[0][0] <= nowMilliseconds):
+            timeoutTime, sequenceNo, pendingInterest = heapq.heappop(
+              self._pendingInterestTimeoutHeap)
+            self._removePendingInterest(pendingInterest)
+
+        # Check if the data packet matches any pending interest. Only an
+        # interest whose name is a prefix of the data name can match.
+        dataName = data.getName()
+        for nComponents in range(dataName.size(), -1, -1):
+            prefix = dataName.getPrefix(nComponents)
+            pendingInterests = self._pendingInterestsByName.get(prefix)
+            if pendingInterests == None:
                 continue
 
-            if pendingInterest.getInterest().matchesName(data.getName()):
+            # Go backwards through the list so we can erase entries.
+            for i in range(len(pendingInterests) - 1, -1, -1):
+                pendingInterest = pendingInterests[i]
+                if not pendingInterest.getInterest().matchesName(dataName):
+                    continue
+
                 try:
                     # Send to the same face from the original call to onInterest.
                     # wireEncode returns the cached encoding if available.
-                    logging.getLogger(__name__).info(
-                      "MemoryContentCache:  Reply w/ add Data " + data.getName().toUri())
+                    if logging.getLogger(__name__).isEnabledFor(logging.INFO):
+                        logging.getLogger(__name__).info(
+                          "MemoryContentCache:  Reply w/ add Data " +
+                          dataName.toUri())
                     pendingInterest.getFace().send(data.wireEncode())
                 except Exception as ex:
                     logging.getLogger(__name__).error(
                       "Error in face.send: %s", str(ex))
                     return
 
-                # The pending interest is satisfied, so remove it.
-                self._pendingInterestTable.pop(i)
+                # The pending interest is satisfied, so remove it. Its item in
+                # _pendingInterestTimeoutHeap becomes outdated.
+                pendingInterests.pop(i)
+
+            if len(pendingInterests) == 0:
+                del self._pendingInterestsByName[prefix]
 
     def storePendingInterest(self, interest, face):
         """
@@ -313,8 +358,17 @@ class MemoryContentCache(object):
         :param Face face: The Face with the connection which
           received the interest. This comes from the OnInterest callback.
         """
-        self._pendingInterestTable.append(
-          self._PendingInterest(interest, face))
+        pendingInterest = self._PendingInterest(interest, face)
+        name = interest.getName()
+        if name in self._pendingInterestsByName:
+            self._pendingInterestsByName[name].append(pendingInterest)
+        else:
+            self._pendingInterestsByName[name] = [pendingInterest]
+
+        heapq.heappush(self._pendingInterestTimeoutHeap,
+          (pendingInterest._timeoutTimeMilliseconds, self._nextSequenceNo,
+           pendingInterest))
+        self._nextSequenceNo += 1
 
     def getStorePendingInterest(self):
         """
@@ -350,6 +404,39 @@ class MemoryContentCache(object):
         """
         self._minimumCacheLifetime = minimumCacheLifetime
 
+    def getCapacity(self):
+        """
+        Get the maximum number of Data packets in the cache.
+
+        :return: The maximum number of Data packets, or None for no limit.
+        :rtype: int
+        """
+        return self._capacity
+
+    def setCapacity(self, capacity):
+        """
+        Set the maximum number of Data packets in the cache. When add() exceeds
+        the capacity, it removes the Data packet which was added first. This
+        immediately removes Data packets if the cache already exceeds the
+        capacity. The default is no limit.
+
+        :param int capacity: The maximum number of Data packets, or None for no
+          limit.
+        """
+        self._capacity = capacity
+        if capacity != None:
+            while len(self._contents) > capacity:
+                self._remove(next(iter(self._contents)))
+
+    def size(self):
+        """
+        Get the number of Data packets in the cache.
+
+        :return: The number of Data packets.
+        :rtype: int
+        """
+        return len(self._contents)
+
     def _storePendingInterestCallback(
           self, prefix, interest, face, interestFilterId, filter):
         """
@@ -369,66 +456,52 @@ class MemoryContentCache(object):
         send the Data packet to the face. If no matching Data packet is in
         the cache, call the callback in onDataNotFoundForPrefix (if defined).
         """
-        logging.getLogger(__name__).info(
-          "MemoryContentCache:  Received Interest " + interest.toUri())
+        logger = logging.getLogger(__name__)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+              "MemoryContentCache:  Received Interest " + interest.toUri())
 
         nowMilliseconds = Common.getNowMilliseconds()
         self._doCleanup(nowMilliseconds)
 
-        selectedComponent = None
-        selectedEncoding = None
-        # We need to iterate over both arrays.
-        totalSize = len(self._staleTimeCache) + len(self._noStaleTimeCache)
-        for i in range(totalSize):
-            isFresh = True
-            if i < len(self._staleTimeCache):
-                content = self._staleTimeCache[i]
-                isFresh = content.isFresh(nowMilliseconds)
-            else:
-                # We have iterated over the first array. Get from the second.
-                content = self._noStaleTimeCache[i - len(self._staleTimeCache)]
-
-            if (interest.matchesName(content.getName()) and
-                  not (interest.getMustBeFresh() and not isFresh)):
-                if (interest.getChildSelector() == None):
-                    # No child selector, so send the first match that we have found.
-                    logging.getLogger(__name__).info(
-                      "MemoryContentCache:         Reply Data " + content.getName().toUri())
-                    face.send(content.getDataEncoding())
-                    return
-                else:
-                    # Update selectedEncoding based on the child selector.
-                    if (content.getName().size() > interest.getName().size()):
-                        component = content.getName().get(interest.getName().size())
-                    else:
-                        component = self._emptyComponent
-
-                    gotBetterMatch = False
-                    if selectedEncoding == None:
-                        # Save the first match.
-                        gotBetterMatch = True
-                    else:
-                        if interest.getChildSelector() == 0:
-                            # Leftmost child.
-                            if component.compare(selectedComponent) < 0:
-                                gotBetterMatch = True
-                        else:
-                            # Rightmost child.
-                            if component.compare(selectedComponent) > 0:
-                                gotBetterMatch = True
-
-                    if gotBetterMatch:
-                        selectedComponent = component
-                        selectedEncoding = content.getDataEncoding()
-
-        if selectedEncoding != None:
-            # We found the leftmost or rightmost child.
-            logging.getLogger(__name__).info(
-              "MemoryContentCache: Reply Data to Interest " + interest.toUri())
-            face.send(selectedEncoding)
+        # The names with the Interest name as a prefix are in the range
+        # [iBegin, iEnd) of _sortedNames, ordered by the child component.
+        interestName = interest.getName()
+        iBegin, iEnd = self._getPrefixRange(interestName)
+
+        content = None
+        if interest.getChildSelector() == None or interest.getChildSelector() == 0:
+            # Find the first match, which is the leftmost child.
+            for i in range(iBegin, iEnd):
+                if self._matches(interest, i, nowMilliseconds):
+                    content = self._contents[self._sortedNames[i]]
+                    break
         else:
-            logging.getLogger(__name__).info(
-              "MemoryContentCache: onDataNotFound for " + interest.toUri())
+            # The last match has the rightmost child. Among the matches with
+            # this child, select the first.
+            for i in range(iEnd - 1, iBegin - 1, -1):
+                if self._matches(interest, i, nowMilliseconds):
+                    name = self._sortedNames[i]
+                    if name.size() > interestName.size():
+                        childBegin, childEnd = self._getPrefixRange(
+                          name.getPrefix(interestName.size() + 1), iBegin, i + 1)
+                        for j in range(childBegin, i + 1):
+                            if self._matches(interest, j, nowMilliseconds):
+                                name = self._sortedNames[j]
+                                break
+
+                    content = self._contents[name]
+                    break
+
+        if content != None:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("MemoryContentCache:         Reply Data " +
+                  content.getName().toUri())
+            face.send(content.getDataEncoding())
+        else:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                  "MemoryContentCache: onDataNotFound for " + interest.toUri())
             # Call the onDataNotFound callback (if defined).
             if prefix.toUri() in self._onDataNotFoundForPrefix:
                 try:
@@ -437,22 +510,110 @@ class MemoryContentCache(object):
                 except:
                     logging.exception("Error in onDataNotFound")
 
+    def _matches(self, interest, i, nowMilliseconds):
+        """
+        Check if the content for the name at index i in _sortedNames matches
+        the interest name and selectors, except the ChildSelector.
+
+        :param Interest interest: The interest.
+        :param int i: The index in _sortedNames.
+        :param float nowMilliseconds: The current time in milliseconds from
+          Common.getNowMilliseconds().
+        :return: True if the content matches.
+        :rtype: bool
+        """
+        name = self._sortedNames[i]
+        if not interest.matchesName(name):
+            return False
+        if interest.getMustBeFresh():
+            content = self._contents[name]
+            if (isinstance(content, MemoryContentCache._StaleTimeContent) and
+                not content.isFresh(nowMilliseconds)):
+                return False
+
+        return True
+
+    def _getPrefixRange(self, prefix, iBegin = 0, iEnd = None):
+        """
+        Get the range of names in _sortedNames which have the prefix, searching
+        within the given range. Since _sortedNames is in the NDN canonical
+        order, the names with a prefix are consecutive.
+
+        :param Name prefix: The prefix Name.
+        :param int iBegin: (optional) The first index to search. If omitted,
+          use 0.
+        :param int iEnd: (optional) One past the last index to search. If
+          omitted, use len(_sortedNames).
+        :return: The tuple (iBegin, iEnd) of the range of indexes.
+        :rtype: (int, int)
+        """
+        if iEnd == None:
+            iEnd = len(self._sortedNames)
+        nPrefixComponents = prefix.size()
+
+        iBegin = bisect.bisect_left(self._sortedNames, prefix, iBegin, iEnd)
+        # Binary search for the first name after iBegin without the prefix.
+        low = iBegin
+        high = iEnd
+        while low < high:
+            middle = (low + high) // 2
+            name = self._sortedNames[middle]
+            if (name.size() >= nPrefixComponents and
+                name.compare(0, nPrefixComponents, prefix) == 0):
+                low = middle + 1
+            else:
+                high = middle
+
+        return iBegin, low
+
+    def _remove(self, name):
+        """
+        Remove the content for the name, which must exist. An item for the
+        content in _removalHeap becomes outdated.
+
+        :param Name name: The Data name.
+        """
+        del self._contents[name]
+        i = bisect.bisect_left(self._sortedNames, name)
+        self._sortedNames.pop(i)
+
+    def _removePendingInterest(self, pendingInterest):
+        """
+        Remove the pending interest from _pendingInterestsByName, if it is
+        still there.
+
+        :param MemoryContentCache._PendingInterest pendingInterest: The pending
+          interest to remove.
+        """
+        name = pendingInterest.getInterest().getName()
+        pendingInterests = self._pendingInterestsByName.get(name)
+        if pendingInterests == None:
+            return
+
+        for i in range(len(pendingInterests)):
+            if pendingInterests[i] is pendingInterest:
+                pendingInterests.pop(i)
+                if len(pendingInterests) == 0:
+                    del self._pendingInterestsByName[name]
+                return
+
     def _doCleanup(self, nowMilliseconds):
         """
         Check if now is greater than nextCleanupTime and, if so, remove stale
-        content from staleTimeCache and reset nextCleanupTime based on
-        cleanupIntervalMilliseconds. Since add(Data) does a sorted insert into
-        staleTimeCache, the check for stale data is quick and does not require
-        searching the entire staleTimeCache.
+        content from the cache and reset nextCleanupTime based on
+        cleanupIntervalMilliseconds. Since the stale content is ordered in a
+        heap by removal time, the check for stale data is quick and does not
+        require searching the entire cache.
         :param float nowMilliseconds: The current time in milliseconds from
           Common.getNowMilliseconds().
         """
         if nowMilliseconds >= self._nextCleanupTime:
-            # staleTimeCache is sorted on _cacheRemovalTimeMilliseconds, so we only need
-            # to erase the stale entries at the front, then quit.
-            while (len(self._staleTimeCache) > 0 and
-                   self._staleTimeCache[0].isPastRemovalTime(nowMilliseconds)):
-                del self._staleTimeCache[0]
+            while (len(self._removalHeap) > 0 and
+                   self._removalHeap[0][0] <= nowMilliseconds):
+                removalTime, sequenceNo, name = heapq.heappop(self._removalHeap)
+                content = self._contents.get(name)
+                if content != None and content._sequenceNo == sequenceNo:
+                    self._remove(name)
 
             self._nextCleanupTime = nowMilliseconds + self._cleanupIntervalMilliseconds
 
@@ -472,6 +633,8 @@ class MemoryContentCache(object):
             self._name = Name(data.getName())
             # wireEncode returns the cached encoding if available.
             self._dataEncoding = data.wireEncode().buf()
+            # The sequence number is set by add().
+            self._sequenceNo = 0
 
         def getName(self):
             return self._name
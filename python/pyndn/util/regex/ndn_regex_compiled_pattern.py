@@ -0,0 +1,321 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the NdnRegexCompiledPattern class which translates the
+matchers compiled by NdnRegexTopMatcher into Python re patterns, so that
+matching a name is one call to the re module instead of a recursive
+backtracking search through the matcher objects.
+
+Each name component is encoded as a fixed-width block of "/" followed by one
+flag character for each distinct component set in the expression, which is "1"
+if the component matches the set, otherwise "0". (A component set is checked
+with re.search on the escaped component, the same as
+NdnRegexComponentMatcher.) A component set in the expression becomes a pattern
+which matches one block with its flag set, and the groups, repetitions and
+back references of the expression become the same constructs in the re
+pattern.
+"""
+
+import re
+from pyndn.util.regex.ndn_regex_backref_matcher import NdnRegexBackrefMatcher
+from pyndn.util.regex.ndn_regex_repeat_matcher import NdnRegexRepeatMatcher
+
+class NdnRegexCompiledPattern(object):
+    """
+    Create an NdnRegexCompiledPattern from the primary and secondary
+    NdnRegexPatternListMatcher of an NdnRegexTopMatcher. Use create() which
+    returns None if the expression can't be translated.
+
+    :param NdnRegexPatternListMatcher primaryMatcher: The primary matcher.
+    :param NdnRegexPatternListMatcher secondaryMatcher: The secondary matcher,
+      or None if not used.
+    :raises NdnRegexCompiledPattern._UntranslatableError: If the expression
+      can't be translated.
+    """
+    def __init__(self, primaryMatcher, secondaryMatcher):
+        # The list of (componentRegexes, isInclusion) for the flag characters.
+        self._componentSets = []
+        # (tuple of component expressions, isInclusion) => index in
+        # _componentSets.
+        self._componentSetIndexes = {}
+
+        primary = NdnRegexCompiledPattern._Translation()
+        self._translatePatternList(primaryMatcher, primary, False)
+        if secondaryMatcher != None:
+            secondary = NdnRegexCompiledPattern._Translation()
+            self._translatePatternList(secondaryMatcher, secondary, False)
+        else:
+            secondary = None
+
+        # Make the re patterns now that the number of flags is known.
+        self._blockWidth = 1 + len(self._componentSets)
+        primary.finish(self._blockWidth)
+        if secondary != None:
+            secondary.finish(self._blockWidth)
+        self._primary = primary
+        self._secondary = secondary
+
+    @staticmethod
+    def create(primaryMatcher, secondaryMatcher):
+        """
+        Create an NdnRegexCompiledPattern for the matchers.
+
+        :param NdnRegexPatternListMatcher primaryMatcher: The primary matcher.
+        :param NdnRegexPatternListMatcher secondaryMatcher: The secondary
+          matcher, or None if not used.
+        :return: The new NdnRegexCompiledPattern, or None if the expression has
+          a component regex group which can't be translated, in which case the
+          caller should use the matchers.
+        :rtype: NdnRegexCompiledPattern
+        """
+        try:
+            return NdnRegexCompiledPattern(primaryMatcher, secondaryMatcher)
+        except NdnRegexCompiledPattern._UntranslatableError:
+            return None
+
+    def match(self, name):
+        """
+        Match the name with the primary pattern, then the secondary pattern.
+        On a match, set the match result of the back reference matchers and the
+        pseudo matchers of component regex groups used by expand().
+
+        :param Name name: The name to match.
+        :return: 0 if the primary pattern matches, 1 if the secondary pattern
+          matches, or -1 for no match.
+        :rtype: int
+        """
+        encoding = self._encode(name)
+
+        if self._primary.match(name, encoding):
+            return 0
+        if self._secondary != None and self._secondary.match(name, encoding):
+            return 1
+        return -1
+
+    def _encode(self, name):
+        """
+        Encode the name as a string of blocks, one for each component.
+
+        :param Name name: The name to encode.
+        :rtype: str
+        """
+        if len(self._componentSets) == 0:
+            return "/" * name.size()
+
+        blocks = []
+        for i in range(name.size()):
+            component = name.get(i).toEscapedString()
+            block = "/"
+            for componentRegexes, isInclusion in self._componentSets:
+                isMatched = False
+                for componentRegex in componentRegexes:
+                    if componentRegex.search(component) != None:
+                        isMatched = True
+                        break
+
+                block += "1" if isMatched == isInclusion else "0"
+            blocks.append(block)
+
+        return "".join(blocks)
+
+    def _translatePatternList(self, matcher, translation, isRepeated):
+        """
+        Append the pattern for the NdnRegexPatternListMatcher.
+
+        :param bool isRepeated: True if the matcher is inside a repetition.
+        """
+        for child in matcher._matchers:
+            if isinstance(child, NdnRegexBackrefMatcher):
+                self._translateBackref(child, translation, isRepeated)
+            elif isinstance(child, NdnRegexRepeatMatcher):
+                childIsRepeated = isRepeated or child._repeatMax > 1
+                translation.pieces.append("(?:")
+                if isinstance(child._matchers[0], NdnRegexBackrefMatcher):
+                    self._translateBackref(
+                      child._matchers[0], translation, childIsRepeated)
+                else:
+                    self._translateComponentSet(
+                      child._matchers[0], translation, childIsRepeated)
+                translation.pieces.append(")" + NdnRegexCompiledPattern._quantifier(
+                  child._repeatMin, child._repeatMax))
+            else:
+                raise NdnRegexCompiledPattern._UntranslatableError()
+
+    def _translateBackref(self, matcher, translation, isRepeated):
+        """
+        Append the capturing group for the NdnRegexBackrefMatcher.
+        """
+        translation.backrefGroups.append((translation.addGroup(), matcher))
+        translation.pieces.append("(")
+        self._translatePatternList(matcher._matchers[0], translation, isRepeated)
+        translation.pieces.append(")")
+
+    def _translateComponentSet(self, matcher, translation, isRepeated):
+        """
+        Append the pattern which matches one component in the
+        NdnRegexComponentSetMatcher.
+        """
+        components = matcher._components
+        hasRegexGroups = False
+        for component in components:
+            if component._componentRegex.groups > 0:
+                hasRegexGroups = True
+
+        if hasRegexGroups:
+            # expand() needs the regex groups for the matched component. This
+            # is only well-defined for a single component which is matched once.
+            if isRepeated or not matcher._isInclusion or len(components) != 1:
+                raise NdnRegexCompiledPattern._UntranslatableError()
+            translation.componentGroups.append(
+              (translation.addGroup(), components[0]))
+            translation.pieces.append("(")
+
+        isAny = False
+        if matcher._isInclusion:
+            for component in components:
+                if component._expr == "" or component._expr == ".*":
+                    # This matches any component.
+                    isAny = True
+                    break
+
+        if isAny:
+            translation.pieces.append(-1)
+        else:
+            key = (tuple(component._expr for component in components),
+                   matcher._isInclusion)
+            index = self._componentSetIndexes.get(key)
+            if index == None:
+                index = len(self._componentSets)
+                self._componentSets.append(
+                  ([component._componentRegex for component in components],
+                   matcher._isInclusion))
+                self._componentSetIndexes[key] = index
+            translation.pieces.append(index)
+
+        if hasRegexGroups:
+            translation.pieces.append(")")
+
+    @staticmethod
+    def _quantifier(repeatMin, repeatMax):
+        """
+        Get the re quantifier for the NdnRegexRepeatMatcher repeat range.
+
+        :rtype: str
+        """
+        # This is the MAX_REPETITIONS in NdnRegexRepeatMatcher.
+        isUnbounded = (repeatMax >= 32767)
+
+        if repeatMin == 1 and repeatMax == 1:
+            return ""
+        elif repeatMin == 0 and repeatMax == 1:
+            return "?"
+        elif repeatMin == 0 and isUnbounded:
+            return "*"
+        elif repeatMin == 1 and isUnbounded:
+            return "+"
+        elif isUnbounded:
+            return "{" + str(repeatMin) + ",}"
+        else:
+            return "{" + str(repeatMin) + "," + str(repeatMax) + "}"
+
+    class _Translation(object):
+        """
+        A _Translation holds the re pattern for one NdnRegexPatternListMatcher
+        and the groups which set the match result of its matchers.
+        """
+        def __init__(self):
+            # The list of str, or int for the index of a component set flag
+            # where -1 is for any component.
+            self.pieces = []
+            # The list of (groupNumber, NdnRegexBackrefMatcher).
+            self.backrefGroups = []
+            # The list of (groupNumber, NdnRegexComponentMatcher).
+            self.componentGroups = []
+            self._nGroups = 0
+            self._regex = None
+            self._blockWidth = 1
+
+        def addGroup(self):
+            """
+            Get the number of the next capturing group.
+
+            :rtype: int
+            """
+            self._nGroups += 1
+            return self._nGroups
+
+        def finish(self, blockWidth):
+            """
+            Compile the re pattern from the pieces.
+
+            :param int blockWidth: The number of characters for each component.
+            """
+            nFlags = blockWidth - 1
+            pattern = ""
+            for piece in self.pieces:
+                if piece == -1:
+                    pattern += "/" + ".{" + str(nFlags) + "}"
+                elif type(piece) is int:
+                    pattern += ("/" + ".{" + str(piece) + "}1" +
+                                ".{" + str(nFlags - piece - 1) + "}")
+                else:
+                    pattern += piece
+
+            self._regex = re.compile("(?:" + pattern + ")\\Z", re.DOTALL)
+            self._blockWidth = blockWidth
+
+        def match(self, name, encoding):
+            """
+            Match the encoded name, and on a match set the match results.
+
+            :param Name name: The name which was encoded.
+            :param str encoding: The encoded name.
+            :return: True for a match.
+            :rtype: bool
+            """
+            result = self._regex.match(encoding)
+            if result == None:
+                return False
+
+            for groupNumber, backrefMatcher in self.backrefGroups:
+                start, end = result.span(groupNumber)
+                backrefMatcher._matchResult = []
+                if start >= 0:
+                    for i in range(start // self._blockWidth,
+                                   end // self._blockWidth):
+                        backrefMatcher._matchResult.append(name.get(i))
+
+            for groupNumber, componentMatcher in self.componentGroups:
+                i = result.start(groupNumber) // self._blockWidth
+                subResult = componentMatcher._componentRegex.search(
+                  name.get(i).toEscapedString())
+                for j in range(1, componentMatcher._componentRegex.groups + 1):
+                    componentMatcher._pseudoMatchers[j].resetMatchResult()
+                    componentMatcher._pseudoMatchers[j].setMatchResult(
+                      subResult.group(j))
+
+            return True
+
+    class _UntranslatableError(Exception):
+        """
+        An _UntranslatableError is raised while translating an expression which
+        can't be translated.
+        """
+        pass
@@ -22,6 +22,7 @@ from pyndn.name import Name
 from pyndn.util.regex.ndn_regex_matcher_base import NdnRegexMatcherBase
 from pyndn.util.regex.ndn_regex_backref_manager import NdnRegexBackrefManager
 from pyndn.util.regex.ndn_regex_pattern_list_matcher import NdnRegexPatternListMatcher
+from pyndn.util.regex.ndn_regex_compiled_pattern import NdnRegexCompiledPattern
 
 class NdnRegexTopMatcher(NdnRegexMatcherBase):
     """
@@ -38,6 +39,9 @@ class NdnRegexTopMatcher(NdnRegexMatcherBase):
         self._primaryBackrefManager = NdnRegexBackrefManager()
         self._secondaryBackrefManager = NdnRegexBackrefManager()
         self._isSecondaryUsed = False
+        # The translation of the matchers to Python re patterns, or None to use
+        # the matchers.
+        self._compiledPattern = None
 
         self._expand = expand
 
@@ -54,6 +58,16 @@ class NdnRegexTopMatcher(NdnRegexMatcherBase):
 
         self._matchResult = []
 
+        if self._compiledPattern != None:
+            matchedPattern = self._compiledPattern.match(name)
+            if matchedPattern < 0:
+                return False
+
+            self._isSecondaryUsed = (matchedPattern == 1)
+            for i in range(name.size()):
+                self._matchResult.append(name.get(i))
+            return True
+
         if self._primaryMatcher.match(name, 0, name.size()):
             self._matchResult = []
             for component in self._primaryMatcher.getMatchResult():
@@ -148,6 +162,9 @@ class NdnRegexTopMatcher(NdnRegexMatcherBase):
         self._primaryMatcher = NdnRegexPatternListMatcher(
            expr, self._primaryBackrefManager)
 
+        self._compiledPattern = NdnRegexCompiledPattern.create(
+          self._primaryMatcher, self._secondaryMatcher)
+
     @staticmethod
     def _getItemFromExpand(expand, offset):
         """
@@ -61,6 +61,17 @@ with a proper error code.  The following errors are possible:
 - `SEGMENT_VERIFICATION_FAILED`: if any retrieved segment fails
   the user-provided VerifySegment callback or KeyChain verifyData.
 
+If a SegmentFetcher.Options is given to fetch, then the segments after the
+first are fetched with a pipeline instead of one at a time. The number of
+Interests in flight is a congestion window which is adjusted with AIMD
+(additive increase, multiplicative decrease). The window is decreased on a
+timeout or when a Data packet has a congestion mark, at most once per window of
+Interests. The Interest lifetime is the retransmission timeout from an estimate
+of the round-trip time. An Interest which times out is retransmitted, and
+INTEREST_TIMEOUT is only reported if no Data is received for
+Options.maxTimeout milliseconds. Segments which arrive out of order are kept
+until the content can be assembled.
+
 In order to validate individual segments, a KeyChain needs to be supplied. If
 verifyData fails, the fetching process is aborted with
 SEGMENT_VERIFICATION_FAILED. If data validation is not required, pass None.
@@ -79,8 +90,11 @@ Example:
 """
 
 import logging
+from collections import deque
+from pyndn.name import Name
 from pyndn.interest import Interest
 from pyndn.util.blob import Blob
+from pyndn.util.common import Common
 
 class SegmentFetcher(object):
     """
@@ -112,15 +126,78 @@ class SegmentFetcher(object):
       handle any exceptions.
     :type onError: function object
     """
-    def __init__(self, face, validatorKeyChain, verifySegment, onComplete, onError):
+    def __init__(self, face, validatorKeyChain, verifySegment, onComplete, onError,
+                 options = None):
         self._face = face
         self._validatorKeyChain = validatorKeyChain
         self._verifySegment = verifySegment
         self._onComplete = onComplete
         self._onError = onError
+        self._options = options
 
         self._contentParts = [] # of Blob
 
+        # The following are only used for the pipeline when options is not None.
+        self._isStopped = False
+        self._baseInterest = None
+        self._versionedPrefix = None
+        self._finalSegment = None
+        self._nextSegment = 0
+        # The key is the segment number. The value is a _PendingSegment.
+        self._segmentsInFlight = {}
+        # The segment numbers to retransmit.
+        self._retransmitQueue = deque()
+        # The key is the segment number. The value is the content Blob. This
+        # holds the segments received out of order until all are received.
+        self._receivedSegments = {}
+        self._lastProgressTime = 0.0
+        if options != None:
+            self._rttEstimator = _RttEstimator(options)
+            self._cwnd = options.initCwnd
+            self._ssthresh = options.initSsthresh
+            # Don't decrease the window again for segments up to this one.
+            self._recoveryPoint = -1
+
+    class Options(object):
+        """
+        Create a new SegmentFetcher.Options with the default settings for
+        fetching with a pipeline. Change the attributes as needed and pass this
+        to SegmentFetcher.fetch. The attributes are:
+
+        - initCwnd: The initial congestion window size, as a number of
+          Interests. The default is 1.0.
+        - initSsthresh: The initial slow start threshold. The default is
+          infinity.
+        - aiStep: The additive increase step. In slow start, the window grows
+          by aiStep for each received segment. Otherwise it grows by
+          aiStep / cwnd. The default is 1.0.
+        - mdCoef: The multiplicative decrease coefficient. The default is 0.5.
+        - resetCwndToInit: If True, then on a decrease set the window to
+          initCwnd instead of the new slow start threshold. The default is
+          False.
+        - ignoreCongestionMarks: If True, don't decrease the window when a
+          Data packet has a congestion mark. The default is False.
+        - maxTimeout: The maximum milliseconds to wait for the next Data packet
+          before reporting INTEREST_TIMEOUT. The default is 60000.0.
+        - initialRto: The retransmission timeout in milliseconds until there is
+          an RTT measurement. The default is 1000.0.
+        - minRto: The minimum retransmission timeout in milliseconds. The
+          default is 200.0.
+        - maxRto: The maximum retransmission timeout in milliseconds. The
+          default is 60000.0.
+        """
+        def __init__(self):
+            self.initCwnd = 1.0
+            self.initSsthresh = float("inf")
+            self.aiStep = 1.0
+            self.mdCoef = 0.5
+            self.resetCwndToInit = False
+            self.ignoreCongestionMarks = False
+            self.maxTimeout = 60000.0
+            self.initialRto = 1000.0
+            self.minRto = 200.0
+            self.maxRto = 60000.0
+
     class ErrorCode(object):
         """
         An ErrorCode value is passed in the onError callback.
@@ -139,13 +216,13 @@ class SegmentFetcher(object):
 
     @staticmethod
     def fetch(face, baseInterest, validatorKeyChainOrVerifySegment, onComplete,
-              onError):
+              onError, options = None):
         """
         Initiate segment fetching. For more details, see the documentation for
         the module. There are two forms of fetch:
-        fetch(face, baseInterest, validatorKeyChain, onComplete, onError)
+        fetch(face, baseInterest, validatorKeyChain, onComplete, onError [, options])
         and
-        fetch(face, baseInterest, verifySegment, onComplete, onError)
+        fetch(face, baseInterest, verifySegment, onComplete, onError [, options])
 
         :param Face face: This calls face.expressInterest to fetch more segments.
         :param Interest baseInterest: An Interest for the initial segment of the
@@ -181,18 +258,25 @@ class SegmentFetcher(object):
           for better error handling the callback should catch and properly
           handle any exceptions.
         :type onError: function object
+        :param SegmentFetcher.Options options: (optional) If not None, fetch the
+          segments with a pipeline using these options. If omitted or None,
+          fetch one segment at a time and call onError on the first timeout.
         """
         # Import KeyChain here to avoid import loops.
         from pyndn.security.key_chain import KeyChain
         if (validatorKeyChainOrVerifySegment == None or
             isinstance(validatorKeyChainOrVerifySegment, KeyChain)):
-            SegmentFetcher(
+            fetcher = SegmentFetcher(
               face, validatorKeyChainOrVerifySegment,
-              SegmentFetcher.DontVerifySegment, onComplete,
-              onError)._fetchFirstSegment(baseInterest)
+              SegmentFetcher.DontVerifySegment, onComplete, onError, options)
         else:
-            SegmentFetcher(face, None, validatorKeyChainOrVerifySegment,
-              onComplete, onError)._fetchFirstSegment(baseInterest)
+            fetcher = SegmentFetcher(face, None, validatorKeyChainOrVerifySegment,
+              onComplete, onError, options)
+
+        if options != None:
+            fetcher._startPipeline(baseInterest)
+        else:
+            fetcher._fetchFirstSegment(baseInterest)
 
     def _fetchFirstSegment(self, baseInterest):
         interest = Interest(baseInterest)
@@ -286,20 +370,9 @@ class SegmentFetcher(object):
 
                     if currentSegment == finalSegmentNumber:
                         # We are finished.
-
-                        # Get the total size and concatenate to get content.
-                        totalSize = 0
-                        for i in range(len(self._contentParts)):
-                            totalSize += self._contentParts[i].size()
-                        content = bytearray(totalSize)
-                        offset = 0
-                        for i in range(len(self._contentParts)):
-                            part = self._contentParts[i]
-                            content[offset:offset + part.size()] = part.buf()
-                            offset += part.size()
-
                         try:
-                            self._onComplete(Blob(content, False))
+                            self._onComplete(
+                              SegmentFetcher._concatenate(self._contentParts))
                         except:
                             logging.exception("Error in onComplete")
                         return
@@ -309,22 +382,318 @@ class SegmentFetcher(object):
                   originalInterest, data.getName(), expectedSegmentNumber + 1)
 
     def _onValidationFailed(self, data, reason):
-        try:
-            self._onError(
-              self.ErrorCode.SEGMENT_VERIFICATION_FAILED,
-               "Segment verification failed for " + data.getName().toUri() +
-               " . Reason: " + reason)
-        except:
-            logging.exception("Error in onError")
+        self._reportError(
+          self.ErrorCode.SEGMENT_VERIFICATION_FAILED,
+           "Segment verification failed for " + data.getName().toUri() +
+           " . Reason: " + reason)
 
     def _onTimeout(self, interest):
+        self._reportError(
+          self.ErrorCode.INTEREST_TIMEOUT,
+           "Time out for interest " + interest.getName().toUri())
+
+    def _startPipeline(self, baseInterest):
+        """
+        Start fetching with the pipeline. Send the Interest to discover the
+        version, then fetch the segments with the congestion window.
+
+        :param Interest baseInterest: The Interest given to fetch.
+        """
+        self._baseInterest = Interest(baseInterest)
+        self._lastProgressTime = Common.getNowMilliseconds()
+        self._sendDiscoveryInterest()
+
+    def _sendDiscoveryInterest(self):
+        interest = Interest(self._baseInterest)
+        interest.setChildSelector(1)
+        interest.setMustBeFresh(True)
+        self._face.expressInterest(
+          interest, self._onDiscoveryData, self._onDiscoveryTimeout)
+
+    def _onDiscoveryData(self, interest, data):
+        if self._isStopped:
+            return
+
+        self._lastProgressTime = Common.getNowMilliseconds()
+        self._verifyData(data, self._onDiscoveryVerified)
+
+    def _onDiscoveryVerified(self, data):
+        if self._isStopped:
+            return
+
+        if not self._endsWithSegmentNumber(data.getName()):
+            self._reportError(
+              self.ErrorCode.DATA_HAS_NO_SEGMENT,
+               "Got an unexpected packet without a segment number: " +
+               data.getName().toUri())
+            return
+
+        self._versionedPrefix = data.getName().getPrefix(-1)
+        self._receiveSegment(data)
+        self._sendInterests()
+
+    def _onDiscoveryTimeout(self, interest):
+        if self._isStopped:
+            return
+
+        if (Common.getNowMilliseconds() - self._lastProgressTime >=
+            self._options.maxTimeout):
+            self._onTimeout(interest)
+            return
+
+        self._sendDiscoveryInterest()
+
+    def _sendInterests(self):
+        """
+        Send Interests for segments to retransmit and new segments while the
+        number in flight is less than the congestion window.
+        """
+        while (not self._isStopped and
+               len(self._segmentsInFlight) < max(1, int(self._cwnd))):
+            if len(self._retransmitQueue) > 0:
+                segment = self._retransmitQueue.popleft()
+                if (segment in self._receivedSegments or
+                    segment in self._segmentsInFlight):
+                    continue
+                isRetransmitted = True
+            else:
+                if (self._finalSegment != None and
+                    self._nextSegment > self._finalSegment):
+                    # All segments are requested.
+                    return
+
+                segment = self._nextSegment
+                self._nextSegment += 1
+                if segment in self._receivedSegments:
+                    # We already got this, e.g. from the discovery Interest.
+                    continue
+                isRetransmitted = False
+
+            self._sendSegmentInterest(segment, isRetransmitted)
+
+    def _sendSegmentInterest(self, segment, isRetransmitted):
+        # Start with the base Interest to preserve any special selectors.
+        interest = Interest(self._baseInterest)
+        interest.setChildSelector(0)
+        interest.setMustBeFresh(False)
+        interest.setName(Name(self._versionedPrefix).appendSegment(segment))
+        interest.setInterestLifetimeMilliseconds(
+          self._rttEstimator.getEstimatedRto())
+
+        # Add to segmentsInFlight before expressInterest in case it calls the
+        # callback immediately.
+        pendingSegment = _PendingSegment(
+          Common.getNowMilliseconds(), isRetransmitted)
+        self._segmentsInFlight[segment] = pendingSegment
+        pendingSegment.pendingInterestId = self._face.expressInterest(
+          interest, self._onSegmentData, self._onSegmentTimeout)
+
+    def _onSegmentData(self, interest, data):
+        if self._isStopped:
+            return
+
+        now = Common.getNowMilliseconds()
+        self._lastProgressTime = now
+        segment = interest.getName().get(-1).toSegment()
+        pendingSegment = self._segmentsInFlight.pop(segment, None)
+        if pendingSegment != None and not pendingSegment.isRetransmitted:
+            # Only measure the RTT of an Interest which was sent once.
+            self._rttEstimator.addMeasurement(now - pendingSegment.sendTime)
+
+        if (data.getCongestionMark() > 0 and
+            not self._options.ignoreCongestionMarks):
+            self._decreaseWindow(segment)
+        else:
+            self._increaseWindow()
+
+        self._verifyData(data, self._onSegmentVerified)
+        # Keep the pipeline full while the segment is verified.
+        self._sendInterests()
+
+    def _onSegmentVerified(self, data):
+        if self._isStopped:
+            return
+
+        self._receiveSegment(data)
+        self._sendInterests()
+
+    def _onSegmentTimeout(self, interest):
+        if self._isStopped:
+            return
+
+        segment = interest.getName().get(-1).toSegment()
+        if self._segmentsInFlight.pop(segment, None) == None:
+            # We are not waiting for this segment.
+            return
+
+        if (Common.getNowMilliseconds() - self._lastProgressTime >=
+            self._options.maxTimeout):
+            self._onTimeout(interest)
+            return
+
+        self._rttEstimator.backoffRto()
+        self._decreaseWindow(segment)
+        self._retransmitQueue.append(segment)
+        self._sendInterests()
+
+    def _increaseWindow(self):
+        if self._cwnd < self._ssthresh:
+            # Slow start.
+            self._cwnd += self._options.aiStep
+        else:
+            # Congestion avoidance.
+            self._cwnd += self._options.aiStep / self._cwnd
+
+    def _decreaseWindow(self, segment):
+        """
+        Decrease the congestion window because of a timeout or congestion mark
+        for the segment. To react once per congestion event, only decrease if
+        the segment was requested after the last decrease.
+
+        :param int segment: The segment number.
+        """
+        if segment <= self._recoveryPoint:
+            return
+
+        self._ssthresh = max(2.0, self._cwnd * self._options.mdCoef)
+        self._cwnd = (self._options.initCwnd if self._options.resetCwndToInit
+                      else self._ssthresh)
+        self._recoveryPoint = self._nextSegment - 1
+
+    def _receiveSegment(self, data):
+        """
+        Save the content of the verified segment Data packet. If all the
+        segments are received, call onComplete.
+
+        :param Data data: The verified Data packet.
+        """
+        try:
+            segment = data.getName().get(-1).toSegment()
+        except RuntimeError as ex:
+            self._reportError(
+              self.ErrorCode.DATA_HAS_NO_SEGMENT,
+               "Error decoding the name segment number " +
+               data.getName().get(-1).toEscapedString() + ": " + str(ex))
+            return
+
+        if data.getMetaInfo().getFinalBlockId().getValue().size() > 0:
+            try:
+                finalSegment = data.getMetaInfo().getFinalBlockId().toSegment()
+            except RuntimeError as ex:
+                self._reportError(
+                  self.ErrorCode.DATA_HAS_NO_SEGMENT,
+                   "Error decoding the FinalBlockId segment number " +
+                   data.getMetaInfo().getFinalBlockId().toEscapedString() +
+                   ": " + str(ex))
+                return
+
+            if finalSegment != self._finalSegment:
+                self._setFinalSegment(finalSegment)
+
+        if self._finalSegment != None and segment > self._finalSegment:
+            return
+        self._receivedSegments[segment] = data.getContent()
+
+        if (self._finalSegment != None and
+            len(self._receivedSegments) == self._finalSegment + 1):
+            # We are finished.
+            contentParts = [self._receivedSegments[i]
+                            for i in range(self._finalSegment + 1)]
+            self._stop()
+            try:
+                self._onComplete(SegmentFetcher._concatenate(contentParts))
+            except:
+                logging.exception("Error in onComplete")
+
+    def _setFinalSegment(self, finalSegment):
+        """
+        Set the final segment number and remove the Interests for segments
+        past it.
+
+        :param int finalSegment: The final segment number.
+        """
+        self._finalSegment = finalSegment
+        for segment in list(self._segmentsInFlight.keys()):
+            if segment > finalSegment:
+                self._removeSegmentInFlight(segment)
+        for segment in list(self._receivedSegments.keys()):
+            if segment > finalSegment:
+                del self._receivedSegments[segment]
+
+    def _removeSegmentInFlight(self, segment):
+        pendingSegment = self._segmentsInFlight.pop(segment)
+        if pendingSegment.pendingInterestId != None:
+            self._face.removePendingInterest(pendingSegment.pendingInterestId)
+
+    def _verifyData(self, data, onVerified):
+        """
+        Verify the Data packet with the validatorKeyChain or verifySegment and
+        call onVerified(data) if it passes. Otherwise report
+        SEGMENT_VERIFICATION_FAILED.
+
+        :param Data data: The Data packet to verify.
+        :param onVerified: Call onVerified(data) if verification passes.
+        :type onVerified: function object
+        """
+        if self._validatorKeyChain != None:
+            try:
+                self._validatorKeyChain.verifyData(
+                  data, onVerified, self._onValidationFailed)
+            except:
+                logging.exception("Error in KeyChain.verifyData")
+        else:
+            if not self._verifySegment(data):
+                self._reportError(
+                  self.ErrorCode.SEGMENT_VERIFICATION_FAILED,
+                  "Segment verification failed")
+                return
+
+            onVerified(data)
+
+    def _stop(self):
+        """
+        Stop the pipeline and remove the Interests in flight.
+        """
+        self._isStopped = True
+        for segment in list(self._segmentsInFlight.keys()):
+            self._removeSegmentInFlight(segment)
+        self._retransmitQueue.clear()
+
+    def _reportError(self, errorCode, message):
+        """
+        Stop fetching and call onError(errorCode, message).
+        """
+        if self._isStopped:
+            return
+
+        self._stop()
         try:
-            self._onError(
-              self.ErrorCode.INTEREST_TIMEOUT,
-               "Time out for interest " + interest.getName().toUri())
+            self._onError(errorCode, message)
         except:
             logging.exception("Error in onError")
 
+    @staticmethod
+    def _concatenate(contentParts):
+        """
+        Concatenate the content of the segments.
+
+        :param contentParts: The content of each segment, in order.
+        :type contentParts: list of Blob
+        :return: The concatenated content.
+        :rtype: Blob
+        """
+        # Get the total size and concatenate to get content.
+        totalSize = 0
+        for part in contentParts:
+            totalSize += part.size()
+        content = bytearray(totalSize)
+        offset = 0
+        for part in contentParts:
+            content[offset:offset + part.size()] = part.buf()
+            offset += part.size()
+
+        return Blob(content, False)
+
     @staticmethod
     def _endsWithSegmentNumber(name):
         """
@@ -335,3 +704,68 @@ class SegmentFetcher(object):
         :rtype: bool
         """
         return (name.size() >= 1 and name.get(-1).isSegment())
+
+class _PendingSegment(object):
+    """
+    A _PendingSegment holds the info for the Interest in flight for a segment.
+
+    :param float sendTime: The time when the Interest was sent, in
+      milliseconds.
+    :param bool isRetransmitted: True if the Interest is a retransmission.
+    """
+    def __init__(self, sendTime, isRetransmitted):
+        self.sendTime = sendTime
+        self.isRetransmitted = isRetransmitted
+        self.pendingInterestId = None
+
+class _RttEstimator(object):
+    """
+    An _RttEstimator computes the retransmission timeout from measurements of
+    the round-trip time, following RFC 6298.
+
+    :param SegmentFetcher.Options options: The options with initialRto, minRto
+      and maxRto.
+    """
+    def __init__(self, options):
+        self._minRto = options.minRto
+        self._maxRto = options.maxRto
+        self._sRtt = None
+        self._rttVar = 0.0
+        self._rto = options.initialRto
+
+    ALPHA = 0.125
+    BETA = 0.25
+    K = 4
+
+    def addMeasurement(self, rtt):
+        """
+        Update the estimate with a new RTT measurement.
+
+        :param float rtt: The round-trip time in milliseconds.
+        """
+        if self._sRtt == None:
+            self._sRtt = rtt
+            self._rttVar = rtt / 2.0
+        else:
+            self._rttVar = ((1 - _RttEstimator.BETA) * self._rttVar +
+                            _RttEstimator.BETA * abs(self._sRtt - rtt))
+            self._sRtt = ((1 - _RttEstimator.ALPHA) * self._sRtt +
+                          _RttEstimator.ALPHA * rtt)
+
+        self._rto = min(self._maxRto, max(self._minRto,
+          self._sRtt + _RttEstimator.K * self._rttVar))
+
+    def backoffRto(self):
+        """
+        Double the retransmission timeout after a timeout, up to maxRto.
+        """
+        self._rto = min(self._maxRto, self._rto * 2)
+
+    def getEstimatedRto(self):
+        """
+        Get the current retransmission timeout.
+
+        :return: The retransmission timeout in milliseconds.
+        :rtype: float
+        """
+        return self._rto
@@ -76,7 +76,7 @@ class InMemoryStorageFace(Face):
         self._sentData.append(Data(data))
 
     def callLater(self, delayMilliseconds, callback):
-        self._delayedCallTable.callLater(delayMilliseconds, callback)
+        return self._delayedCallTable.callLater(delayMilliseconds, callback)
 
     def processEvents(self):
         self._delayedCallTable.callTimedOut()
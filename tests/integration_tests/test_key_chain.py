@@ -20,7 +20,12 @@
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
 import unittest as ut
-from pyndn import Name
+from concurrent.futures import ThreadPoolExecutor
+from pyndn import Name, Data
+from pyndn.encoding import TlvWireFormat
+from pyndn.security import SigningInfo
+from pyndn.security.verification_helpers import VerificationHelpers
+from pyndn.util.signed_blob import SignedBlob
 from pyndn.security.pib.pib import Pib
 from pyndn.security.v2 import CertificateV2
 from pyndn.util.common import Common
@@ -198,5 +203,30 @@ class TestKeyChain(ut.TestCase):
         self.assertTrue(certificate.getValidityPeriod().getNotAfter() >
           Common.getNowMilliseconds() + 10 * 365 * 24 * 3600 * 1000.0)
 
+    def test_sign_batch(self):
+        identity = self._fixture.addIdentity(
+          Name("/Security/V2/TestKeyChain/SignBatch"))
+        certificate = identity.getDefaultKey().getDefaultCertificate()
+
+        for executor in [None, ThreadPoolExecutor(4)]:
+            datas = [Data(Name("/Security/V2/TestKeyChain/SignBatch/data")
+                          .appendSegment(i)) for i in range(10)]
+            self._fixture._keyChain.signBatch(
+              datas, SigningInfo(identity), executor = executor)
+            if executor != None:
+                executor.shutdown()
+
+            for data in datas:
+                self.assertTrue(data.getSignature().getKeyLocator().getKeyName()
+                  .equals(certificate.getKeyName()))
+                self.assertTrue(VerificationHelpers.verifyDataSignature(
+                  data, certificate))
+                # The spliced encoding must match a full encoding.
+                encoding = SignedBlob(*TlvWireFormat.get().encodeData(data))
+                wireEncoding = data.wireEncode()
+                self.assertTrue(encoding.equals(wireEncoding))
+                self.assertEqual(
+                  encoding.toSignedBytes(), wireEncoding.toSignedBytes())
+
 if __name__ == '__main__':
     ut.main(verbosity=2)
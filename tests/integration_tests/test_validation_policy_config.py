@@ -222,3 +222,82 @@ class TestValidationPolicyConfig(ut.TestCase):
           Name("/SecurityTestSecRule/Basic/KEY/123"))
         result.checkPolicy(validator)
         self.assertTrue(result._calledFailure and not result.calledContinue_)
+
+    def test_rule_order(self):
+        # Set up the validator. The regex rule is first, so it is checked
+        # before the relation rule for names under /Test/Regex.
+        fetcher = CertificateFetcherOffline()
+        validator = ValidatorConfig(fetcher)
+        validator.load("""
+validator
+{
+  rule
+  {
+    id "Regex rule"
+    for data
+    filter
+    {
+      type name
+      regex ^<Test><Regex>
+    }
+    checker
+    {
+      type customized
+      sig-type rsa-sha256
+      key-locator
+      {
+        type name
+        name /RegexSigner
+        relation is-prefix-of
+      }
+    }
+  }
+  rule
+  {
+    id "Relation rule"
+    for data
+    filter
+    {
+      type name
+      name /Test
+      relation is-prefix-of
+    }
+    checker
+    {
+      type customized
+      sig-type rsa-sha256
+      key-locator
+      {
+        type name
+        name /RelationSigner
+        relation is-prefix-of
+      }
+    }
+  }
+}
+""", "test_rule_order")
+
+        # Set up a Data packet and result object.
+        data = Data()
+        KeyLocator.getFromSignature(data.getSignature()).setType(KeyLocatorType.KEYNAME)
+        result = TestValidationResult(data)
+
+        # Check twice so that the second check uses the cached rule.
+        for i in range(2):
+            data.setName(Name("/Test/Regex/Data"))
+            KeyLocator.getFromSignature(data.getSignature()).setKeyName(
+              Name("/RegexSigner/KEY/123"))
+            result.checkPolicy(validator)
+            self.assertTrue(result.calledContinue_ and not result._calledFailure)
+            KeyLocator.getFromSignature(data.getSignature()).setKeyName(
+              Name("/RelationSigner/KEY/123"))
+            result.checkPolicy(validator)
+            self.assertTrue(result._calledFailure and not result.calledContinue_)
+
+            data.setName(Name("/Test/Other/Data"))
+            result.checkPolicy(validator)
+            self.assertTrue(result.calledContinue_ and not result._calledFailure)
+
+            data.setName(Name("/Other/Data"))
+            result.checkPolicy(validator)
+            self.assertTrue(result._calledFailure and not result.calledContinue_)
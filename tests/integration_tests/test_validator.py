@@ -20,9 +20,12 @@
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
 import unittest as ut
+from concurrent.futures import ThreadPoolExecutor
 from pyndn import Name, Data, Interest, NetworkNack, ContentType, ValidityPeriod
 from pyndn.security import SigningInfo, RsaKeyParams
 from pyndn.security.v2 import CertificateV2, ValidationPolicySimpleHierarchy
+from pyndn.security.v2 import ValidationError, VerifiedDataCache
+from pyndn.util import Blob
 from pyndn.util.common import Common
 from .hierarchical_validator_fixture import HierarchicalValidatorFixture
 
@@ -223,6 +226,153 @@ class TestValidator(ut.TestCase):
         self.assertTrue(len(self._fixture._face._sentInterests) > 1)
         self._fixture._face._sentInterests = []
 
+    def test_validate_batch(self):
+        for executor in [None, ThreadPoolExecutor(max_workers = 2)]:
+            self.setUp()
+            packets = []
+            for i in range(5):
+                data = Data(Name("/Security/V2/ValidatorFixture/Sub1/Sub2/Data")
+                  .appendSegment(i))
+                self._fixture._keyChain.sign(
+                  data, SigningInfo(self._fixture._subIdentity))
+                packets.append(data)
+            # Change the content after signing so that the signature is invalid.
+            packets[2].setContent(Blob([1]))
+
+            errors = {}
+            doneCount = [0]
+            def onEach(data, error):
+                errors[data.getName().get(-1).toSegment()] = error
+            def onDone():
+                doneCount[0] += 1
+
+            self._fixture._validator.validateBatch(
+              packets, onEach, onDone, executor)
+            if executor != None:
+                executor.shutdown()
+
+            self.assertEqual(1, doneCount[0])
+            self.assertEqual(set(range(5)), set(errors.keys()))
+            for i in range(5):
+                if i == 2:
+                    self.assertEqual(ValidationError.INVALID_SIGNATURE,
+                                     errors[i].getCode())
+                else:
+                    self.assertEqual(None, errors[i])
+            # The certificate is fetched once for the group.
+            self.assertEqual(1, len(self._fixture._face._sentInterests))
+
+    def test_verified_data_cache(self):
+        cache = VerifiedDataCache()
+        self._fixture._validator.setVerifiedDataCache(cache)
+
+        data = Data(Name("/Security/V2/ValidatorFixture/Sub1/Sub2/Data"))
+        self._fixture._keyChain.sign(data, SigningInfo(self._fixture._subIdentity))
+
+        self.validateExpectSuccess(
+          data, "Should get accepted, as signed by the policy-compliant certificate")
+        self.assertEqual(1, cache.size())
+
+        # Without anchors or verified certificates, only the byte-identical
+        # packet is accepted.
+        self._fixture._validator.resetAnchors()
+        self._fixture._validator.resetVerifiedCertificates()
+        self.validateExpectSuccess(
+          Data(data), "Should get accepted, based on the verified data cache")
+        modifiedData = Data(data)
+        modifiedData.setContent(Blob([1]))
+        self.validateExpectFailure(
+          modifiedData, "Should fail, as the packet is not in the cache")
+
+        # Simulate a time 2 hours later, after expiration.
+        cache._setNowOffsetMilliseconds(2 * 3600 * 1000.0)
+        self.validateExpectFailure(
+          data, "Should fail, as the cache entry expired")
+
+    def test_certificate_refresh_ahead(self):
+        # Refresh 10 minutes before the certificate is removed after 1 hour.
+        self._fixture._validator.setCertificateRefreshAhead(10 * 60 * 1000.0)
+
+        data = Data(Name("/Security/V2/ValidatorFixture/Sub1/Sub2/Data"))
+        self._fixture._keyChain.sign(data, SigningInfo(self._fixture._subIdentity))
+
+        self.validateExpectSuccess(
+          data, "Should get accepted, as signed by the policy-compliant certificate")
+        self.assertEqual(1, len(self._fixture._face._sentInterests))
+        self._fixture._face._sentInterests = []
+
+        # Simulate a time 55 minutes later, inside the refresh period.
+        self._fixture._validator._setCacheNowOffsetMilliseconds(55 * 60 * 1000.0)
+        self.validateExpectSuccess(
+          data, "Should get accepted, based on the cached trusted certificate")
+        self.assertEqual(0, len(self._fixture._face._sentInterests))
+        # The second use refreshes the certificate, without waiting for it.
+        self.validateExpectSuccess(
+          data, "Should get accepted, based on the cached trusted certificate")
+        self.assertEqual(1, len(self._fixture._face._sentInterests))
+        self._fixture._face._sentInterests = []
+
+        # Disable responses from the simulated Face.
+        self._fixture._face._processInterest = None
+
+        # Simulate a time 90 minutes later, when only the refreshed certificate
+        # is still in the cache.
+        self._fixture._validator._setCacheNowOffsetMilliseconds(90 * 60 * 1000.0)
+        self.validateExpectSuccess(
+          data, "Should get accepted, based on the refreshed certificate")
+        self.assertEqual(0, len(self._fixture._face._sentInterests))
+
+    def test_prefetch_certificate_chain(self):
+        deepIdentity = self._fixture.addSubCertificate(
+          Name("/Security/V2/ValidatorFixture/Sub1/Deep2"),
+          self._fixture._subIdentity)
+        deeperIdentity = self._fixture.addSubCertificate(
+          Name("/Security/V2/ValidatorFixture/Sub1/Deep2/Deep3"), deepIdentity)
+        self._fixture._cache.insert(
+          deepIdentity.getDefaultKey().getDefaultCertificate())
+        self._fixture._cache.insert(
+          deeperIdentity.getDefaultKey().getDefaultCertificate())
+        self._fixture._validator.getFetcher().setPrefetchDepth(5)
+
+        # Simulate the network by answering the expressed interests in rounds.
+        pendingInterests = []
+        def processInterest(interest, onData, onTimeout, onNetworkNack):
+            pendingInterests.append((interest, onData, onTimeout))
+        self._fixture._face._processInterest = processInterest
+
+        data = Data(Name("/Security/V2/ValidatorFixture/Sub1/Deep2/Deep3/Data"))
+        self._fixture._keyChain.sign(data, SigningInfo(deeperIdentity))
+
+        successCount = [0]
+        def successCallback(data):
+            successCount[0] += 1
+        def failureCallback(data, error):
+            self.fail("Validation failed: " + str(error))
+
+        # Two concurrent validations share the pending interests.
+        self._fixture._validator.validate(data, successCallback, failureCallback)
+        self._fixture._validator.validate(data, successCallback, failureCallback)
+        # The Deep3 key, and the key prefixes of Deep2 and Sub1, but not the
+        # trust anchor.
+        self.assertEqual(3, len(self._fixture._face._sentInterests))
+
+        nRounds = 0
+        while len(pendingInterests) > 0:
+            nRounds += 1
+            interests = pendingInterests[:]
+            del pendingInterests[:]
+            for interest, onData, onTimeout in interests:
+                certificate = self._fixture._cache.find(interest)
+                if certificate != None:
+                    onData(interest, certificate)
+                else:
+                    onTimeout(interest)
+
+        self.assertEqual(2, successCount[0])
+        # The chain of 3 certificates is fetched in one round trip.
+        self.assertEqual(1, nRounds)
+        self.assertEqual(3, len(self._fixture._face._sentInterests))
+
     def test_infinite_certificate_chain(self):
         def processInterest(interest, onData, onTimeout, onNetworkNack):
             try:
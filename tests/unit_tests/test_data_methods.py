@@ -231,6 +231,23 @@ class TestDataDump(ut.TestCase):
         reDecodedData.wireDecode(encoding)
         self.assertEqual(dumpData(reDecodedData), initialDump, 'Re-decoded data does not match original dump')
 
+    def test_decode_lazily(self):
+        data = Data()
+        data.wireDecodeLazily(codedData)
+        self.assertEqual("/ndn/abc", data.getName().toUri())
+        # The full name only needs the wire encoding.
+        self.assertTrue(data.getFullName().getPrefix(-1).equals(data.getName()))
+
+        self.assertEqual(dumpData(data), initialDump, 'Lazily decoded data does not match original dump')
+        self.assertTrue(data.wireEncode().equals(codedData))
+
+        # Setting a field decodes the other fields first.
+        data = Data()
+        data.wireDecodeLazily(codedData)
+        data.setContent(Blob("changed"))
+        self.assertEqual(5000.0, data.getMetaInfo().getFreshnessPeriod())
+        self.assertFalse(data.wireEncode().equals(codedData))
+
     def test_empty_signature(self):
         # make sure nothing is set in the signature of newly created data
         data = Data()
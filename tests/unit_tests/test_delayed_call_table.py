@@ -0,0 +1,80 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn.impl.delayed_call_table import DelayedCallTable
+
+class TestDelayedCallTable(ut.TestCase):
+    def setUp(self):
+        self.table = DelayedCallTable()
+        self.calls = []
+
+    def makeCallback(self, value):
+        return lambda: self.calls.append(value)
+
+    def test_call_order(self):
+        self.table.callLater(3000, self.makeCallback(3))
+        self.table.callLater(1000, self.makeCallback(1))
+        self.table.callLater(2000, self.makeCallback(2))
+        self.table.callLater(1000, self.makeCallback(4))
+
+        self.table.callTimedOut()
+        self.assertEqual([], self.calls)
+
+        self.table._setNowOffsetMilliseconds(1500)
+        self.table.callTimedOut()
+        # Entries with the same call time are called in the order added.
+        self.assertEqual([1, 4], self.calls)
+
+        self.table._setNowOffsetMilliseconds(5000)
+        self.table.callTimedOut()
+        self.assertEqual([1, 4, 2, 3], self.calls)
+        self.assertEqual(0, self.table.size())
+
+    def test_cancel(self):
+        handle = self.table.callLater(1000, self.makeCallback(1))
+        self.table.callLater(2000, self.makeCallback(2))
+        handle.cancel()
+        self.assertTrue(handle.isCancelled())
+        self.assertEqual(1, self.table.size())
+        # Cancel again does nothing.
+        handle.cancel()
+        self.assertEqual(1, self.table.size())
+
+        self.table._setNowOffsetMilliseconds(5000)
+        self.table.callTimedOut()
+        self.assertEqual([2], self.calls)
+
+    def test_cancel_many(self):
+        handles = [self.table.callLater(1000 + i, self.makeCallback(i))
+                   for i in range(1000)]
+        for i in range(1000):
+            if i % 4 != 0:
+                handles[i].cancel()
+
+        self.assertEqual(250, self.table.size())
+        # Cancelled entries were removed from the heap.
+        self.assertTrue(len(self.table._table) < 1000)
+
+        self.table._setNowOffsetMilliseconds(5000)
+        self.table.callTimedOut()
+        self.assertEqual(list(range(0, 1000, 4)), self.calls)
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
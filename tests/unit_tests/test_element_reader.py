@@ -0,0 +1,112 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Data
+from pyndn.encoding.element_reader import ElementReader
+from pyndn.util import Blob
+
+class ElementListener(object):
+    def __init__(self):
+        self.elements = []
+
+    def onReceivedElement(self, element):
+        self.elements.append(Blob(element))
+
+class BatchElementListener(ElementListener):
+    def __init__(self):
+        super(BatchElementListener, self).__init__()
+        self.batchSizes = []
+
+    def onReceivedElements(self, elements):
+        self.batchSizes.append(len(elements))
+        for element in elements:
+            self.onReceivedElement(element)
+
+def makeEncodings():
+    encodings = []
+    for i in range(20):
+        data = Data(Name("/test/data").appendSegment(i))
+        # Vary the content size so that some length fields use 3 bytes.
+        data.setContent(Blob(bytearray(i * 20)))
+        encodings.append(data.wireEncode())
+    return encodings
+
+class TestElementReader(ut.TestCase):
+    def setUp(self):
+        self.encodings = makeEncodings()
+        self.stream = bytearray()
+        for encoding in self.encodings:
+            self.stream += encoding.toBytes()
+
+    def test_chunked(self):
+        for chunkSize in [1, 3, 100, 1000, len(self.stream)]:
+            listener = ElementListener()
+            reader = ElementReader(listener)
+            for i in range(0, len(self.stream), chunkSize):
+                reader.onReceivedData(self.stream[i:i + chunkSize])
+
+            self.assertEqual(self.encodings, listener.elements,
+              "Wrong elements for chunk size " + str(chunkSize))
+
+    def test_batch(self):
+        listener = BatchElementListener()
+        reader = ElementReader(listener)
+        splitOffset = len(self.stream) // 2
+        reader.onReceivedData(self.stream[:splitOffset])
+        reader.onReceivedData(self.stream[splitOffset:])
+
+        self.assertEqual(self.encodings, listener.elements)
+        self.assertEqual(2, len(listener.batchSizes))
+        self.assertEqual(len(self.encodings), sum(listener.batchSizes))
+
+    def test_exceeds_max_packet_size(self):
+        listener = ElementListener()
+        reader = ElementReader(listener)
+        # The header of a Data packet with a length larger than the maximum.
+        with self.assertRaises(ValueError):
+            reader.onReceivedData(bytearray([6, 0xfd, 0xff, 0xff]) +
+                                  bytearray(9000))
+
+        # The reader is reset to read a new element.
+        reader.onReceivedData(self.stream)
+        self.assertEqual(self.encodings, listener.elements)
+
+    def test_split_element_over_max_packet_size(self):
+        # The completing chunk takes the element past the initial allocation
+        # of the partial data buffer, which is reallocated.
+        largeData = Data(Name("/test/large"))
+        largeData.setContent(Blob(bytearray(8790)))
+        largeEncoding = largeData.wireEncode()
+        self.assertTrue(largeEncoding.size() > 8800)
+        smallEncoding = self.encodings[6]
+
+        listener = ElementListener()
+        reader = ElementReader(listener)
+        largeBytes = largeEncoding.toBytes()
+        smallBytes = smallEncoding.toBytes()
+        reader.onReceivedData(largeBytes[:8700])
+        reader.onReceivedData(largeBytes[8700:])
+        reader.onReceivedData(smallBytes[:50])
+        reader.onReceivedData(smallBytes[50:])
+
+        self.assertEqual([largeEncoding, smallEncoding], listener.elements)
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
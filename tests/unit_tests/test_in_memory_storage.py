@@ -0,0 +1,164 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+# From ndn-cxx unit tests:
+# https://github.com/named-data/ndn-cxx/blob/master/tests/unit/ims/in-memory-storage.t.cpp
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Data, Interest, DigestSha256Signature
+from pyndn.util import Blob
+from pyndn.in_memory_storage import InMemoryStorageRetaining
+from pyndn.in_memory_storage import InMemoryStorageFifo
+from pyndn.in_memory_storage import InMemoryStorageLru
+from pyndn.in_memory_storage import InMemoryStorageLfu
+
+def makeData(uri, freshnessPeriod = None):
+    data = Data(Name(uri))
+    data.setContent(Blob(bytearray([1, 2, 3])))
+    if freshnessPeriod != None:
+        data.getMetaInfo().setFreshnessPeriod(freshnessPeriod)
+    data.setSignature(DigestSha256Signature())
+    data.wireEncode()
+    return data
+
+def makeInterest(uri, canBePrefix = True, mustBeFresh = False):
+    interest = Interest(Name(uri))
+    interest.setCanBePrefix(canBePrefix)
+    interest.setMustBeFresh(mustBeFresh)
+    return interest
+
+class TestInMemoryStorage(ut.TestCase):
+    def test_find_by_prefix(self):
+        storage = InMemoryStorageRetaining()
+        for uri in ["/a/c", "/a/b/2", "/a/b/1", "/b", "/a"]:
+            storage.insert(makeData(uri))
+        self.assertEqual(5, storage.size())
+
+        self.assertEqual(Name("/a"), storage.find(Name("/a")).getName())
+        self.assertEqual(Name("/a/b/1"), storage.find(Name("/a/b")).getName())
+        self.assertEqual(None, storage.find(Name("/a/b/3")))
+        self.assertEqual(None, storage.find(Name("/c")))
+
+        # Insert the same packet again.
+        storage.insert(makeData("/a/b/1"))
+        self.assertEqual(5, storage.size())
+
+        storage.remove(Name("/a/b"))
+        self.assertEqual(3, storage.size())
+        self.assertEqual(None, storage.find(Name("/a/b")))
+        self.assertEqual(Name("/a"), storage.find(Name("/a")).getName())
+
+        fullName = makeData("/b").getFullName()
+        storage.remove(Name("/b"), False)
+        self.assertEqual(3, storage.size())
+        storage.remove(fullName, False)
+        self.assertEqual(2, storage.size())
+
+    def test_find_by_interest(self):
+        storage = InMemoryStorageRetaining()
+        data = makeData("/a/b")
+        storage.insert(data)
+        storage.insert(makeData("/a/b/c"))
+
+        self.assertEqual(Name("/a/b"),
+          storage.find(makeInterest("/a")).getName())
+        self.assertEqual(None, storage.find(makeInterest("/a", False)))
+        self.assertEqual(Name("/a/b"),
+          storage.find(makeInterest("/a/b", False)).getName())
+        self.assertEqual(Name("/a/b"), storage.find(
+          Interest(data.getFullName()).setCanBePrefix(False)).getName())
+
+        interest = makeInterest("/a")
+        interest.getExclude().appendComponent(Name("/b").get(0))
+        self.assertEqual(None, storage.find(interest))
+
+    def test_must_be_fresh(self):
+        storage = InMemoryStorageRetaining()
+        storage.insert(makeData("/a/1", 1000.0))
+        storage.insert(makeData("/a/2"), 5000.0)
+        storage.insert(makeData("/a/3"))
+
+        self.assertEqual(Name("/a/1"),
+          storage.find(makeInterest("/a", True, True)).getName())
+
+        storage._setNowOffsetMilliseconds(2000.0)
+        self.assertEqual(Name("/a/2"),
+          storage.find(makeInterest("/a", True, True)).getName())
+
+        storage._setNowOffsetMilliseconds(6000.0)
+        self.assertEqual(Name("/a/3"),
+          storage.find(makeInterest("/a", True, True)).getName())
+        # A stale packet is still found without MustBeFresh.
+        self.assertEqual(Name("/a/1"),
+          storage.find(makeInterest("/a", True, False)).getName())
+
+    def test_fifo(self):
+        storage = InMemoryStorageFifo(2)
+        storage.insert(makeData("/1"))
+        storage.insert(makeData("/2"))
+        storage.find(Name("/1"))
+        storage.insert(makeData("/3"))
+
+        self.assertEqual(2, storage.size())
+        self.assertEqual(None, storage.find(Name("/1")))
+        self.assertNotEqual(None, storage.find(Name("/2")))
+        self.assertNotEqual(None, storage.find(Name("/3")))
+
+    def test_lru(self):
+        storage = InMemoryStorageLru(2)
+        storage.insert(makeData("/1"))
+        storage.insert(makeData("/2"))
+        storage.find(Name("/1"))
+        storage.insert(makeData("/3"))
+
+        self.assertEqual(2, storage.size())
+        self.assertNotEqual(None, storage.find(Name("/1")))
+        self.assertEqual(None, storage.find(Name("/2")))
+        self.assertNotEqual(None, storage.find(Name("/3")))
+
+    def test_lfu(self):
+        storage = InMemoryStorageLfu(2)
+        storage.insert(makeData("/1"))
+        storage.insert(makeData("/2"))
+        storage.find(Name("/2"))
+        storage.find(Name("/1"))
+        storage.find(Name("/1"))
+        storage.insert(makeData("/3"))
+
+        self.assertEqual(2, storage.size())
+        self.assertNotEqual(None, storage.find(Name("/1")))
+        self.assertEqual(None, storage.find(Name("/2")))
+        self.assertNotEqual(None, storage.find(Name("/3")))
+
+        storage.remove(Name("/3"))
+        self.assertEqual(1, storage.size())
+        storage.insert(makeData("/4"))
+        self.assertEqual(2, storage.size())
+
+    def test_byte_limit(self):
+        nBytes = makeData("/1").wireEncode().size()
+        storage = InMemoryStorageFifo(None, 2 * nBytes)
+        for uri in ["/1", "/2", "/3"]:
+            storage.insert(makeData(uri))
+
+        self.assertEqual(2, storage.size())
+        self.assertEqual(2 * nBytes, storage.getByteSize())
+        self.assertEqual(None, storage.find(Name("/1")))
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
@@ -0,0 +1,118 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Interest, InterestFilter, ComponentType
+from pyndn.impl.interest_filter_table import InterestFilterTable
+
+def onInterest4(prefix, interest, face, interestFilterId):
+    pass
+
+def onInterest5(prefix, interest, face, interestFilterId, filter):
+    pass
+
+class OnInterestObject(object):
+    def onInterest(self, prefix, interest, face, interestFilterId, filter):
+        pass
+
+    def __call__(self, prefix, interest, face, interestFilterId):
+        pass
+
+class TestInterestFilterTable(ut.TestCase):
+    def setUp(self):
+        self.table = InterestFilterTable()
+
+    def set(self, interestFilterId, filter):
+        self.table.setInterestFilter(interestFilterId, filter, onInterest5, None)
+
+    def match(self, interestName):
+        matchedFilters = []
+        self.table.getMatchedFilters(Interest(interestName), matchedFilters)
+        return [entry.getInterestFilterId() for entry in matchedFilters]
+
+    def test_nested_prefixes(self):
+        self.set(1, InterestFilter(Name("/a/b")))
+        self.set(2, InterestFilter(Name("/")))
+        self.set(3, InterestFilter(Name("/a")))
+        self.set(4, InterestFilter(Name("/a/b/c/d")))
+        self.set(5, InterestFilter(Name("/a/b")))
+        self.set(6, InterestFilter(Name("/b")))
+
+        # The matches are in the order the filters were added.
+        self.assertEqual([1, 2, 3, 5], self.match(Name("/a/b/c")))
+        self.assertEqual([2, 3], self.match(Name("/a")))
+        self.assertEqual([2], self.match(Name("/")))
+
+    def test_regex_filter(self):
+        self.set(1, InterestFilter(Name("/a"), "<b><>+"))
+
+        self.assertEqual([1], self.match(Name("/a/b/c")))
+        self.assertEqual([1], self.match(Name("/a/b/c/d")))
+        # The regex must match the components after the prefix.
+        self.assertEqual([], self.match(Name("/a/b")))
+        self.assertEqual([], self.match(Name("/a/c/b/c")))
+        self.assertEqual([], self.match(Name("/b/c")))
+
+    def test_prefix_and_regex_filter(self):
+        self.set(1, InterestFilter(Name("/a"), "<b><>"))
+        self.set(2, InterestFilter(Name("/a/b")))
+        self.set(3, InterestFilter(Name("/a")))
+
+        self.assertEqual([1, 2, 3], self.match(Name("/a/b/c")))
+        self.assertEqual([2, 3], self.match(Name("/a/b/c/d")))
+
+    def test_value_only_match(self):
+        self.set(1, InterestFilter(Name("/a/b")))
+
+        # Like Name.match, the component types are not compared.
+        typedName = Name("/a").append("b", ComponentType.OTHER_CODE, 99)
+        self.assertTrue(Name("/a/b").match(typedName))
+        self.assertEqual([1], self.match(typedName))
+
+    def test_unset_interest_filter(self):
+        self.set(1, InterestFilter(Name("/a")))
+        self.set(2, InterestFilter(Name("/a")))
+        self.set(2, InterestFilter(Name("/a/b")))
+        self.set(2, InterestFilter(Name("/a"), "<b>"))
+        self.set(3, InterestFilter(Name("/a/b")))
+
+        self.assertEqual([1, 2, 2, 2, 3], self.match(Name("/a/b")))
+        self.table.unsetInterestFilter(2)
+        self.assertEqual([1, 3], self.match(Name("/a/b")))
+
+        # Unsetting an unknown ID does nothing.
+        self.table.unsetInterestFilter(2)
+        self.assertEqual([1, 3], self.match(Name("/a/b")))
+
+        self.table.unsetInterestFilter(1)
+        self.table.unsetInterestFilter(3)
+        self.assertEqual([], self.match(Name("/a/b")))
+
+    def test_takes_filter_argument(self):
+        onInterestObject = OnInterestObject()
+        for onInterest, takesFilter in [
+              (onInterest4, False), (onInterest5, True),
+              (onInterestObject.onInterest, True), (onInterestObject, False),
+              (lambda prefix, interest, face, interestFilterId: None, False)]:
+            entry = InterestFilterTable.Entry(
+              0, InterestFilter(Name("/a")), onInterest, None)
+            self.assertEqual(takesFilter, entry.getOnInterestTakesFilter())
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
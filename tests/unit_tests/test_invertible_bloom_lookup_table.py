@@ -198,5 +198,35 @@ class TestInvertibleBloomLookupTable(ut.TestCase):
         self.assertTrue(not ownIblt.listEntries(positive, negative))
         self.assertTrue(not receivedIblt.listEntries(positive, negative))
 
+    def testInsertBatch(self):
+        size = 10
+
+        iblt1 = InvertibleBloomLookupTable(size)
+        iblt2 = InvertibleBloomLookupTable(size)
+
+        hashes = []
+        for i in range(5):
+            prefix = Name("/test/memphis").appendNumber(i).toUri()
+            hashes.append(Common.murmurHash3Blob(11, prefix))
+
+        for newHash in hashes:
+            iblt1.insert(newHash)
+        iblt2.insertBatch(hashes)
+        self.assertTrue(iblt1.equals(iblt2))
+        self.assertTrue(iblt1.encode().equals(iblt2.encode()))
+
+        # Check that the saved encoding is updated after a change.
+        iblt2.erase(hashes[0])
+        self.assertFalse(iblt1.encode().equals(iblt2.encode()))
+        received = InvertibleBloomLookupTable(size)
+        received.initialize(iblt2.encode())
+        self.assertTrue(received.equals(iblt2))
+
+        positive = set()
+        negative = set()
+        self.assertTrue(iblt1.difference(received).listEntries(positive, negative))
+        self.assertEqual(set([hashes[0]]), positive)
+        self.assertEqual(0, len(negative))
+
 if __name__ == '__main__':
     ut.main(verbosity=2)
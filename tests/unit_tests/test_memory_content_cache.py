@@ -0,0 +1,142 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Data, Interest
+from pyndn.util import Blob
+from pyndn.util.memory_content_cache import MemoryContentCache
+
+class SendCounter(object):
+    """
+    SendCounter is used in place of the Face given to the OnInterest callback
+    to keep the Data packets sent by the MemoryContentCache.
+    """
+    def __init__(self):
+        self._sentData = []
+
+    def send(self, encoding):
+        data = Data()
+        data.wireDecode(Blob(encoding, False))
+        self._sentData.append(data)
+
+def makeData(uri, freshnessPeriod = None):
+    data = Data(Name(uri))
+    if freshnessPeriod != None:
+        data.getMetaInfo().setFreshnessPeriod(freshnessPeriod)
+    return data
+
+class TestMemoryContentCache(ut.TestCase):
+    def setUp(self):
+        # Use a large cleanup interval so that the test doesn't depend on timing.
+        self._cache = MemoryContentCache(None, 1e9)
+        self._prefix = Name("/test")
+
+    def expressInterest(self, interest):
+        face = SendCounter()
+        self._cache._onInterest(self._prefix, interest, face, 0, None)
+        if len(face._sentData) == 0:
+            return None
+        return face._sentData[0].getName()
+
+    def test_child_selector(self):
+        for uri in ["/test/b/1", "/test/c/1", "/test/a/2", "/test/a/1",
+                    "/test/c/0", "/other/d"]:
+            self._cache.add(makeData(uri))
+
+        interest = Interest(Name("/test"))
+        self.assertEqual(Name("/test/a/1"), self.expressInterest(interest))
+        interest.setChildSelector(0)
+        self.assertEqual(Name("/test/a/1"), self.expressInterest(interest))
+        # Select the rightmost child, then the first Data packet under it.
+        interest.setChildSelector(1)
+        self.assertEqual(Name("/test/c/0"), self.expressInterest(interest))
+
+        interest = Interest(Name("/test/c"))
+        interest.setChildSelector(1)
+        self.assertEqual(Name("/test/c/1"), self.expressInterest(interest))
+        interest.getExclude().appendComponent(Name("/1").get(0))
+        self.assertEqual(Name("/test/c/0"), self.expressInterest(interest))
+
+        self.assertEqual(None, self.expressInterest(Interest(Name("/test/d"))))
+
+    def test_must_be_fresh(self):
+        self._cache.add(makeData("/test/a", 0.0))
+        self._cache.add(makeData("/test/b", 1e9))
+
+        interest = Interest(Name("/test"))
+        self.assertEqual(Name("/test/a"), self.expressInterest(interest))
+        interest.setMustBeFresh(True)
+        self.assertEqual(Name("/test/b"), self.expressInterest(interest))
+
+    def test_capacity(self):
+        self._cache.setCapacity(2)
+        self._cache.add(makeData("/test/1"))
+        self._cache.add(makeData("/test/2"))
+        # Adding the same name replaces it and makes it the last added.
+        self._cache.add(makeData("/test/1"))
+        self._cache.add(makeData("/test/3"))
+
+        self.assertEqual(2, self._cache.size())
+        self.assertEqual(None, self.expressInterest(Interest(Name("/test/2"))))
+        self.assertEqual(
+          Name("/test/1"), self.expressInterest(Interest(Name("/test/1"))))
+        self.assertEqual(
+          Name("/test/3"), self.expressInterest(Interest(Name("/test/3"))))
+
+        self._cache.setCapacity(1)
+        self.assertEqual(1, self._cache.size())
+        self.assertEqual(None, self.expressInterest(Interest(Name("/test/1"))))
+
+    def test_pending_interest(self):
+        faceA = SendCounter()
+        faceAB = SendCounter()
+        faceABExclude = SendCounter()
+        faceC = SendCounter()
+        faceTimedOut = SendCounter()
+
+        self._cache.storePendingInterest(Interest(Name("/test/a")), faceA)
+        self._cache.storePendingInterest(Interest(Name("/test/a/b")), faceAB)
+        interest = Interest(Name("/test/a"))
+        interest.getExclude().appendComponent(Name("/b").get(0))
+        self._cache.storePendingInterest(interest, faceABExclude)
+        self._cache.storePendingInterest(Interest(Name("/test/c")), faceC)
+        interest = Interest(Name("/test"))
+        interest.setInterestLifetimeMilliseconds(0.0)
+        self._cache.storePendingInterest(interest, faceTimedOut)
+
+        self._cache.add(makeData("/test/a/b/1"))
+        self.assertEqual(1, len(faceA._sentData))
+        self.assertEqual(1, len(faceAB._sentData))
+        self.assertEqual(0, len(faceABExclude._sentData))
+        self.assertEqual(0, len(faceC._sentData))
+        self.assertEqual(0, len(faceTimedOut._sentData))
+
+        # The satisfied pending interests are removed.
+        self._cache.add(makeData("/test/a/b/2"))
+        self.assertEqual(1, len(faceA._sentData))
+        self.assertEqual(1, len(faceAB._sentData))
+
+        self._cache.add(makeData("/test/a/d"))
+        self.assertEqual(1, len(faceABExclude._sentData))
+        self._cache.add(makeData("/test/c"))
+        self.assertEqual(Name("/test/c"), faceC._sentData[0].getName())
+        self.assertEqual(0, len(faceTimedOut._sentData))
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
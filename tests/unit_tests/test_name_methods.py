@@ -238,6 +238,49 @@ class TestNameMethods(ut.TestCase):
         self.assertTrue (Name("/Z/A/Y")  .compare(1, 1, Name("/X/A/C"), 1) < 0)
         self.assertTrue (Name("/Z/A/C/Y").compare(1, 2, Name("/X/A"),   1) > 0)
 
+    def test_compare_types_and_lengths(self):
+        # The type code is compared first, then the length, then the value,
+        # including for a type code or length which needs more than one byte.
+        longValue = bytearray([0] * 300)
+        names = [
+          Name("/a").append("z", ComponentType.OTHER_CODE, 300),
+          Name("/a").append(longValue),
+          Name("/a").append("z"),
+          Name("/a").appendImplicitSha256Digest(bytearray(32)),
+          Name("/a").append("zz", ComponentType.OTHER_CODE, 252),
+          Name("/a").append("z", ComponentType.OTHER_CODE, 253),
+          Name("/a")]
+        expectedOrder = [6, 3, 2, 1, 4, 5, 0]
+        self.assertEqual([names[i] for i in expectedOrder], sorted(names))
+
+        # The hash and equality are updated when the name changes.
+        name = Name("/a/b")
+        self.assertEqual(hash(Name("/a/b")), hash(name))
+        name.append("c")
+        self.assertEqual(hash(Name("/a/b/c")), hash(name))
+        self.assertTrue(name.equals(Name("/a/b/c")))
+        self.assertFalse(name.equals(Name("/a/b/d")))
+
+    def test_intern_components(self):
+        Name.setInternComponents(True)
+        try:
+            name1 = Name("/ndn/edu/ucla/1")
+            name2 = Name()
+            name2.wireDecode(Name("/ndn/edu/ucla/2").wireEncode())
+            name3 = Name("/ndn").append("edu", ComponentType.OTHER_CODE, 99)
+
+            self.assertTrue(name1.get(0) is name2.get(0))
+            self.assertTrue(name1.get(2) is name2.get(2))
+            self.assertFalse(name1.get(3) is name2.get(3))
+            # A component with a different type is not shared.
+            self.assertFalse(name1.get(1) is name3.get(1))
+            self.assertEqual(Name("/ndn/edu/ucla/2"), name2)
+        finally:
+            Name.setInternComponents(False)
+
+        self.assertFalse(Name.getInternComponents())
+        self.assertFalse(Name("/ndn").get(0) is Name("/ndn").get(0))
+
     def test_match(self):
         name = Name("/edu/cmu/andrew/user/3498478")
         name2 = Name(name)
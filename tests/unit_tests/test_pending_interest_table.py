@@ -0,0 +1,104 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Interest, Data
+from pyndn.impl.pending_interest_table import PendingInterestTable
+
+def makeInterest(uri, canBePrefix):
+    interest = Interest(Name(uri))
+    interest.setCanBePrefix(canBePrefix)
+    return interest
+
+class TestPendingInterestTable(ut.TestCase):
+    def setUp(self):
+        self.table = PendingInterestTable()
+        self.nextId = 0
+
+    def add(self, interest, onNetworkNack = None):
+        self.nextId += 1
+        return self.table.add(
+          self.nextId, interest, None, None, onNetworkNack)
+
+    def extract(self, dataUri):
+        entries = []
+        self.table.extractEntriesForExpressedInterest(
+          Data(Name(dataUri)), entries)
+        return set(entry.getPendingInterestId() for entry in entries)
+
+    def test_extract_prefix(self):
+        a = self.add(makeInterest("/a", True))
+        ab = self.add(makeInterest("/a/b", True))
+        abExact = self.add(makeInterest("/a/b", False))
+        self.add(makeInterest("/a/c", True))
+        self.add(makeInterest("/a", False))
+
+        self.assertEqual(
+          set([a.getPendingInterestId(), ab.getPendingInterestId(),
+               abExact.getPendingInterestId()]),
+          self.extract("/a/b"))
+        self.assertTrue(a.getIsRemoved())
+        self.assertEqual(2, self.table.size())
+
+        # The matching entries were removed.
+        self.assertEqual(set(), self.extract("/a/b"))
+
+    def test_extract_implicit_digest(self):
+        data = Data(Name("/a/b"))
+        fullName = data.getFullName()
+        entry = self.add(makeInterest(fullName.toUri(), False))
+        self.add(makeInterest("/a/b/c", True))
+
+        entries = []
+        self.table.extractEntriesForExpressedInterest(data, entries)
+        self.assertEqual([entry], entries)
+        self.assertEqual(1, self.table.size())
+
+    def test_remove_pending_interest(self):
+        entry = self.add(makeInterest("/a", True))
+        self.table.removePendingInterest(entry.getPendingInterestId())
+        self.assertTrue(entry.getIsRemoved())
+        self.assertEqual(set(), self.extract("/a/b"))
+        self.assertFalse(self.table.removeEntry(entry))
+
+        # A removal request before add prevents adding the entry.
+        self.table.removePendingInterest(self.nextId + 1)
+        self.assertEqual(None, self.add(makeInterest("/a", True)))
+        self.assertNotEqual(None, self.add(makeInterest("/a", True)))
+
+    def test_extract_nack(self):
+        interest = makeInterest("/a", True)
+        interest.setNonce(bytearray([1, 2, 3, 4]))
+        entry = self.add(interest, lambda interest, networkNack: None)
+        noNackCallback = self.add(Interest(interest))
+
+        otherNonce = Interest(interest)
+        otherNonce.setNonce(bytearray([5, 6, 7, 8]))
+        entries = []
+        self.table.extractEntriesForNackInterest(otherNonce, entries)
+        self.assertEqual([], entries)
+
+        self.table.extractEntriesForNackInterest(Interest(interest), entries)
+        self.assertEqual([entry], entries)
+        self.assertFalse(noNackCallback.getIsRemoved())
+        self.assertTrue(self.table.removeEntry(noNackCallback))
+        self.assertEqual(0, self.table.size())
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
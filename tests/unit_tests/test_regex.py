@@ -431,6 +431,31 @@ class TestRegex(ut.TestCase):
         self.assertEqual(6, len(cm.getMatchResult()))
         self.assertEqual(Name("/ndn/edu/ucla/yingdi/mac/"), cm.expand())
 
+    def test_top_matcher_compiled_pattern(self):
+        cm = NdnRegexTopMatcher("^([^<KEY>]*)<KEY>(<>*)<ksk-.+><ID-CERT>")
+        self.assertTrue(cm._compiledPattern != None)
+        res = cm.match(Name("/ndn/edu/ucla/KEY/yingdi/ksk-1/ID-CERT/%FD01"))
+        self.assertEqual(True, res)
+        self.assertEqual(8, len(cm.getMatchResult()))
+        self.assertEqual(Name("/ndn/edu/ucla/yingdi"), cm.expand("\\1\\2"))
+        res = cm.match(Name("/ndn/edu/ucla/yingdi/ksk-1/ID-CERT"))
+        self.assertEqual(False, res)
+
+        # A component regex group in a repetition uses the matchers.
+        cm = NdnRegexTopMatcher("^<(.*)-.*>*$")
+        self.assertTrue(cm._compiledPattern == None)
+        res = cm.match(Name("/a-1/b-2"))
+        self.assertEqual(True, res)
+        self.assertEqual(Name("/b"), cm.expand("\\1"))
+
+        # The secondary pattern is used when the name doesn't start with the
+        # expression.
+        cm = NdnRegexTopMatcher("<(.*)\\.(.*)><DNS>(<>*)$")
+        self.assertTrue(cm._compiledPattern != None)
+        res = cm.match(Name("/ndn/ucla.edu/DNS/yingdi/mac"))
+        self.assertEqual(True, res)
+        self.assertEqual(Name("/edu/ucla/yingdi/mac"), cm.expand("\\2\\1\\3"))
+
 from pyndn.util.regex.ndn_regex_matcher_base import NdnRegexMatcherBase
 
 if __name__ == '__main__':
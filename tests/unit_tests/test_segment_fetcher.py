@@ -0,0 +1,163 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Interest, Data
+from pyndn.util import Blob
+from pyndn.util.segment_fetcher import SegmentFetcher
+
+class CongestionMarkedData(Data):
+    def getCongestionMark(self):
+        return 1
+
+class SegmentFace(object):
+    """
+    SegmentFace simulates a Face which answers Interests for the segments of
+    /prefix/<version>. Call processEvents to answer all the Interests sent so
+    far in reverse order. An Interest for a segment in dropSegments times out
+    the first time. The Data for a segment in congestionMarkSegments has a
+    congestion mark.
+    """
+    def __init__(self, nSegments, dropSegments = [],
+                 congestionMarkSegments = []):
+        self.nSegments = nSegments
+        self.dropSegments = set(dropSegments)
+        self.congestionMarkSegments = set(congestionMarkSegments)
+        self.prefix = Name("/prefix").appendVersion(1)
+        self.pending = {}
+        self.lastId = 0
+        self.maxInFlight = 0
+        self.nInterests = 0
+
+    def expressInterest(self, interest, onData, onTimeout):
+        self.lastId += 1
+        self.nInterests += 1
+        self.pending[self.lastId] = (interest, onData, onTimeout)
+        self.maxInFlight = max(self.maxInFlight, len(self.pending))
+        return self.lastId
+
+    def removePendingInterest(self, pendingInterestId):
+        self.pending.pop(pendingInterestId, None)
+
+    def makeSegment(self, segment):
+        data = (CongestionMarkedData() if segment in self.congestionMarkSegments
+                else Data())
+        data.setName(Name(self.prefix).appendSegment(segment))
+        data.setContent(Blob(bytearray([segment % 256] * 10)))
+        data.getMetaInfo().setFinalBlockId(
+          Name.Component.fromSegment(self.nSegments - 1))
+        return data
+
+    def processEvents(self):
+        # Answer the most recent Interests first, so Data is out of order.
+        for pendingInterestId in sorted(self.pending.keys(), reverse = True):
+            if pendingInterestId not in self.pending:
+                continue
+            interest, onData, onTimeout = self.pending.pop(pendingInterestId)
+            lastComponent = interest.getName().get(-1)
+            segment = lastComponent.toSegment() if lastComponent.isSegment() else 0
+            if segment >= self.nSegments:
+                onTimeout(interest)
+            elif segment in self.dropSegments:
+                self.dropSegments.remove(segment)
+                onTimeout(interest)
+            else:
+                onData(interest, self.makeSegment(segment))
+
+        return len(self.pending) > 0
+
+class TestSegmentFetcher(ut.TestCase):
+    def setUp(self):
+        self.content = None
+        self.errorCode = None
+
+    def onComplete(self, content):
+        self.content = content
+
+    def onError(self, errorCode, message):
+        self.errorCode = errorCode
+
+    def fetch(self, face, options):
+        SegmentFetcher.fetch(
+          face, Interest(Name("/prefix")), SegmentFetcher.DontVerifySegment,
+          self.onComplete, self.onError, options)
+        while face.processEvents():
+            pass
+
+    def expectedContent(self, nSegments):
+        content = bytearray()
+        for segment in range(nSegments):
+            content += bytearray([segment % 256] * 10)
+        return Blob(content, False)
+
+    def test_stop_and_wait(self):
+        face = SegmentFace(20)
+        self.fetch(face, None)
+        self.assertEqual(self.expectedContent(20), self.content)
+        self.assertEqual(1, face.maxInFlight)
+
+    def test_pipeline(self):
+        face = SegmentFace(100)
+        self.fetch(face, SegmentFetcher.Options())
+        self.assertEqual(None, self.errorCode)
+        self.assertEqual(self.expectedContent(100), self.content)
+        self.assertTrue(face.maxInFlight > 1, "The window did not grow")
+
+    def test_retransmit(self):
+        face = SegmentFace(50, dropSegments = [3, 10, 11, 40])
+        options = SegmentFetcher.Options()
+        self.fetch(face, options)
+        self.assertEqual(None, self.errorCode)
+        self.assertEqual(self.expectedContent(50), self.content)
+
+    def test_congestion_mark(self):
+        face = SegmentFace(50, congestionMarkSegments = [20, 21])
+        options = SegmentFetcher.Options()
+        self.fetch(face, options)
+        self.assertEqual(self.expectedContent(50), self.content)
+        self.assertTrue(face.maxInFlight > 1, "The window did not grow")
+
+        # Check the window decrease directly.
+        options.initCwnd = 8.0
+        fetcher = SegmentFetcher(
+          face, None, SegmentFetcher.DontVerifySegment, self.onComplete,
+          self.onError, options)
+        fetcher._nextSegment = 10
+        fetcher._decreaseWindow(5)
+        self.assertEqual(4.0, fetcher._cwnd)
+        self.assertEqual(4.0, fetcher._ssthresh)
+        # A second decrease for a segment in the same window is ignored.
+        fetcher._decreaseWindow(9)
+        self.assertEqual(4.0, fetcher._cwnd)
+        fetcher._nextSegment = 20
+        fetcher._decreaseWindow(10)
+        self.assertEqual(2.0, fetcher._cwnd)
+
+    def test_timeout(self):
+        face = SegmentFace(10, dropSegments = [5])
+        options = SegmentFetcher.Options()
+        options.maxTimeout = 0.0
+        self.fetch(face, options)
+        self.assertEqual(None, self.content)
+        self.assertEqual(SegmentFetcher.ErrorCode.INTEREST_TIMEOUT,
+                         self.errorCode)
+        self.assertEqual(0, len(face.pending))
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
@@ -256,5 +256,28 @@ class TestTpmPrivateKey(ut.TestCase):
             key2 = TpmPrivateKey.generatePrivateKey(dataSet.keyParams)
             self.assertTrue(not key.toPkcs8().equals(key2.toPkcs8()))
 
+    def test_verify_cached_public_key(self):
+        for dataSet in self.keyTestData:
+            key = TpmPrivateKey.generatePrivateKey(dataSet.keyParams)
+            publicKeyBits = key.derivePublicKey()
+            data = Blob([0x01, 0x02, 0x03, 0x04])
+            otherData = Blob([0x05, 0x06, 0x07, 0x08])
+            signature = key.sign(data.toBytes(), DigestAlgorithm.SHA256)
+
+            # The second verify uses the cached public key.
+            for i in range(2):
+                self.assertTrue(VerificationHelpers.verifySignature(
+                  data, signature, publicKeyBits))
+                self.assertFalse(VerificationHelpers.verifySignature(
+                  otherData, signature, publicKeyBits))
+
+            try:
+                VerificationHelpers.setPublicKeyCacheCapacity(0)
+                self.assertTrue(VerificationHelpers.verifySignature(
+                  data, signature, PublicKey(publicKeyBits)))
+            finally:
+                VerificationHelpers.setPublicKeyCacheCapacity(
+                  VerificationHelpers.DEFAULT_PUBLIC_KEY_CACHE_CAPACITY)
+
 if __name__ == '__main__':
     ut.main(verbosity=2)
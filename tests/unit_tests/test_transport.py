@@ -0,0 +1,313 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2019 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import errno
+import socket
+import unittest as ut
+from pyndn.node import Node
+from pyndn.transport import Transport, TcpTransport, UnixTransport
+from pyndn.transport import tcp_transport
+from pyndn.encoding.element_reader import ElementReader
+
+class FakeSocket(object):
+    """
+    FakeSocket is used in place of the transport socket to keep the bytes
+    sent by each call.
+
+    :param int maxBytesPerSend: (optional) The maximum number of bytes that
+      one call to sendmsg sends. If omitted or None, send all the bytes.
+    :param Exception sendError: (optional) If not None, sendmsg and sendall
+      raise this.
+    :param list receiveResults: (optional) The results for each call to
+      recv_into, where each is the bytes to receive or an Exception to raise.
+    """
+    def __init__(self, maxBytesPerSend = None, sendError = None,
+                 receiveResults = []):
+        self._maxBytesPerSend = maxBytesPerSend
+        self._sendError = sendError
+        self._receiveResults = list(receiveResults)
+        # The list of (method name, list of buffers as bytes) for each call.
+        self._sendCalls = []
+        # The list of (buffer length, flags) for each call to recv_into.
+        self._receiveCalls = []
+        # The list of (level, option, value) for each call to setsockopt.
+        self._socketOptions = []
+        self._isClosed = False
+
+    def sendall(self, data):
+        if self._sendError != None:
+            raise self._sendError
+        self._sendCalls.append(("sendall", [bytes(bytearray(data))]))
+
+    def sendmsg(self, buffers):
+        if self._sendError != None:
+            raise self._sendError
+        self._sendCalls.append(
+          ("sendmsg", [bytes(bytearray(buffer)) for buffer in buffers]))
+        nBytes = sum(len(buffer) for buffer in buffers)
+        if self._maxBytesPerSend != None:
+            nBytes = min(nBytes, self._maxBytesPerSend)
+        return nBytes
+
+    def recv_into(self, buffer, nbytes = 0, flags = 0):
+        self._receiveCalls.append((len(buffer), flags))
+        result = self._receiveResults.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        buffer[0:len(result)] = result
+        return len(result)
+
+    def setsockopt(self, level, option, value):
+        self._socketOptions.append((level, option, value))
+
+    def close(self):
+        self._isClosed = True
+
+    def getSentBytes(self):
+        """
+        Get the bytes sent by all calls, as if sendmsg sent its partial count
+        from the start of the buffers.
+        """
+        result = b""
+        for _, buffers in self._sendCalls:
+            data = b"".join(buffers)
+            if self._maxBytesPerSend != None:
+                data = data[:self._maxBytesPerSend]
+            result += data
+        return result
+
+class FakeSocketPoller(object):
+    """
+    FakeSocketPoller is used in place of the SocketPoller to return the given
+    results from isReady.
+
+    :param list isReadyResults: The result for each call to isReady.
+    """
+    def __init__(self, isReadyResults):
+        self._isReadyResults = list(isReadyResults)
+
+    def isReady(self):
+        return self._isReadyResults.pop(0)
+
+    def close(self):
+        pass
+
+class ElementListener(object):
+    def __init__(self):
+        self._elements = []
+
+    def onReceivedElement(self, element):
+        self._elements.append(bytes(bytearray(element)))
+
+class FlushCounter(Transport):
+    """
+    FlushCounter is a Transport which counts the calls to flush.
+    """
+    def __init__(self):
+        self._nFlushCalls = 0
+
+    def processEvents(self):
+        pass
+
+    def flush(self):
+        self._nFlushCalls += 1
+
+def makeTransport(transportType, fakeSocket):
+    transport = transportType()
+    transport._socket = fakeSocket
+    return transport
+
+class TestTransportSendQueue(ut.TestCase):
+    def test_default_sends_immediately(self):
+        fakeSocket = FakeSocket()
+        transport = makeTransport(TcpTransport, fakeSocket)
+
+        transport.send(bytearray(b"abc"))
+        self.assertEqual([("sendall", [b"abc"])], fakeSocket._sendCalls)
+        self.assertEqual(0, len(transport._sendQueue))
+
+        # Flushing the empty queue does nothing.
+        transport.flush()
+        self.assertEqual(1, len(fakeSocket._sendCalls))
+
+    @ut.skipUnless(tcp_transport._HAVE_SENDMSG, "requires sendmsg")
+    def test_flush_at_threshold(self):
+        fakeSocket = FakeSocket()
+        transport = makeTransport(TcpTransport, fakeSocket)
+        transport.setSendQueueThreshold(10)
+
+        transport.send(bytearray(b"abcd"))
+        transport.send(bytearray(b"efgh"))
+        self.assertEqual([], fakeSocket._sendCalls)
+        # This reaches the threshold.
+        transport.send(bytearray(b"ij"))
+        self.assertEqual(
+          [("sendmsg", [b"abcd", b"efgh", b"ij"])], fakeSocket._sendCalls)
+        self.assertEqual(0, transport._sendQueueLength)
+
+        # Setting the threshold to zero flushes the queue.
+        transport.send(bytearray(b"k"))
+        self.assertEqual(1, len(fakeSocket._sendCalls))
+        transport.setSendQueueThreshold(0)
+        self.assertEqual(("sendmsg", [b"k"]), fakeSocket._sendCalls[1])
+        transport.send(bytearray(b"l"))
+        self.assertEqual(("sendall", [b"l"]), fakeSocket._sendCalls[2])
+
+    @ut.skipUnless(tcp_transport._HAVE_SENDMSG, "requires sendmsg")
+    def test_partial_send(self):
+        fakeSocket = FakeSocket(3)
+        transport = makeTransport(TcpTransport, fakeSocket)
+        transport.setSendQueueThreshold(100)
+
+        transport.send(bytearray(b"abcd"))
+        transport.send(bytearray(b"ef"))
+        transport.send(bytearray(b"ghi"))
+        transport.flush()
+
+        # Each call resumes after the bytes which were sent.
+        self.assertEqual([
+          ("sendmsg", [b"abcd", b"ef", b"ghi"]),
+          ("sendmsg", [b"d", b"ef", b"ghi"]),
+          ("sendmsg", [b"ghi"])], fakeSocket._sendCalls)
+        self.assertEqual(b"abcdefghi", fakeSocket.getSentBytes())
+
+    @ut.skipUnless(tcp_transport._HAVE_SENDMSG, "requires sendmsg")
+    def test_max_send_buffers(self):
+        fakeSocket = FakeSocket()
+        transport = makeTransport(TcpTransport, fakeSocket)
+        transport.setSendQueueThreshold(1000000)
+
+        nBuffers = tcp_transport._MAX_SEND_BUFFERS + 10
+        for i in range(nBuffers):
+            transport.send(bytearray([i % 256]))
+        transport.flush()
+
+        self.assertEqual(2, len(fakeSocket._sendCalls))
+        self.assertEqual(tcp_transport._MAX_SEND_BUFFERS,
+                         len(fakeSocket._sendCalls[0][1]))
+        self.assertEqual(10, len(fakeSocket._sendCalls[1][1]))
+        self.assertEqual(bytes(bytearray([i % 256 for i in range(nBuffers)])),
+                         fakeSocket.getSentBytes())
+
+    def test_process_events_flushes(self):
+        transport = FlushCounter()
+        node = Node(transport, None)
+
+        node.processEvents()
+        self.assertEqual(1, transport._nFlushCalls)
+
+    def test_close_with_broken_pipe(self):
+        for transportType in [TcpTransport, UnixTransport]:
+            fakeSocket = FakeSocket(
+              sendError = socket.error(errno.EPIPE, "Broken pipe"))
+            transport = makeTransport(transportType, fakeSocket)
+            transport.setSendQueueThreshold(100)
+            transport.send(bytearray(b"abc"))
+
+            # close() logs the error and still closes the socket.
+            with self.assertLogs(transportType.__module__, "ERROR"):
+                transport.close()
+            self.assertTrue(fakeSocket._isClosed)
+            self.assertEqual(None, transport._socket)
+            self.assertEqual(0, len(transport._sendQueue))
+
+# Each element is 4 bytes.
+ELEMENT1 = b"\x06\x02a1"
+ELEMENT2 = b"\x06\x02b2"
+ELEMENT3 = b"\x06\x02c3"
+
+class TestTransportReceive(ut.TestCase):
+    def setUp(self):
+        self._listener = ElementListener()
+
+    def makeTransport(self, fakeSocket, isReadyResults = []):
+        transport = makeTransport(TcpTransport, fakeSocket)
+        # Use a read buffer for two elements.
+        transport._setSocketOptions(
+          TcpTransport.ConnectionInfo("localhost", 6363, 8))
+        transport._socketPoller = FakeSocketPoller(isReadyResults)
+        transport._elementReader = ElementReader(self._listener)
+        return transport
+
+    def test_drain_until_would_block(self):
+        fakeSocket = FakeSocket(receiveResults = [
+          ELEMENT1 + ELEMENT2, ELEMENT3 + ELEMENT1,
+          socket.error(errno.EAGAIN, "Resource temporarily unavailable")])
+        transport = self.makeTransport(fakeSocket)
+
+        transport.processEvents()
+        self.assertEqual(3, len(fakeSocket._receiveCalls))
+        self.assertEqual([ELEMENT1, ELEMENT2, ELEMENT3, ELEMENT1],
+                         self._listener._elements)
+
+    def test_stop_after_short_read(self):
+        fakeSocket = FakeSocket(receiveResults = [
+          ELEMENT1 + ELEMENT2, ELEMENT3[:2], ELEMENT3[2:]])
+        transport = self.makeTransport(fakeSocket)
+
+        transport.processEvents()
+        # The first read filled the buffer, so read again. The second read
+        # didn't, so stop without another read.
+        self.assertEqual(2, len(fakeSocket._receiveCalls))
+        self.assertEqual([ELEMENT1, ELEMENT2], self._listener._elements)
+
+        # The element split across reads is joined.
+        transport.processEvents()
+        self.assertEqual(3, len(fakeSocket._receiveCalls))
+        self.assertEqual([ELEMENT1, ELEMENT2, ELEMENT3],
+                         self._listener._elements)
+
+    def test_without_msg_dontwait(self):
+        fakeSocket = FakeSocket(receiveResults = [ELEMENT1 + ELEMENT2])
+        transport = self.makeTransport(fakeSocket, [True, False])
+
+        savedMsgDontwait = tcp_transport._MSG_DONTWAIT
+        tcp_transport._MSG_DONTWAIT = 0
+        try:
+            transport.processEvents()
+        finally:
+            tcp_transport._MSG_DONTWAIT = savedMsgDontwait
+
+        # The full read loops again, but isReady() is False so stop without
+        # a blocking read.
+        self.assertEqual([(8, 0)], fakeSocket._receiveCalls)
+        self.assertEqual([ELEMENT1, ELEMENT2], self._listener._elements)
+        self.assertEqual([], transport._socketPoller._isReadyResults)
+
+    def test_buffer_sizes(self):
+        fakeSocket = FakeSocket(receiveResults = [ELEMENT1])
+        transport = makeTransport(TcpTransport, fakeSocket)
+        self.assertEqual(TcpTransport.DEFAULT_READ_BUFFER_SIZE,
+                         len(transport._buffer))
+
+        transport._setSocketOptions(TcpTransport.ConnectionInfo(
+          "localhost", 6363, 100, 200000, 300000))
+        self.assertEqual([(socket.SOL_SOCKET, socket.SO_RCVBUF, 200000),
+                          (socket.SOL_SOCKET, socket.SO_SNDBUF, 300000)],
+                         fakeSocket._socketOptions)
+
+        transport._socketPoller = FakeSocketPoller([True])
+        transport._elementReader = ElementReader(self._listener)
+        transport.processEvents()
+        # recv_into uses the configured read buffer.
+        self.assertEqual(100, fakeSocket._receiveCalls[0][0])
+        self.assertEqual([ELEMENT1], self._listener._elements)
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)